@@ -0,0 +1,6 @@
+"""Reproducible API benchmarks.
+
+:mod:`.factory` builds a synthetic dataset, :mod:`.scenarios` holds the
+requests to time and :mod:`.runner` times them through the Django test
+client. Run them with ``manage.py bench_api``.
+"""
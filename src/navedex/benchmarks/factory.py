@@ -0,0 +1,79 @@
+import datetime
+import random
+from collections import namedtuple
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+
+from navedex.core.bulk import bulk_link, refresh_links
+from navedex.core.models import OwnerVersion
+from navedex.navers.models import Naver
+from navedex.projects.models import Project
+
+FIRST_NAMES = ['Ana', 'Bruno', 'Carla', 'Davi', 'Elisa', 'Fabio', 'Gabriela', 'Heitor', 'Isabela', 'Joao']
+LAST_NAMES = ['Silva', 'Souza', 'Costa', 'Santos', 'Oliveira', 'Pereira', 'Lima', 'Ferreira', 'Almeida']
+JOB_ROLES = ['Developer', 'Designer', 'Devops', 'Tester', 'Manager', 'Analyst', 'Architect']
+PROJECT_WORDS = ['Portal', 'App', 'API', 'Dashboard', 'Checkout', 'Search', 'Billing', 'Onboarding']
+
+EMAIL = 'bench-{}@navedex.com.br'
+PASSWORD = 'navedex-benchmark'
+BATCH_SIZE = 1000
+
+# What one owner of the dataset has, ids in insertion order
+BenchOwner = namedtuple('BenchOwner', 'user naver_ids project_ids')
+
+
+def random_date(rng, start_year, end_year):
+    start = datetime.date(start_year, 1, 1)
+    return start + datetime.timedelta(days=rng.randrange((datetime.date(end_year, 1, 1) - start).days))
+
+
+def project_weights(count):
+    """Zipf weights, so a few projects hold most of the navers as in real teams"""
+    return [1 / rank for rank in range(1, count + 1)]
+
+
+def generate(users, navers, projects, density, seed=0):
+    """Create ``users`` owners with ``navers`` navers and ``projects`` projects each.
+
+    Every naver is linked to ``density`` projects on average, picked with
+    :func:`project_weights`. The same arguments always give the same rows.
+    Everything is written with ``bulk_create`` and the link counts are
+    recounted once per owner; all users share one
+    password hash, :data:`PASSWORD`. Returns a :class:`BenchOwner` per user.
+    """
+    rng = random.Random(seed)
+    User = get_user_model()
+    password = make_password(PASSWORD)
+    User.objects.bulk_create(
+        [User(email=EMAIL.format(i), password=password) for i in range(users)],
+        batch_size=BATCH_SIZE
+    )
+    owners = list(User.objects.filter(email__in=[EMAIL.format(i) for i in range(users)]).order_by('id'))
+    OwnerVersion.objects.bulk_create([OwnerVersion(owner=owner) for owner in owners], batch_size=BATCH_SIZE)
+
+    weights = project_weights(projects)
+    dataset = []
+    for owner in owners:
+        Project.objects.bulk_create([
+            Project(owner=owner, name=f'{rng.choice(PROJECT_WORDS)} {i}') for i in range(projects)
+        ], batch_size=BATCH_SIZE)
+        Naver.objects.bulk_create([
+            Naver(owner=owner, name=f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+                  birthdate=random_date(rng, 1960, 2002), admission_date=random_date(rng, 2005, 2021),
+                  job_role=rng.choice(JOB_ROLES))
+            for i in range(navers)
+        ], batch_size=BATCH_SIZE)
+        project_ids = list(Project.objects.filter(owner=owner).order_by('id').values_list('id', flat=True))
+        naver_ids = list(Naver.objects.filter(owner=owner).order_by('id').values_list('id', flat=True))
+
+        links = []
+        if project_ids:
+            for naver_id in naver_ids:
+                picked = rng.choices(project_ids, weights, k=rng.randint(0, 2 * density))
+                links.extend((naver_id, project_id) for project_id in set(picked))
+        bulk_link(Naver, 'projects', links, batch_size=BATCH_SIZE)
+        # The through rows are inserted in bulk, without the signals keeping the counts
+        refresh_links(Naver, 'projects', naver_ids, project_ids)
+        dataset.append(BenchOwner(owner, naver_ids, project_ids))
+    return dataset
@@ -0,0 +1,92 @@
+import math
+import platform
+import statistics
+import time
+from contextlib import ExitStack
+
+import django
+from django.conf import settings
+from django.db import connection, connections
+
+# Settings that change what a request costs, recorded with every report
+REPORTED_SETTINGS = (
+    'ASYNC_VIEWS', 'RESPONSE_CACHE_ENABLED', 'CONDITIONAL_GET_ENABLED', 'FAST_LIST_SERIALIZATION',
+    'JWT_AUTH_STATELESS', 'PASSWORD_HASHER', 'METRICS_SAMPLE_RATE',
+)
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+class QueryCounter:
+    """``connection.execute_wrapper`` hook counting queries"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def percentile(sorted_values, fraction):
+    """Nearest rank percentile of an already sorted list"""
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+
+def run_scenario(name, scenario, ctx, iterations, warmup):
+    """Time ``iterations`` calls of scenario after ``warmup`` untimed ones"""
+    for i in range(warmup):
+        call(name, scenario, ctx, i)
+
+    latencies = []
+    queries = []
+    for i in range(warmup, warmup + iterations):
+        counter = QueryCounter()
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(counter))
+            start = time.perf_counter()
+            call(name, scenario, ctx, i)
+            latencies.append(time.perf_counter() - start)
+        queries.append(counter.count)
+
+    latencies.sort()
+    return {
+        'iterations': iterations,
+        'ops_per_sec': round(iterations / sum(latencies), 2),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        'queries_mean': round(statistics.mean(queries), 2),
+        'queries_max': max(queries),
+    }
+
+
+def call(name, scenario, ctx, i):
+    response, expected = scenario(ctx, i)
+    if response.status_code != expected:
+        raise BenchmarkError(f"{name} returned {response.status_code} instead of {expected}: {response.content[:200]}")
+    return response
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'settings': {name: getattr(settings, name, None) for name in REPORTED_SETTINGS},
+    }
+
+
+def compare(report, baseline):
+    """``{scenario: {metric: current / baseline}}`` for the scenarios both reports have"""
+    ratios = {}
+    for name, current in report['scenarios'].items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if previous:
+            ratios[name] = {
+                metric: round(current[metric] / previous[metric], 3) if previous[metric] else None
+                for metric in ('ops_per_sec', 'p50_ms', 'p99_ms', 'queries_mean')
+            }
+    return ratios
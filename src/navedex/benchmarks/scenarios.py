@@ -0,0 +1,68 @@
+from django.urls import reverse
+
+from navedex.benchmarks.factory import JOB_ROLES, PASSWORD
+from navedex.core.tokens import issue_tokens
+
+
+class BenchContext:
+    """State shared by the scenarios of a run: the client, the dataset and a seeded rng"""
+
+    def __init__(self, client, dataset, rng):
+        self.client = client
+        self.dataset = dataset
+        self.rng = rng
+        self.auth = {owner.user.pk: f'Bearer {issue_tokens(owner.user).access}' for owner in dataset}
+
+    def owner(self, i):
+        """Owners take turns, so every request hits a different user's rows"""
+        return self.dataset[i % len(self.dataset)]
+
+    def request(self, method, url, owner=None, **kwargs):
+        if owner is not None:
+            kwargs['HTTP_AUTHORIZATION'] = self.auth[owner.user.pk]
+        return getattr(self.client, method)(url, format='json', **kwargs)
+
+
+def login(ctx, i):
+    owner = ctx.owner(i)
+    return ctx.request('post', reverse('core:login'), data={'email': owner.user.email, 'password': PASSWORD}), 200
+
+
+def list_navers(ctx, i):
+    return ctx.request('get', reverse('navers:naver-list'), ctx.owner(i)), 200
+
+
+def filtered_list(ctx, i):
+    params = {'job_role': ctx.rng.choice(JOB_ROLES), 'admission_date__gte': '2015-01-01'}
+    return ctx.request('get', reverse('navers:naver-list'), ctx.owner(i), data=params), 200
+
+
+def detail(ctx, i):
+    owner = ctx.owner(i)
+    url = reverse('navers:naver-detail', args=[ctx.rng.choice(owner.naver_ids)])
+    return ctx.request('get', url, owner), 200
+
+
+def create(ctx, i):
+    owner = ctx.owner(i)
+    payload = {'name': f'Bench {i}', 'birthdate': '1990-01-01', 'admission_date': '2020-01-01',
+               'job_role': 'Developer', 'projects': ctx.rng.sample(owner.project_ids, min(2, len(owner.project_ids)))}
+    return ctx.request('post', reverse('navers:naver-list'), owner, data=payload), 201
+
+
+def m2m_update(ctx, i):
+    owner = ctx.owner(i)
+    url = reverse('navers:naver-detail', args=[ctx.rng.choice(owner.naver_ids)])
+    payload = {'projects': ctx.rng.sample(owner.project_ids, min(3, len(owner.project_ids)))}
+    return ctx.request('patch', url, owner, data=payload), 200
+
+
+# name -> callable(ctx, i) returning (response, expected status)
+SCENARIOS = {
+    'login': login,
+    'list': list_navers,
+    'filtered_list': filtered_list,
+    'detail': detail,
+    'create': create,
+    'm2m_update': m2m_update,
+}
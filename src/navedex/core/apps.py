@@ -2,4 +2,8 @@ from django.apps import AppConfig
 
 
 class CoreConfig(AppConfig):
-    name = 'core'
+    name = 'navedex.core'
+    label = 'core'
+
+    def ready(self):
+        from navedex.core import signals  # noqa: F401
@@ -0,0 +1,109 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.crypto import constant_time_compare
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework_simplejwt import authentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from navedex.core.tokens import AUTH_HASH_CLAIM, USER_CLAIMS, get_auth_hash
+
+
+class UserState(NamedTuple):
+    is_active: bool
+    is_staff: bool
+    auth_hash: str
+
+
+class UserStateCache:
+    """In-process ``user_id -> UserState`` map whose entries expire after ``ttl`` seconds.
+
+    Stateless requests check it instead of loading the whole user. Saving a
+    user drops its entry (see ``navedex.core.signals``), so a deactivation,
+    a staff change or a new password is seen at once by this process and
+    within ``ttl`` by the others. It keeps the ``JWT_AUTH_CACHE_SIZE`` most
+    recently used users.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id, ttl):
+        """Return the state of the user, None if it doesn't exist"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(user_id)
+                return entry[0]
+
+        row = get_user_model().objects.filter(pk=user_id).values_list('is_active', 'is_staff', 'password').first()
+        state = None
+        if row is not None:
+            is_active, is_staff, password = row
+            state = UserState(is_active, is_staff, get_auth_hash(password))
+        max_size = getattr(settings, 'JWT_AUTH_CACHE_SIZE', 10000)
+        with self._lock:
+            self._entries[user_id] = (state, now + ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+        return state
+
+    def invalidate(self, user_id=None):
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+
+user_states = UserStateCache()
+
+
+class JWTAuthentication(authentication.JWTAuthentication):
+    """JWT authentication that can skip the per-request user ``SELECT``.
+
+    With ``JWT_AUTH_STATELESS`` enabled the user is built from the token
+    claims as an unsaved ``User`` instance, good for ``owner`` filters and
+    foreign keys but never meant to be saved. ``is_active`` and ``is_staff``
+    come from :data:`user_states`, and a token whose password hash claim
+    no longer matches was revoked by a password change. Tokens missing the
+    claims and the default mode load the user from the database as
+    simplejwt does.
+    """
+
+    def get_user(self, validated_token):
+        if not getattr(settings, 'JWT_AUTH_STATELESS', False):
+            return super().get_user(validated_token)
+        if any(claim not in validated_token for claim in USER_CLAIMS + (AUTH_HASH_CLAIM,)):
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        state = user_states.get(user_id, getattr(settings, 'JWT_AUTH_CACHE_TTL', 30))
+        if state is None:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+        if not state.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        if not constant_time_compare(validated_token[AUTH_HASH_CLAIM], state.auth_hash):
+            raise AuthenticationFailed(_('Token was revoked'), code='token_revoked')
+
+        user = get_user_model()(**{
+            api_settings.USER_ID_FIELD: user_id,
+            **{claim: validated_token[claim] for claim in USER_CLAIMS},
+            'is_active': state.is_active,
+            'is_staff': state.is_staff,
+        })
+        user._state.adding = False
+        return user
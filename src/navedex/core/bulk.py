@@ -0,0 +1,320 @@
+import contextvars
+from contextlib import contextmanager
+
+from django.db import connections, router, transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from navedex.core.versions import touch_owner
+
+
+def get_through(model, relation):
+    """Return the through model of a M2M relation and its (source, target) columns.
+
+    Works for the forward field (``Naver.projects``) and for the reverse
+    accessor (``Project.navers``).
+    """
+    field = model._meta.get_field(relation)
+    if field.auto_created:
+        m2m = field.remote_field
+        return m2m.remote_field.through, f'{m2m.m2m_reverse_field_name()}_id', f'{m2m.m2m_field_name()}_id'
+    return field.remote_field.through, f'{field.m2m_field_name()}_id', f'{field.m2m_reverse_field_name()}_id'
+
+
+def get_related(model, relation):
+    """Return the model on the other side of a M2M relation and the relation back"""
+    field = model._meta.get_field(relation)
+    if field.auto_created:
+        return field.related_model, field.field.name
+    return field.related_model, field.related_query_name()
+
+
+# Set while the caller recounts the links itself, see deferred_link_counts()
+link_counts_deferred = contextvars.ContextVar('link_counts_deferred', default=False)
+
+# Rows recounted per UPDATE, under every backend's parameter limit
+COUNT_BATCH_SIZE = 500
+
+
+@contextmanager
+def deferred_link_counts():
+    """Make the signal receivers skip the link counts the block maintains in bulk"""
+    token = link_counts_deferred.set(True)
+    try:
+        yield
+    finally:
+        link_counts_deferred.reset(token)
+
+
+def count_links(model, relation):
+    """Expression counting the through rows of each row's relation"""
+    through, source, target = get_through(model, relation)
+    links = through.objects.filter(**{source: OuterRef('pk')}).order_by().values(source)
+    return Coalesce(Subquery(links.annotate(count=Count('*')).values('count')), 0)
+
+
+def refresh_link_counts(model, relation, ids, using=None):
+    """Recount ``model.link_counts[relation]`` of the rows with ids.
+
+    Counts are recomputed from the through table rather than incremented,
+    so they stay exact whatever ids a ``remove()`` was given and however
+    writes interleave. One ``UPDATE`` per batch, touching only those rows,
+    on the ``using`` database when given and the routed one otherwise.
+    """
+    field = getattr(model, 'link_counts', {}).get(relation)
+    ids = list(ids)
+    if field is None or not ids:
+        return
+    count = count_links(model, relation)
+    rows = model.objects.using(using) if using else model.objects
+    for start in range(0, len(ids), COUNT_BATCH_SIZE):
+        rows.filter(pk__in=ids[start:start + COUNT_BATCH_SIZE]).update(**{field: count})
+
+
+def refresh_links(model, relation, ids, related_ids, using=None):
+    """Recount both sides after links between ids and related_ids changed"""
+    refresh_link_counts(model, relation, ids, using=using)
+    related_model, reverse = get_related(model, relation)
+    refresh_link_counts(related_model, reverse, related_ids, using=using)
+
+
+def unlink_on_delete(instance, relation):
+    """Remember the rows linked to an instance about to be deleted"""
+    if not link_counts_deferred.get():
+        links = getattr(instance, relation).using(instance._state.db)
+        instance._unlinked_ids = set(links.values_list('pk', flat=True))
+
+
+def recount_unlinked(instance, relation):
+    """Recount the rows that lost their link to a deleted instance"""
+    ids = instance.__dict__.pop('_unlinked_ids', None)
+    if ids:
+        related_model, reverse = get_related(type(instance), relation)
+        refresh_link_counts(related_model, reverse, ids, using=instance._state.db)
+
+
+def bulk_insert(model, objs, batch_size=None):
+    """Insert objs with ``bulk_create`` making sure every obj gets its pk"""
+    connection = connections[router.db_for_write(model)]
+    if connection.features.can_return_rows_from_bulk_insert:
+        return model.objects.bulk_create(objs, batch_size=batch_size)
+
+    # SQLite can't return the new primary keys from a multi row INSERT
+    for obj in objs:
+        obj.save(force_insert=True)
+    return objs
+
+
+def bulk_link(model, relation, links, batch_size=None):
+    """Insert (source_id, target_id) pairs into the through table at once"""
+    through, source, target = get_through(model, relation)
+    rows = [through(**{source: source_id, target: target_id}) for source_id, target_id in links]
+    through.objects.bulk_create(rows, batch_size=batch_size, ignore_conflicts=True)
+
+
+def parse_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class BulkModelMixin:
+    """Create, update and delete many objects of the owner in one request.
+
+    ``POST``, ``PATCH`` and ``DELETE`` on ``<list>/bulk/`` take a JSON array.
+    Every id listed in ``relation_field`` is resolved with a single owner
+    scoped ``IN`` query, rows are written with ``bulk_create``/``bulk_update``
+    and the links with one insert on the through table, all inside a
+    transaction.
+
+    The request is all-or-nothing unless ``?mode=partial`` is given, in which
+    case the valid items are written and the invalid ones are reported. The
+    ``data`` of created and updated items lists ``relation_field`` as the
+    sorted distinct ids linked.
+    """
+    relation_field = None
+    related_model = None
+    bulk_max_items = 1000
+
+    @action(detail=False, methods=['post', 'patch', 'delete'])
+    def bulk(self, request):
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError({'non_field_errors': [_('Expected a list of items.')]})
+        if len(items) > self.bulk_max_items:
+            msg = _('Ensure this list has no more than %(max)d items.') % {'max': self.bulk_max_items}
+            raise ValidationError({'non_field_errors': [msg]})
+
+        validate, write, success = {
+            'POST': (self.bulk_validate_create, self.bulk_perform_create, status.HTTP_201_CREATED),
+            'PATCH': (self.bulk_validate_update, self.bulk_perform_update, status.HTTP_200_OK),
+            'DELETE': (self.bulk_validate_destroy, self.bulk_perform_destroy, status.HTTP_200_OK),
+        }[request.method]
+
+        results, valid = validate(items)
+        errors = [result for result in results if result is not None]
+        if errors and request.query_params.get('mode') != 'partial':
+            return Response({'results': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        # The owner's shard when sharding
+        with transaction.atomic(using=router.db_for_write(self.queryset.model)):
+            for index, data in write(valid):
+                results[index] = {'index': index, 'status': success, 'data': data}
+            # bulk_create/bulk_update and through table writes send no signals
+            touch_owner(request.user.pk)
+
+        response_status = status.HTTP_207_MULTI_STATUS if errors else success
+        return Response({'results': results}, status=response_status)
+
+    def bulk_set_link_count(self, obj, ids):
+        """Reflect the count just recounted in the database on the instance serialized"""
+        field = getattr(type(obj), 'link_counts', {}).get(self.relation_field)
+        if field is not None:
+            setattr(obj, field, len(ids))
+
+    def bulk_error(self, index, errors, error_status=status.HTTP_400_BAD_REQUEST):
+        return {'index': index, 'status': error_status, 'errors': errors}
+
+    def bulk_resolve_related(self, items):
+        """Return the ids referenced by items that belong to the owner"""
+        ids = {
+            parse_id(pk) for item in items
+            if isinstance(item, dict) and isinstance(item.get(self.relation_field), list)
+            for pk in item[self.relation_field]
+        }
+        ids.discard(None)
+        queryset = self.related_model.objects.filter(owner=self.request.user, id__in=ids)
+        return set(queryset.values_list('id', flat=True))
+
+    def bulk_check_related(self, item, related):
+        """Return the distinct related ids of an item, sorted, and the errors found on them"""
+        values = item.get(self.relation_field) or []
+        if not isinstance(values, list):
+            return [], [_('Expected a list of items but got type "%s".') % type(values).__name__]
+        ids = [parse_id(pk) for pk in values]
+        errors = [
+            _('Invalid pk "%s" - object does not exist.') % pk
+            for pk, parsed in zip(values, ids) if parsed not in related
+        ]
+        return ([] if errors else sorted(set(ids))), errors
+
+    def bulk_get_related_ids(self, ids):
+        """Map each id to its sorted related ids, with one query"""
+        through, source, target = get_through(self.queryset.model, self.relation_field)
+        links = through.objects.filter(**{f'{source}__in': ids}).order_by(source, target).values_list(source, target)
+        related = {pk: [] for pk in ids}
+        for source_id, target_id in links:
+            related[source_id].append(target_id)
+        return related
+
+    def bulk_validate_create(self, items):
+        related = self.bulk_resolve_related(items)
+        results, valid = [None] * len(items), []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                results[index] = self.bulk_error(index, {'non_field_errors': [_('Invalid data.')]})
+                continue
+            serializer = self.serializer_class(data=item)
+            serializer.is_valid()
+            errors = dict(serializer.errors)
+            ids, related_errors = self.bulk_check_related(item, related)
+            if related_errors:
+                errors[self.relation_field] = related_errors
+            if errors:
+                results[index] = self.bulk_error(index, errors)
+            else:
+                valid.append((index, serializer.validated_data, ids))
+        return results, valid
+
+    def bulk_perform_create(self, valid):
+        model = self.queryset.model
+        objs = [model(owner=self.request.user, **data) for index, data, ids in valid]
+        bulk_insert(model, objs)
+        links = [(obj.id, pk) for obj, (index, data, ids) in zip(objs, valid) for pk in ids]
+        bulk_link(model, self.relation_field, links)
+        refresh_links(model, self.relation_field, {obj_id for obj_id, pk in links}, {pk for obj_id, pk in links})
+        for obj, (index, data, ids) in zip(objs, valid):
+            self.bulk_set_link_count(obj, ids)
+            yield index, dict(self.serializer_class(obj).data, **{self.relation_field: ids})
+
+    def bulk_validate_update(self, items):
+        related = self.bulk_resolve_related(items)
+        ids = [parse_id(item.get('id')) if isinstance(item, dict) else None for item in items]
+        instances = self.get_queryset().in_bulk([pk for pk in ids if pk is not None])
+        results, valid = [None] * len(items), []
+        for index, (item, pk) in enumerate(zip(items, ids)):
+            if pk not in instances:
+                results[index] = self.bulk_error(index, {'id': [_('Not found.')]}, status.HTTP_404_NOT_FOUND)
+                continue
+            serializer = self.serializer_class(instances[pk], data=item, partial=True)
+            serializer.is_valid()
+            errors = dict(serializer.errors)
+            related_ids, related_errors = None, None
+            if self.relation_field in item:
+                related_ids, related_errors = self.bulk_check_related(item, related)
+            if related_errors:
+                errors[self.relation_field] = related_errors
+            if errors:
+                results[index] = self.bulk_error(index, errors)
+            else:
+                valid.append((index, instances[pk], serializer.validated_data, related_ids))
+        return results, valid
+
+    def bulk_perform_update(self, valid):
+        model = self.queryset.model
+        objs, fields = [], set()
+        for index, obj, data, ids in valid:
+            for attr, value in data.items():
+                setattr(obj, attr, value)
+            objs.append(obj)
+            fields.update(data)
+        if fields:
+            model.objects.bulk_update(objs, fields)
+
+        relinked = {obj.id: ids for index, obj, data, ids in valid if ids is not None}
+        if relinked:
+            through, source, target = get_through(model, self.relation_field)
+            links = through.objects.filter(**{f'{source}__in': list(relinked)})
+            unlinked = set(links.values_list(target, flat=True))
+            links.delete()
+            bulk_link(model, self.relation_field, [(pk, related) for pk, ids in relinked.items() for related in ids])
+            linked = {related for ids in relinked.values() for related in ids}
+            refresh_links(model, self.relation_field, list(relinked), unlinked | linked)
+
+        # Items that didn't send the relation report the links they keep
+        kept = self.bulk_get_related_ids([obj.id for index, obj, data, ids in valid if ids is None])
+        for index, obj, data, ids in valid:
+            if ids is None:
+                ids = kept[obj.id]
+            else:
+                self.bulk_set_link_count(obj, ids)
+            yield index, dict(self.serializer_class(obj).data, **{self.relation_field: ids})
+
+    def bulk_validate_destroy(self, items):
+        ids = [parse_id(item) for item in items]
+        found = set(self.get_queryset().filter(id__in=ids).values_list('id', flat=True))
+        results, valid = [None] * len(items), []
+        for index, pk in enumerate(ids):
+            if pk not in found:
+                results[index] = self.bulk_error(index, {'id': [_('Not found.')]}, status.HTTP_404_NOT_FOUND)
+            else:
+                valid.append((index, pk))
+        return results, valid
+
+    def bulk_perform_destroy(self, valid):
+        ids = [pk for index, pk in valid]
+        through, source, target = get_through(self.queryset.model, self.relation_field)
+        unlinked = set(through.objects.filter(**{f'{source}__in': ids}).values_list(target, flat=True))
+        with deferred_link_counts():
+            self.get_queryset().filter(id__in=ids).delete()
+        related_model, reverse = get_related(self.queryset.model, self.relation_field)
+        refresh_link_counts(related_model, reverse, unlinked)
+        for index, pk in valid:
+            yield index, {'id': pk}
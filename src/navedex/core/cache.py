@@ -0,0 +1,159 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.http import urlencode
+
+from navedex.core.async_views import database
+from navedex.core.db.sharding import shard_for
+
+# Backends that never block, safe to call from the event loop
+IN_PROCESS_CACHES = (LocMemCache, DummyCache)
+
+
+def get_cache():
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+
+async def call_cache(func, *args):
+    """Call func from the event loop, in the sync thread unless the cache is in-process.
+
+    The database backend can't run on the event loop at all, and memcached
+    or redis would block it.
+    """
+    if isinstance(get_cache(), IN_PROCESS_CACHES):
+        return func(*args)
+    return await database(func)(*args)
+
+
+def generation_key(owner_id):
+    return f'navedex:generation:{owner_id}'
+
+
+def get_generation(owner_id):
+    """Return the current generation of the owner's data.
+
+    A missing counter starts at the current time, so entries cached under an
+    evicted counter can never be hit again.
+    """
+    cache = get_cache()
+    key = generation_key(owner_id)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def _bump(owner_id):
+    cache = get_cache()
+    try:
+        cache.incr(generation_key(owner_id))
+    except ValueError:
+        cache.set(generation_key(owner_id), time.time_ns(), timeout=None)
+
+
+def invalidate_owner(owner_id):
+    """Expire every cached response of the owner in O(1).
+
+    The counter is bumped right away and again when the owner's database
+    commits, so a read racing an open transaction can't keep the old rows
+    cached under the new generation. Nothing to expire when the response
+    cache is disabled.
+    """
+    if not getattr(settings, 'RESPONSE_CACHE_ENABLED', False):
+        return
+    _bump(owner_id)
+    transaction.on_commit(lambda: _bump(owner_id), using=shard_for(owner_id))
+
+
+def request_variant(view, request):
+    """Everything besides the owner's data that shapes a list/retrieve response"""
+    params = urlencode(sorted(
+        (key, sorted(values)) for key, values in request.query_params.lists()
+    ), doseq=True)
+    return '|'.join((
+        request.get_host(),
+        request.accepted_media_type,
+        type(view).__name__,
+        view.action,
+        str(view.kwargs.get(view.lookup_url_kwarg or view.lookup_field, '')),
+        params,
+    ))
+
+
+class OwnerCacheMixin:
+    """Cache list and retrieve responses per (owner, route, query params).
+
+    Keys embed the owner's generation counter, which the navers and projects
+    signals bump on every write, so invalidation never scans keys and one
+    owner's writes never touch another owner's entries. Enabled with
+    ``RESPONSE_CACHE_ENABLED``.
+    """
+    cached_actions = ('list', 'retrieve', 'stats')
+
+    def list(self, request, *args, **kwargs):
+        return self.cached(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached(super().retrieve, request, *args, **kwargs)
+
+    async def async_list(self, request, *args, **kwargs):
+        return await self.acached(super().async_list, request, *args, **kwargs)
+
+    async def async_retrieve(self, request, *args, **kwargs):
+        return await self.acached(super().async_retrieve, request, *args, **kwargs)
+
+    def cached(self, handler, request, *args, **kwargs):
+        if not self.is_cacheable(request):
+            return handler(request, *args, **kwargs)
+        # The key is taken before reading the rows, so a write landing
+        # meanwhile only leaves an entry under the expired generation
+        key = self.get_cache_key(request)
+        cached = self.get_cached_response(key)
+        if cached is not None:
+            return cached
+        return self.cache_response(key, handler(request, *args, **kwargs))
+
+    async def acached(self, handler, request, *args, **kwargs):
+        if not self.is_cacheable(request):
+            return await handler(request, *args, **kwargs)
+        key = await call_cache(self.get_cache_key, request)
+        cached = await call_cache(self.get_cached_response, key)
+        if cached is not None:
+            return cached
+        return await call_cache(self.cache_response, key, await handler(request, *args, **kwargs))
+
+    def is_cacheable(self, request):
+        if not getattr(settings, 'RESPONSE_CACHE_ENABLED', False):
+            return False
+        return self.action in self.cached_actions and request.user.is_authenticated
+
+    def get_cache_key(self, request):
+        digest = hashlib.md5(request_variant(self, request).encode()).hexdigest()
+        owner_id = request.user.pk
+        return f'navedex:response:{owner_id}:{get_generation(owner_id)}:{digest}'
+
+    def get_cached_response(self, key):
+        cached = get_cache().get(key)
+        if cached is None:
+            return None
+        content, content_type = cached
+        return HttpResponse(content, content_type=content_type)
+
+    def cache_response(self, key, response):
+        if response.status_code != 200:
+            return response
+
+        response.accepted_renderer = self.request.accepted_renderer
+        response.accepted_media_type = self.request.accepted_media_type
+        response.renderer_context = self.get_renderer_context()
+        response.render()
+        timeout = getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300)
+        get_cache().set(key, (response.content, response['Content-Type']), timeout)
+        return response
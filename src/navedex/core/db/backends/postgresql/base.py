@@ -0,0 +1,59 @@
+import psycopg2
+from psycopg2 import extensions
+
+from django.db.backends.postgresql import base
+
+from navedex.core.db.pool import get_pool
+
+
+def ping(connection):
+    if connection.closed:
+        return False
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        return True
+    except psycopg2.Error:
+        return False
+
+
+def reset(connection):
+    """Leave the connection idle outside any transaction, as a new one would be"""
+    if connection.closed:
+        raise psycopg2.InterfaceError('connection already closed')
+    if connection.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+        connection.rollback()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """PostgreSQL backend taking its connections from an in-process :class:`ConnectionPool`.
+
+    Closing a connection, which Django does at the end of every request
+    unless ``CONN_MAX_AGE`` keeps it, returns it to the pool instead, so any
+    thread of the process picks it up on its next request without a new
+    TCP and authentication round. ``POOL_SIZE`` and ``POOL_MAX_IDLE`` in
+    the database settings size the pool.
+    """
+
+    @property
+    def pool(self):
+        return get_pool(
+            self.alias,
+            size=self.settings_dict.get('POOL_SIZE', 10),
+            max_idle=self.settings_dict.get('POOL_MAX_IDLE'),
+            ping=ping,
+            reset=reset,
+        )
+
+    def get_new_connection(self, conn_params):
+        idle = self.pool.get()
+        if idle is None:
+            return super().get_new_connection(conn_params)
+        # get_new_connection() reads it from a fresh connection
+        connection, self.isolation_level = idle
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.pool.put(self.connection, self.isolation_level)
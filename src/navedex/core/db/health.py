@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.db import connections
+
+
+def check_connections(**kwargs):
+    """Close persistent connections that stopped working before the request uses them.
+
+    Django 3.1 only checks a reused connection after a query failed on it,
+    so the first request after a database restart or failover would fail.
+    Enabled with ``DATABASE_HEALTH_CHECKS``; costs one ping per open
+    connection and request, and nothing when ``CONN_MAX_AGE`` is 0.
+    """
+    if not getattr(settings, 'DATABASE_HEALTH_CHECKS', False):
+        return
+    for connection in connections.all():
+        if connection.connection is not None and not connection.in_atomic_block and not connection.is_usable():
+            connection.close()
@@ -0,0 +1,92 @@
+import threading
+import time
+from collections import deque
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class ConnectionPool:
+    """Process wide stack of idle DB-API connections.
+
+    ``get`` hands out the most recently returned connection that still
+    answers ``ping`` and has not been idle more than ``max_idle`` seconds,
+    or None when the caller has to connect. ``put`` rolls the connection
+    back with ``reset`` and keeps it when fewer than ``size`` are idle,
+    otherwise it is closed. Nothing blocks: ``size`` bounds the idle
+    connections, not the open ones. Each connection travels with a
+    ``state`` the caller restores on checkout.
+    """
+
+    def __init__(self, size, max_idle=None, ping=None, reset=None):
+        self.size = size
+        self.max_idle = max_idle
+        self.ping = ping
+        self.reset = reset
+        self._idle = deque()
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Return ``(connection, state)`` of an idle connection, or None"""
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                connection, state, returned_at = self._idle.pop()
+            if self.max_idle is not None and time.monotonic() - returned_at > self.max_idle:
+                close_quietly(connection)
+            elif self.ping is not None and not self.ping(connection):
+                close_quietly(connection)
+            else:
+                return connection, state
+
+    def put(self, connection, state=None):
+        try:
+            if self.reset is not None:
+                self.reset(connection)
+        except Exception:
+            close_quietly(connection)
+            return
+        now = time.monotonic()
+        stale = []
+        with self._lock:
+            # The oldest connections sit at the bottom of the stack
+            while self.max_idle is not None and self._idle and now - self._idle[0][2] > self.max_idle:
+                stale.append(self._idle.popleft()[0])
+            if len(self._idle) < self.size:
+                self._idle.append((connection, state, now))
+            else:
+                stale.append(connection)
+        for connection in stale:
+            close_quietly(connection)
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, deque()
+        for connection, state, returned_at in idle:
+            close_quietly(connection)
+
+    def __len__(self):
+        return len(self._idle)
+
+
+def close_quietly(connection):
+    try:
+        connection.close()
+    except Exception:
+        pass
+
+
+def get_pool(alias, **kwargs):
+    """The pool of a database alias, created with kwargs on first use"""
+    with _pools_lock:
+        if alias not in _pools:
+            _pools[alias] = ConnectionPool(**kwargs)
+        return _pools[alias]
+
+
+def close_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close_all()
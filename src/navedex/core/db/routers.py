@@ -0,0 +1,179 @@
+import asyncio
+import contextvars
+import random
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject, empty
+
+from navedex.core.db.sharding import current_owner, is_sharded, is_sharding_enabled, shard_for
+
+# Request being served in this context, None outside of requests
+current_request = contextvars.ContextVar('navedex_db_request', default=None)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def pin_key(user_id):
+    return f'navedex:db-pin:{user_id}'
+
+
+def get_replicas():
+    return getattr(settings, 'DATABASE_REPLICAS', ())
+
+
+def get_loaded_user(request):
+    """The request's user if it was already loaded, without loading it"""
+    user = request.__dict__.get('user')
+    if isinstance(user, SimpleLazyObject) and user._wrapped is empty:
+        # Loading it here would route its own queries back to this check
+        return None
+    return user
+
+
+def is_pinned(request):
+    """Whether the request's user wrote in the last ``DATABASE_REPLICA_PIN_SECONDS``.
+
+    Looked up once the user is authenticated; the queries authenticating
+    it still go to a replica.
+    """
+    pinned = getattr(request, '_db_pinned', None)
+    if pinned is None:
+        user = get_loaded_user(request)
+        if user is None or not user.is_authenticated:
+            return False
+        pinned = request._db_pinned = bool(cache.get(pin_key(user.pk)))
+    return pinned
+
+
+def get_current_owner():
+    """Owner of the code running: the one of owner_context() or the request's user"""
+    owner_id = current_owner.get()
+    if owner_id is None:
+        request = current_request.get()
+        user = get_loaded_user(request) if request is not None else None
+        if user is not None and user.is_authenticated:
+            owner_id = user.pk
+    return owner_id
+
+
+class OwnerShardRouter:
+    """Send the rows of ``SHARDED_APPS`` to the shard their owner hashes to.
+
+    The owner is taken from the instance hint (the row itself, or the user
+    of a reverse manager) and otherwise from the running context: list and
+    detail querysets are filtered by the request's user, and the writes of
+    ``perform_create`` and of the M2M managers follow the instance they
+    belong to. Everything else is left to the next router.
+    """
+
+    def db_for_owner(self, model, instance=None, **hints):
+        if not is_sharding_enabled() or not is_sharded(model):
+            return None
+        if instance is not None:
+            if is_sharded(type(instance)) and instance._state.db is not None:
+                return instance._state.db
+            # Read from __dict__, owner_id may be deferred
+            if instance.__dict__.get('owner_id') is not None:
+                return shard_for(instance.owner_id)
+            if isinstance(instance, get_user_model()) and instance.pk is not None:
+                return shard_for(instance.pk)
+        owner_id = get_current_owner()
+        return shard_for(owner_id) if owner_id is not None else None
+
+    db_for_read = db_for_owner
+    db_for_write = db_for_owner
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if is_sharding_enabled() and is_sharded(type(obj1)) and is_sharded(type(obj2)):
+            return obj1._state.db == obj2._state.db
+        # Owners live on default and their rows anywhere
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
+
+
+def get_replica(request):
+    """Replica picked at random for the request, the same one for all of its reads"""
+    replica = getattr(request, '_db_replica', None)
+    if replica is None:
+        replica = request._db_replica = random.choice(get_replicas())
+    return replica
+
+
+class PrimaryReplicaRouter:
+    """Send the reads of safe requests to a replica, everything else to ``default``.
+
+    Reads outside a request (commands, shell) and reads of requests that
+    write stay on the primary, and so do the reads of a user who wrote
+    recently: every row belongs to its owner, so pinning the writer is
+    enough for nobody to see their own write missing. Users are always
+    read from the primary, a replica may not have the one who just signed
+    up or changed their password yet. The other reads of a request share
+    one replica, so they see the same point of its history.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = get_replicas()
+        request = current_request.get()
+        if not replicas or request is None or request.method not in SAFE_METHODS:
+            return 'default'
+        if model is get_user_model() or is_pinned(request):
+            return 'default'
+        return get_replica(request)
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
+
+
+def pin(request, response):
+    user = getattr(request, 'user', None)
+    if get_replicas() and request.method not in SAFE_METHODS and user is not None and user.is_authenticated:
+        cache.set(pin_key(user.pk), True, getattr(settings, 'DATABASE_REPLICA_PIN_SECONDS', 5))
+
+
+class ReplicaRoutingMiddleware:
+    """Expose the request to the routers and pin users to the primary after they write"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if hasattr(self, '_is_coroutine'):
+            return self.__acall__(request)
+        if not get_replicas() and not is_sharding_enabled():
+            return self.get_response(request)
+
+        token = current_request.set(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_request.reset(token)
+        pin(request, response)
+        return response
+
+    async def __acall__(self, request):
+        if not get_replicas() and not is_sharding_enabled():
+            return await self.get_response(request)
+
+        token = current_request.set(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_request.reset(token)
+        await sync_to_async(pin)(request, response)
+        return response
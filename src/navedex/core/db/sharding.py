@@ -0,0 +1,175 @@
+import bisect
+import contextvars
+import functools
+import hashlib
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections, transaction
+
+# Owner set explicitly for the code running in this context, see owner_context()
+current_owner = contextvars.ContextVar('navedex_db_owner', default=None)
+
+# Rows copied per INSERT when moving an owner
+MOVE_BATCH_SIZE = 500
+
+
+def get_shards():
+    return getattr(settings, 'DATABASE_SHARDS', ['default'])
+
+
+def is_sharding_enabled():
+    return len(get_shards()) > 1
+
+
+def is_sharded(model):
+    """Whether the model's rows live on their owner's shard, M2M through tables included"""
+    return model._meta.app_label in getattr(settings, 'SHARDED_APPS', ())
+
+
+def get_sharded_models():
+    return [model for model in apps.get_models(include_auto_created=True) if is_sharded(model)]
+
+
+def hash_key(value):
+    return int.from_bytes(hashlib.md5(str(value).encode()).digest()[:8], 'big')
+
+
+class HashRing:
+    """Consistent hash ring of database aliases.
+
+    Every alias gets ``vnodes`` points on the ring and a key belongs to the
+    first point after its hash, so adding a shard only moves the owners
+    that land on the new shard's points.
+    """
+
+    def __init__(self, aliases, vnodes):
+        points = sorted((hash_key(f'{alias}#{index}'), alias) for alias in aliases for index in range(vnodes))
+        self.hashes = [point for point, alias in points]
+        self.aliases = [alias for point, alias in points]
+
+    def get(self, key):
+        index = bisect.bisect(self.hashes, hash_key(key)) % len(self.hashes)
+        return self.aliases[index]
+
+
+@functools.lru_cache(maxsize=8)
+def get_ring(aliases, vnodes):
+    return HashRing(aliases, vnodes)
+
+
+def shard_for(owner_id):
+    """Database alias holding the rows of the owner"""
+    shards = get_shards()
+    if len(shards) == 1:
+        return shards[0]
+    return get_ring(tuple(shards), getattr(settings, 'DATABASE_SHARD_VNODES', 64)).get(owner_id)
+
+
+@contextmanager
+def owner_context(owner_id):
+    """Route the sharded queries of the block to the owner's shard"""
+    token = current_owner.set(owner_id)
+    try:
+        yield
+    finally:
+        current_owner.reset(token)
+
+
+def ensure_owners(users, alias):
+    """Copy the rows of users to alias so the owner foreign keys of its tables hold.
+
+    The copies can't log in; users are only read from ``default``.
+    """
+    if alias == 'default' or not users:
+        return
+    stubs = []
+    for user in users:
+        stub = type(user)(pk=user.pk, email=user.email, is_active=False)
+        stub.set_unusable_password()
+        stubs.append(stub)
+    type(stubs[0])._base_manager.using(alias).bulk_create(stubs, ignore_conflicts=True)
+
+
+def get_id_range(alias):
+    """First and last id of the rows created on alias.
+
+    Shards never hand out each other's ids, so rows keep their id when
+    their owner is moved.
+    """
+    span = getattr(settings, 'DATABASE_SHARD_ID_SPAN', 100000000)
+    index = get_shards().index(alias)
+    return index * span + 1, (index + 1) * span
+
+
+def reset_sequences(alias):
+    """Make the next id of every sharded table follow the largest id of alias' own range"""
+    start, end = get_id_range(alias)
+    connection = connections[alias]
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        for model in get_sharded_models():
+            table = model._meta.db_table
+            cursor.execute(f'SELECT MAX(id) FROM {quote(table)} WHERE id BETWEEN %s AND %s', [start, end])
+            last = cursor.fetchone()[0] or start - 1
+            if connection.vendor == 'sqlite':
+                # Inserting a moved row with a larger id moves the AUTOINCREMENT counter too
+                cursor.execute('UPDATE sqlite_sequence SET seq = %s WHERE name = %s', [last, table])
+                if not cursor.rowcount:
+                    cursor.execute('INSERT INTO sqlite_sequence (name, seq) VALUES (%s, %s)', [table, last])
+            elif connection.vendor == 'postgresql':
+                cursor.execute("SELECT setval(pg_get_serial_sequence(%s, 'id'), %s, false)", [table, last + 1])
+
+
+def get_owner_lookup(model):
+    """Lookup filtering the rows of a sharded model by owner"""
+    if hasattr(model, 'owner'):
+        return 'owner_id'
+    # M2M through rows belong to the owner of their source
+    field = next(field for field in model._meta.concrete_fields
+                 if field.is_relation and hasattr(field.related_model, 'owner'))
+    return f'{field.name}__owner_id'
+
+
+def get_owners(alias):
+    """Ids of the owners with rows on alias"""
+    owners = set()
+    for model in get_sharded_models():
+        if hasattr(model, 'owner'):
+            owners.update(model._base_manager.using(alias).order_by().values_list('owner_id', flat=True).distinct())
+    return owners
+
+
+def move_owner(owner_id, source, target):
+    """Copy the rows of the owner from source to target keeping their ids, then delete them from source.
+
+    The copy commits before the delete: a move stopped in between leaves
+    the rows on both databases and running it again completes it. Rows
+    the owner already wrote on target are kept. Returns the number of rows
+    moved per model.
+    """
+    rows = {
+        model: list(model._base_manager.using(source).filter(**{get_owner_lookup(model): owner_id}))
+        for model in get_sharded_models()
+    }
+    ensure_owners(list(get_user_model()._base_manager.using('default').filter(pk=owner_id)), target)
+    with transaction.atomic(using=target):
+        for model, objs in rows.items():
+            model._base_manager.using(target).bulk_create(objs, batch_size=MOVE_BATCH_SIZE, ignore_conflicts=True)
+        reset_sequences(target)
+
+    delete_owner_rows(owner_id, source)
+    return {model._meta.label: len(objs) for model, objs in rows.items()}
+
+
+def delete_owner_rows(owner_id, alias):
+    """Delete the rows of the owner from alias, without recounting links that go away with them"""
+    from navedex.core.bulk import deferred_link_counts
+
+    # Links first, the deletes of their sources have nothing left to cascade to
+    models = sorted(get_sharded_models(), key=lambda model: not model._meta.auto_created)
+    with transaction.atomic(using=alias), deferred_link_counts():
+        for model in models:
+            model._base_manager.using(alias).filter(**{get_owner_lookup(model): owner_id}).delete()
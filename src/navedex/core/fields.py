@@ -0,0 +1,65 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+
+from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
+
+
+class BatchedManyRelatedField(serializers.ManyRelatedField):
+    """Resolve every submitted primary key with a single ``id__in`` query.
+
+    DRF's ``ManyRelatedField`` runs one ``SELECT`` per id. Here the ids are
+    parsed first, loaded at once with ``in_bulk`` and every missing or
+    foreign id is reported in the same validation error. The returned
+    instances go straight to ``.set()`` on save.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+
+        child = self.child_relation
+        pk_field = child.get_queryset().model._meta.pk
+        pks = []
+        for item in data:
+            if isinstance(item, bool):
+                child.fail('incorrect_type', data_type=type(item).__name__)
+            try:
+                pks.append(pk_field.to_python(item))
+            except DjangoValidationError:
+                child.fail('incorrect_type', data_type=type(item).__name__)
+
+        found = child.get_queryset().in_bulk(pks)
+        missing = [pk for pk in pks if pk not in found]
+        if missing:
+            message = child.error_messages['does_not_exist']
+            raise serializers.ValidationError(
+                [message.format(pk_value=pk) for pk in missing],
+                code='does_not_exist'
+            )
+
+        return [found[pk] for pk in dict.fromkeys(pks)]
+
+
+class OwnerPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """Primary key field limited to the objects of the requesting user.
+
+    With ``many=True`` the ids are validated in batch by
+    :class:`BatchedManyRelatedField`.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        request = self.context.get('request')
+        if request is None:
+            return queryset
+        return queryset.filter(owner=request.user)
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BatchedManyRelatedField(**list_kwargs)
@@ -0,0 +1,134 @@
+import asyncio
+import functools
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import (
+    _clean_credentials, _get_backends, authenticate, get_user_model, user_login_failed
+)
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.exceptions import PermissionDenied
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Thread pool reserved for password hashing.
+
+    PBKDF2 (hashlib), Argon2 (argon2-cffi) and bcrypt release the GIL, so the
+    pool hashes in parallel while the event loop keeps serving requests.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'PASSWORD_HASH_WORKERS', None),
+                thread_name_prefix='navedex-hash'
+            )
+    return _executor
+
+
+async def offload(func, *args, **kwargs):
+    """Run a CPU bound hashing function without blocking the event loop.
+
+    With ``PASSWORD_HASH_OFFLOAD`` disabled it runs in the thread Django uses
+    for sync code, as any sync view would.
+    """
+    call = functools.partial(func, *args, **kwargs)
+    if not getattr(settings, 'PASSWORD_HASH_OFFLOAD', False):
+        return await sync_to_async(call, thread_sensitive=True)()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), call)
+
+
+def _get_user(username):
+    model = get_user_model()
+    try:
+        return model._default_manager.get_by_natural_key(username)
+    except model.DoesNotExist:
+        return None
+
+
+def _set_encoded_password(user, encoded):
+    user.password = encoded
+    user.save(update_fields=['password'])
+
+
+async def _amodel_authenticate(backend, request, username=None, password=None, **kwargs):
+    """``ModelBackend.authenticate()`` with the hashing offloaded.
+
+    It hashes even for unknown usernames, so timing doesn't reveal which
+    accounts exist, and upgrades outdated hashes on success.
+    """
+    if username is None:
+        username = kwargs.get(get_user_model().USERNAME_FIELD)
+    if username is None or password is None:
+        return None
+
+    user = await sync_to_async(_get_user, thread_sensitive=True)(username)
+    if user is None:
+        await offload(make_password, password)
+        return None
+
+    outdated = []
+    valid = await offload(check_password, password, user.password, outdated.append)
+    if not valid or not backend.user_can_authenticate(user):
+        return None
+
+    if outdated:
+        encoded = await offload(make_password, password)
+        await sync_to_async(_set_encoded_password, thread_sensitive=True)(user, encoded)
+    return user
+
+
+async def aauthenticate(request=None, **credentials):
+    """Async counterpart of ``authenticate()``.
+
+    Tries ``AUTHENTICATION_BACKENDS`` in order and sends ``user_login_failed``
+    when none accepts the credentials. Backends using ``ModelBackend``'s own
+    ``authenticate()`` get their hashing offloaded, the others run in the
+    thread Django uses for sync code.
+    """
+    for backend, backend_path in _get_backends(return_tuples=True):
+        try:
+            inspect.signature(backend.authenticate).bind(request, **credentials)
+        except TypeError:
+            continue
+        try:
+            if type(backend).authenticate is ModelBackend.authenticate:
+                user = await _amodel_authenticate(backend, request, **credentials)
+            else:
+                user = await sync_to_async(backend.authenticate, thread_sensitive=True)(request, **credentials)
+        except PermissionDenied:
+            break
+        if user is None:
+            continue
+        user.backend = backend_path
+        return user
+
+    await sync_to_async(user_login_failed.send, thread_sensitive=True)(
+        sender=authenticate.__module__,
+        credentials=_clean_credentials(credentials),
+        request=request
+    )
+    return None
+
+
+async def acreate_user(email, password, **extra_fields):
+    """Async counterpart of ``User.objects.create_user`` with the hashing offloaded"""
+    if not email:
+        raise ValueError("Users must have an email address")
+    encoded = await offload(make_password, password)
+
+    def create():
+        manager = get_user_model().objects
+        user = manager.model(email=manager.normalize_email(email), password=encoded, **extra_fields)
+        user.save(using=manager._db)
+        return user
+
+    return await sync_to_async(create, thread_sensitive=True)()
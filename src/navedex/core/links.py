@@ -0,0 +1,77 @@
+from django.db import router, transaction
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from navedex.core.bulk import bulk_link, get_through, parse_id, refresh_links
+from navedex.core.versions import touch_owner
+
+
+class LinksMixin:
+    """Link and unlink related objects of one object without replacing the whole set.
+
+    The view declares an extra ``detail`` action named after its
+    ``relation_field`` that calls :meth:`change_links`, so ``POST`` and
+    ``DELETE`` on ``<detail>/<relation_field>/`` take a JSON array of
+    related ids. Only the through rows of those ids are read and written:
+    one bulk insert or one delete, inside a transaction. Both are
+    idempotent, ids already linked are skipped by ``POST`` and ids not
+    linked are ignored by ``DELETE``.
+    """
+    relation_field = None
+    related_model = None
+    links_max_items = 1000
+
+    def change_links(self, request):
+        adding = request.method == 'POST'
+        ids = self.links_validate(request.data, check_owner=adding)
+        obj = self.get_object()
+        with transaction.atomic(using=router.db_for_write(type(obj), instance=obj)):
+            changed = self.links_add(obj, ids) if adding else self.links_remove(obj, ids)
+            if changed:
+                refresh_links(type(obj), self.relation_field, [obj.pk], changed)
+                # Through table writes send no m2m_changed
+                touch_owner(request.user.pk)
+        return Response({'added' if adding else 'removed': sorted(changed)}, status=status.HTTP_200_OK)
+
+    def links_validate(self, items, check_owner):
+        """Return the distinct ids listed, raising if any isn't a related object of the owner"""
+        if not isinstance(items, list):
+            raise ValidationError({self.relation_field: [
+                _('Expected a list of items but got type "%s".') % type(items).__name__
+            ]})
+        if len(items) > self.links_max_items:
+            msg = _('Ensure this list has no more than %(max)d items.') % {'max': self.links_max_items}
+            raise ValidationError({self.relation_field: [msg]})
+
+        ids = [parse_id(pk) for pk in items]
+        found = set(ids)
+        if check_owner:
+            queryset = self.related_model.objects.filter(owner=self.request.user, id__in=found - {None})
+            found = set(queryset.values_list('id', flat=True))
+        errors = [
+            _('Invalid pk "%s" - object does not exist.') % pk
+            for pk, parsed in zip(items, ids) if parsed is None or parsed not in found
+        ]
+        if errors:
+            raise ValidationError({self.relation_field: errors})
+        return list(dict.fromkeys(ids))
+
+    def links_add(self, obj, ids):
+        """Link the ids not linked yet, return them"""
+        through, source, target = get_through(type(obj), self.relation_field)
+        linked = set(through.objects.filter(**{source: obj.pk, f'{target}__in': ids}).values_list(target, flat=True))
+        added = [pk for pk in ids if pk not in linked]
+        bulk_link(type(obj), self.relation_field, [(obj.pk, pk) for pk in added])
+        return added
+
+    def links_remove(self, obj, ids):
+        """Unlink the ids that are linked, return them"""
+        through, source, target = get_through(type(obj), self.relation_field)
+        links = through.objects.filter(**{source: obj.pk, f'{target}__in': ids})
+        removed = list(links.values_list(target, flat=True))
+        if removed:
+            links.delete()
+        return removed
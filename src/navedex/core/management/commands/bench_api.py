@@ -0,0 +1,67 @@
+import json
+import random
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import override_settings
+
+from rest_framework.test import APIClient
+
+from navedex.benchmarks import factory, runner
+from navedex.benchmarks.scenarios import SCENARIOS, BenchContext
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the API scenarios through the test client over a synthetic dataset and report "
+        "ops/s, p50/p99 latency and query counts as JSON. The dataset is inserted in a "
+        "transaction that is rolled back at the end, and the same seed gives the same run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10)
+        parser.add_argument('--navers', type=int, default=200, help="Navers per user")
+        parser.add_argument('--projects', type=int, default=20, help="Projects per user")
+        parser.add_argument('--density', type=int, default=3, help="Average projects per naver")
+        parser.add_argument('--iterations', type=int, default=200, help="Timed requests per scenario")
+        parser.add_argument('--warmup', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS))
+        parser.add_argument('--output', help="Write the report to this file instead of stdout")
+        parser.add_argument('--compare', help="Report of a previous run to compute ratios against")
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 or options['navers'] < 1:
+            raise CommandError("--users and --navers must be at least 1")
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as file:
+                baseline = json.load(file)
+
+        report = {
+            'environment': runner.environment(),
+            'dataset': {name: options[name] for name in ('users', 'navers', 'projects', 'density', 'seed')},
+            'scenarios': {},
+        }
+        # The test client talks to "testserver"
+        with override_settings(ALLOWED_HOSTS=['testserver']), transaction.atomic():
+            dataset = factory.generate(options['users'], options['navers'], options['projects'],
+                                       options['density'], options['seed'])
+            for name in options['scenarios']:
+                ctx = BenchContext(APIClient(), dataset, random.Random(options['seed']))
+                try:
+                    report['scenarios'][name] = runner.run_scenario(
+                        name, SCENARIOS[name], ctx, options['iterations'], options['warmup']
+                    )
+                except runner.BenchmarkError as exc:
+                    raise CommandError(str(exc))
+            transaction.set_rollback(True)
+
+        if baseline is not None:
+            report['compared_to'] = runner.compare(report, baseline)
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                file.write(output + '\n')
+        else:
+            self.stdout.write(output)
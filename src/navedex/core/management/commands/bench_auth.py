@@ -0,0 +1,50 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.hashers import get_hashers
+from django.core.management.base import BaseCommand
+
+
+def hashes_per_second(hasher, seconds, workers):
+    """Encode passwords on ``workers`` threads for about ``seconds`` and return the rate"""
+    salt = hasher.salt()
+    deadline = time.perf_counter() + seconds
+
+    def run():
+        count = 0
+        while time.perf_counter() < deadline:
+            hasher.encode('navedex-benchmark', salt)
+            count += 1
+        return count
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        total = sum(executor.map(lambda _: run(), range(workers)))
+    return total / (time.perf_counter() - start)
+
+
+class Command(BaseCommand):
+    help = "Report password hashes per second for every configured hasher"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seconds', type=float, default=2.0,
+                            help="Time spent measuring each hasher and thread count")
+        parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                            help="Threads used for the parallel measurement")
+
+    def handle(self, *args, **options):
+        seconds, workers = options['seconds'], options['workers']
+        self.stdout.write(f"{'hasher':<16} {'1 thread':>10} {f'{workers} threads':>12} {'per core':>10}")
+        for hasher in get_hashers():
+            try:
+                hasher.encode('navedex-benchmark', hasher.salt())
+            except ValueError as exc:
+                self.stdout.write(self.style.WARNING(f"{hasher.algorithm:<16} skipped: {exc}"))
+                continue
+
+            single = hashes_per_second(hasher, seconds, 1)
+            parallel = hashes_per_second(hasher, seconds, workers)
+            self.stdout.write(
+                f"{hasher.algorithm:<16} {single:10.1f} {parallel:12.1f} {parallel / workers:10.1f}"
+            )
@@ -0,0 +1,64 @@
+import copy
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.utils import load_backend
+
+# name -> (engine or None for the configured one, CONN_MAX_AGE, health checks)
+MODES = {
+    'new connection': (None, 0, False),
+    'persistent': (None, None, True),
+    'pooled': ('navedex.core.db.backends.postgresql', 0, False),
+}
+
+
+def simulate_requests(wrapper, requests, health_checks):
+    """Run the connection handling of ``requests`` requests doing one query each.
+
+    Mirrors what Django does around a request: ``close_old_connections``
+    when it starts and finishes, plus the health check of
+    ``DATABASE_HEALTH_CHECKS``. Returns seconds per request and the number
+    of physical connections opened.
+    """
+    opened = set()
+    start = time.perf_counter()
+    for _ in range(requests):
+        wrapper.close_if_unusable_or_obsolete()
+        if health_checks and wrapper.connection is not None and not wrapper.is_usable():
+            wrapper.close()
+        with wrapper.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+        opened.add(wrapper.connection)
+        wrapper.close_if_unusable_or_obsolete()
+    elapsed = time.perf_counter() - start
+    wrapper.close()
+    return elapsed / requests, len(opened)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the per request connection overhead of the default database opening a new "
+        "connection every request, keeping a persistent one and taking it from the in-process "
+        "pool (PostgreSQL only)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        base = connections.databases['default']
+        self.stdout.write(f"{'mode':<16} {'ms/request':>12} {'connections':>12}")
+        for name, (engine, max_age, health_checks) in MODES.items():
+            if engine is not None and connections['default'].vendor != 'postgresql':
+                self.stdout.write(self.style.WARNING(f"{name:<16} skipped, needs PostgreSQL"))
+                continue
+            settings_dict = copy.deepcopy(base)
+            settings_dict['CONN_MAX_AGE'] = max_age
+            if engine is not None:
+                settings_dict.update(ENGINE=engine, POOL_SIZE=settings.DATABASE_POOL_SIZE or 10)
+            wrapper = load_backend(settings_dict['ENGINE']).DatabaseWrapper(settings_dict, f'bench-db-{name}')
+            per_request, opened = simulate_requests(wrapper, options['requests'], health_checks)
+            self.stdout.write(f"{name:<16} {per_request * 1000:12.3f} {opened:12d}")
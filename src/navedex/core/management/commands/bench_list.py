@@ -0,0 +1,63 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from rest_framework.renderers import JSONRenderer
+
+from navedex.core.fast import ValuesListSerializer, compile_plan
+from navedex.core.renderers import FastJSONRenderer
+from navedex.navers.models import Naver
+from navedex.navers.serializers import NaverSerializer
+
+
+def rows_per_second(rows, func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return rows * repeat / (time.perf_counter() - start), result
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare rows/s of the navers list built through NaverSerializer and JSONRenderer "
+        "with the .values() fast path and FastJSONRenderer. Rows are inserted in a "
+        "transaction that is rolled back at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        with transaction.atomic():
+            owner = get_user_model().objects.create_user('bench-list@navedex.com.br', 'bench')
+            Naver.objects.bulk_create([
+                Naver(owner=owner, name=f'Naver {i}', birthdate='1990-01-01',
+                      admission_date='2020-01-01', job_role='Developer')
+                for i in range(rows)
+            ], batch_size=1000)
+            queryset = Naver.objects.filter(owner=owner).order_by('id')
+            fields = NaverSerializer.Meta.fields
+            plan = compile_plan(NaverSerializer, tuple(fields))
+
+            def slow():
+                data = NaverSerializer(queryset.only(*fields), many=True).data
+                return JSONRenderer().render(data)
+
+            def fast():
+                data = ValuesListSerializer(queryset.values(*fields), plan).data
+                return FastJSONRenderer().render(data)
+
+            slow_rate, slow_body = rows_per_second(rows, slow, repeat)
+            fast_rate, fast_body = rows_per_second(rows, fast, repeat)
+            transaction.set_rollback(True)
+
+        if slow_body != fast_body:
+            raise CommandError("The fast path output differs from the serializer output")
+        self.stdout.write(f"{'path':<28} {'rows/s':>12}")
+        self.stdout.write(f"{'serializer + JSONRenderer':<28} {slow_rate:12.0f}")
+        self.stdout.write(f"{'values + FastJSONRenderer':<28} {fast_rate:12.0f}")
+        self.stdout.write(f"speedup {fast_rate / slow_rate:.1f}x, identical output")
@@ -0,0 +1,61 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from navedex.core.search import search
+from navedex.navers.models import Naver
+from navedex.navers.views import NaverViewSet
+
+FIRST_NAMES = ['Ana', 'Bruno', 'Carla', 'Davi', 'Elisa', 'Fabio', 'Gabriela', 'Heitor', 'Isabela', 'Joao']
+LAST_NAMES = ['Silva', 'Souza', 'Costa', 'Santos', 'Oliveira', 'Pereira', 'Lima', 'Ferreira', 'Almeida']
+JOB_ROLES = ['Developer', 'Designer', 'Devops', 'Tester', 'Manager', 'Analyst', 'Architect']
+TERMS = ['ana', 'sil', 'dev', 'des', 'car sou', 'jo', 'manager', 'isabela lima', 'arch', 'zzz']
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure ?search= latency over the navers of a throwaway owner at several sizes. "
+        "Rows are inserted in a transaction that is rolled back at the end of each size."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+        parser.add_argument('--queries', type=int, default=50, help="Searches timed per size")
+        parser.add_argument('--page-size', type=int, default=100)
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+        self.stdout.write(f"{'navers':>10} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+        for size in options['sizes']:
+            with transaction.atomic():
+                owner = get_user_model().objects.create_user('bench-search@navedex.com.br', 'bench')
+                batch = []
+                for i in range(size):
+                    batch.append(Naver(
+                        owner=owner, name=f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+                        birthdate='1990-01-01', admission_date='2020-01-01', job_role=rng.choice(JOB_ROLES)
+                    ))
+                    if len(batch) == 10000:
+                        Naver.objects.bulk_create(batch)
+                        batch = []
+                Naver.objects.bulk_create(batch)
+
+                queryset = Naver.objects.filter(owner=owner)
+                latencies = []
+                for i in range(options['queries']):
+                    term = TERMS[i % len(TERMS)]
+                    start = time.perf_counter()
+                    page = search(queryset, NaverViewSet.search_fields, term)[:options['page_size']]
+                    list(page)
+                    latencies.append((time.perf_counter() - start) * 1000)
+
+                latencies.sort()
+                p95 = latencies[int(len(latencies) * 0.95) - 1]
+                self.stdout.write(
+                    f"{size:>10} {statistics.median(latencies):8.1f} {p95:8.1f} {latencies[-1]:8.1f}"
+                )
+                transaction.set_rollback(True)
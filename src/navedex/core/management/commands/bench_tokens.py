@@ -0,0 +1,46 @@
+import ast
+import json
+import timeit
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from navedex.core.tokens import GRANT_ACCESS, issue_tokens
+
+
+def legacy_issue_tokens(user):
+    """Token issuing as LoginSerializer did it before navedex.core.tokens"""
+    refresh = RefreshToken.for_user(user)
+    token = json.dumps({
+        'refresh': str(refresh),
+        'access': str(refresh.access_token)
+    })
+    return ast.literal_eval(token)
+
+
+class Command(BaseCommand):
+    help = "Compare the time spent issuing login tokens per strategy"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--number', type=int, default=2000,
+                            help="Tokens issued per measurement")
+        parser.add_argument('--repeat', type=int, default=5,
+                            help="Measurements taken, the best one is reported")
+
+    def handle(self, *args, **options):
+        # Tokens only need the user attributes, the database is not touched
+        user = get_user_model()(id=1, email='bench@navedex.com.br')
+        strategies = [
+            ('legacy json + literal_eval', lambda: legacy_issue_tokens(user)),
+            ('issue_tokens pair', lambda: issue_tokens(user)),
+            ('issue_tokens access', lambda: issue_tokens(user, GRANT_ACCESS)),
+        ]
+
+        baseline = None
+        for name, func in strategies:
+            best = min(timeit.repeat(func, number=options['number'], repeat=options['repeat']))
+            per_op = best / options['number'] * 1e6
+            baseline = baseline or per_op
+            self.stdout.write(f"{name:<30} {per_op:8.1f} us/login  {baseline / per_op:5.2f}x")
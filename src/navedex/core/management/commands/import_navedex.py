@@ -0,0 +1,175 @@
+import csv
+import json
+import os
+import time
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import router, transaction
+
+from navedex.core.bulk import bulk_insert, bulk_link, parse_id, refresh_links
+from navedex.core.db.sharding import owner_context
+from navedex.core.models import ImportCheckpoint
+from navedex.core.versions import touch_owner
+from navedex.navers.models import Naver
+from navedex.navers.serializers import NaverCreateSerializer
+from navedex.projects.models import Project
+from navedex.projects.serializers import ProjectCreateSerializer
+
+# serializer validating the rows, relation column and its related model
+TARGETS = {
+    'navers': (NaverCreateSerializer, 'projects', Project),
+    'projects': (ProjectCreateSerializer, 'navers', Naver),
+}
+
+# Separates the related names/ids inside a CSV cell
+CSV_LIST_SEPARATOR = ';'
+
+
+def read_csv(file, relation):
+    for row in csv.DictReader(file):
+        refs = row.pop(relation, None) or ''
+        row[relation] = [ref.strip() for ref in refs.split(CSV_LIST_SEPARATOR) if ref.strip()]
+        yield row
+
+
+class InvalidRow:
+    """A row the reader couldn't parse, rejected with the others"""
+
+    def __init__(self, message):
+        self.message = message
+
+
+def read_ndjson(file, relation):
+    for line in file:
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError as exc:
+                yield InvalidRow(f'Invalid JSON: {exc}')
+
+
+READERS = {'csv': read_csv, 'ndjson': read_ndjson}
+
+
+class Command(BaseCommand):
+    help = (
+        "Import navers or projects of an owner from a CSV or NDJSON file. Rows are validated "
+        "with the API rules, related projects/navers are given by id or name, and every chunk "
+        "is written with bulk inserts in its own transaction along with the number of rows done, "
+        "so --resume continues after the last committed chunk of the same file, owner and target."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('target', choices=sorted(TARGETS))
+        parser.add_argument('path', help="CSV with a header row, or one JSON object per line")
+        parser.add_argument('--owner', required=True, help="Email of the user the rows belong to")
+        parser.add_argument('--format', choices=sorted(READERS),
+                            help="Input format, guessed from the file extension by default")
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help="Rows validated and written per transaction")
+        parser.add_argument('--resume', action='store_true',
+                            help="Skip the rows committed by a previous interrupted run")
+
+    def handle(self, *args, **options):
+        self.serializer_class, self.relation, self.related_model = TARGETS[options['target']]
+        self.model = self.serializer_class.Meta.model
+        try:
+            self.owner = get_user_model().objects.get(email=options['owner'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User {options['owner']} does not exist")
+
+        path, self.batch_size = options['path'], options['batch_size']
+        file_format = options['format'] or os.path.splitext(path)[1].lstrip('.').lower()
+        if file_format not in READERS:
+            raise CommandError("Unknown file format, use --format csv or --format ndjson")
+
+        imported = rejected = 0
+        start = time.perf_counter()
+        with owner_context(self.owner.pk), open(path, newline='') as file:
+            using = router.db_for_write(self.model)
+            # Same database as the rows, so both commit together
+            checkpoints = ImportCheckpoint.objects.using(using)
+            key = dict(owner_id=self.owner.pk, target=options['target'], path=os.path.abspath(path))
+            done = 0
+            if options['resume']:
+                done = checkpoints.filter(**key).values_list('rows', flat=True).first() or 0
+            if done:
+                self.stdout.write(f"Resuming after row {done}")
+
+            rows = islice(READERS[file_format](file, self.relation), done, None)
+            while True:
+                chunk = list(islice(rows, self.batch_size))
+                if not chunk:
+                    break
+                with transaction.atomic(using=using):
+                    valid, errors = self.validate(chunk, first=done + 1)
+                    self.write(valid)
+                    touch_owner(self.owner.pk)
+                    checkpoints.update_or_create(**key, defaults={'rows': done + len(chunk)})
+                done += len(chunk)
+
+                imported += len(valid)
+                rejected += len(errors)
+                for line, error in errors:
+                    self.stderr.write(f"row {line}: {json.dumps(error)}")
+                rate = (imported + rejected) / (time.perf_counter() - start)
+                self.stdout.write(f"{done} rows read, {imported} imported, {rejected} rejected, {rate:.0f} rows/s")
+
+            checkpoints.filter(**key).delete()
+        self.stdout.write(self.style.SUCCESS(f"Imported {imported} {options['target']}, rejected {rejected}"))
+
+    def validate(self, chunk, first):
+        """Return the (validated data, related ids) of the valid rows and the errors of the others"""
+        related = self.resolve_related(
+            ref for row in chunk if isinstance(row, dict) and isinstance(row.get(self.relation), list)
+            for ref in row[self.relation]
+        )
+        valid, errors = [], []
+        for line, row in enumerate(chunk, first):
+            if isinstance(row, InvalidRow):
+                errors.append((line, {'non_field_errors': [row.message]}))
+                continue
+            if not isinstance(row, dict):
+                errors.append((line, {'non_field_errors': ['Invalid data.']}))
+                continue
+            refs = row.pop(self.relation, None) or []
+            if not isinstance(refs, list):
+                errors.append((line, {self.relation: ['Expected a list of ids or names.']}))
+                continue
+            serializer = self.serializer_class(data=row)
+            serializer.is_valid()
+            row_errors = dict(serializer.errors)
+            ids = [related.get(str(ref)) for ref in refs]
+            missing = [ref for ref, pk in zip(refs, ids) if pk is None]
+            if missing:
+                row_errors[self.relation] = [f'"{ref}" not found or ambiguous' for ref in missing]
+
+            if row_errors:
+                errors.append((line, row_errors))
+            else:
+                valid.append((serializer.validated_data, ids))
+        return valid, errors
+
+    def resolve_related(self, refs):
+        """Map every id or name referenced by a chunk to the owner's object id with two queries"""
+        refs = {str(ref) for ref in refs}
+        ids = {parse_id(ref) for ref in refs} - {None}
+        names = {ref for ref in refs if parse_id(ref) is None}
+        queryset = self.related_model.objects.filter(owner=self.owner)
+
+        resolved = {str(pk): pk for pk in queryset.filter(id__in=ids).values_list('id', flat=True)}
+        by_name = {}
+        for pk, name in queryset.filter(name__in=names).values_list('id', 'name'):
+            by_name.setdefault(name, []).append(pk)
+        # A name shared by several objects can't tell which one is meant
+        resolved.update({name: pks[0] for name, pks in by_name.items() if len(pks) == 1})
+        return resolved
+
+    def write(self, valid):
+        objs = [self.model(owner=self.owner, **data) for data, ids in valid]
+        bulk_insert(self.model, objs, batch_size=self.batch_size)
+        links = [(obj.id, pk) for obj, (data, ids) in zip(objs, valid) for pk in ids]
+        bulk_link(self.model, self.relation, links, batch_size=self.batch_size)
+        refresh_links(self.model, self.relation, {obj_id for obj_id, pk in links}, {pk for obj_id, pk in links})
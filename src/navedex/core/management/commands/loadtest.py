@@ -0,0 +1,68 @@
+import json
+import statistics
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+def login(base_url, email, password):
+    url = urllib.parse.urljoin(base_url, '/auth/login/?grant=access')
+    body = json.dumps({'email': email, 'password': password}).encode()
+    request = urllib.request.Request(url, body, {'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return json.load(response)['access_token']
+    except urllib.error.HTTPError as exc:
+        raise CommandError(f"Login failed with {exc.code}: {exc.read().decode()}")
+
+
+class Command(BaseCommand):
+    help = (
+        "Hammer a running server with concurrent GETs and report throughput and latency. "
+        "Run it against one WSGI worker and one ASGI worker to compare the concurrency each "
+        "process sustains."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('url', help="Endpoint to request, e.g. http://127.0.0.1:8000/api/navers/")
+        parser.add_argument('--email', help="Log in with this user before the run")
+        parser.add_argument('--password')
+        parser.add_argument('--concurrency', type=int, default=32)
+        parser.add_argument('--requests', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        headers = {'Accept': 'application/json'}
+        if options['email']:
+            token = login(options['url'], options['email'], options['password'])
+            headers['Authorization'] = f'Bearer {token}'
+
+        def fetch(_):
+            start = time.perf_counter()
+            request = urllib.request.Request(options['url'], headers=headers)
+            try:
+                with urllib.request.urlopen(request) as response:
+                    response.read()
+                    ok = response.status < 400
+            except (urllib.error.URLError, ConnectionError):
+                ok = False
+            return ok, time.perf_counter() - start
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            results = list(executor.map(fetch, range(options['requests'])))
+        elapsed = time.perf_counter() - start
+
+        latencies = sorted(latency for ok, latency in results if ok)
+        errors = len(results) - len(latencies)
+        if not latencies:
+            raise CommandError(f"All {errors} requests failed")
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        self.stdout.write(
+            f"{len(results)} requests, concurrency {options['concurrency']}, {errors} errors\n"
+            f"{len(results) / elapsed:.1f} req/s  "
+            f"p50 {statistics.median(latencies) * 1000:.1f} ms  p99 {p99 * 1000:.1f} ms"
+        )
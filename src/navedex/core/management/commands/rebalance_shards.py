@@ -0,0 +1,56 @@
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from navedex.core.db.sharding import ensure_owners, get_owners, get_shards, move_owner, shard_for
+from navedex.core.versions import touch_owner
+
+
+class Command(BaseCommand):
+    help = (
+        "Move every owner whose navers and projects aren't on the shard its id hashes to, "
+        "after DATABASE_SHARD_URLS changed. Rows keep their ids, each owner is copied in a "
+        "transaction on its new shard before being deleted from the old one, and running it "
+        "again after an interruption finishes the moves left."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Only list the owners that would move")
+        parser.add_argument('--batch-size', type=int, default=1000, help="Users copied to the shards per INSERT")
+
+    def handle(self, *args, **options):
+        shards = get_shards()
+        if len(shards) == 1:
+            self.stdout.write("Sharding is disabled, set DATABASE_SHARD_URLS")
+            return
+        if not options['dry_run']:
+            self.copy_owners(options['batch_size'])
+
+        moved = 0
+        for source in shards:
+            for owner_id in sorted(get_owners(source)):
+                target = shard_for(owner_id)
+                if target == source:
+                    continue
+                if options['dry_run']:
+                    self.stdout.write(f"owner {owner_id}: {source} -> {target}")
+                else:
+                    rows = move_owner(owner_id, source, target)
+                    touch_owner(owner_id)
+                    counts = ', '.join(f'{count} {label}' for label, count in rows.items())
+                    self.stdout.write(f"owner {owner_id}: {source} -> {target} ({counts})")
+                moved += 1
+        self.stdout.write(self.style.SUCCESS(f"{moved} owners {'to move' if options['dry_run'] else 'moved'}"))
+
+    def copy_owners(self, batch_size):
+        """Give every shard the rows of the users hashed to it, so their new rows can reference them"""
+        batches = defaultdict(list)
+        for user in get_user_model()._base_manager.using('default').only('id', 'email').iterator(batch_size):
+            batch = batches[shard_for(user.pk)]
+            batch.append(user)
+            if len(batch) == batch_size:
+                ensure_owners(batch, shard_for(user.pk))
+                batch.clear()
+        for alias, batch in batches.items():
+            ensure_owners(batch, alias)
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max, Min
+
+from navedex.core.bulk import count_links
+from navedex.core.db.sharding import get_shards
+from navedex.navers.models import Naver
+from navedex.projects.models import Project
+
+MODELS = {'navers': Naver, 'projects': Project}
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the denormalized link counts (Naver.project_count, Project.naver_count) from the "
+        "through table. Each batch is a single UPDATE over an id range that only touches the "
+        "rows whose count is wrong, committed on its own. Every shard is recounted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('models', nargs='*', help=f"Any of {', '.join(MODELS)}, all of them by default")
+        parser.add_argument('--batch-size', type=int, default=10000, help="Ids per UPDATE")
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be at least 1")
+        unknown = set(options['models']) - set(MODELS)
+        if unknown:
+            raise CommandError(f"Unknown models: {', '.join(sorted(unknown))}")
+        for name in dict.fromkeys(options['models'] or MODELS):
+            model = MODELS[name]
+            for relation, field in model.link_counts.items():
+                fixed = sum(self.recount(model, relation, field, options['batch_size'], alias)
+                            for alias in get_shards())
+                self.stdout.write(f"{name}: {fixed} {field} fixed")
+
+    def recount(self, model, relation, field, batch_size, using):
+        rows = model.objects.using(using)
+        bounds = rows.aggregate(low=Min('id'), high=Max('id'))
+        if bounds['low'] is None:
+            return 0
+        count = count_links(model, relation)
+        fixed = 0
+        for start in range(bounds['low'], bounds['high'] + 1, batch_size):
+            with transaction.atomic(using=using):
+                fixed += (
+                    rows.filter(id__gte=start, id__lt=start + batch_size)
+                    .exclude(**{field: count})
+                    .update(**{field: count})
+                )
+        return fixed
@@ -0,0 +1,251 @@
+import asyncio
+import bisect
+import contextvars
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+# Metrics of the request being sampled in this context, None otherwise
+current = contextvars.ContextVar('navedex_request_metrics', default=None)
+
+
+class Histogram:
+    """Prometheus style histogram: cumulative bucket counts, sum and count"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self):
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield format_value(bound), cumulative
+        yield '+Inf', self.count
+
+
+class MetricsRegistry:
+    """In-process histograms and counters, labelled by (view, method)"""
+
+    HISTOGRAMS = {
+        'navedex_request_duration_seconds': ("Request latency", LATENCY_BUCKETS),
+        'navedex_db_queries': ("Database queries per request", QUERY_BUCKETS),
+        'navedex_db_duration_seconds': ("Time spent in database queries per request", LATENCY_BUCKETS),
+        'navedex_serializer_duration_seconds': ("Time spent serializing per request", LATENCY_BUCKETS),
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {name: {} for name in self.HISTOGRAMS}
+            self._requests = {}
+
+    def record(self, view, method, status, observations):
+        with self._lock:
+            key = (view, method, str(status))
+            self._requests[key] = self._requests.get(key, 0) + 1
+            for name, value in observations.items():
+                series = self._histograms[name]
+                histogram = series.get((view, method))
+                if histogram is None:
+                    histogram = series[(view, method)] = Histogram(self.HISTOGRAMS[name][1])
+                histogram.observe(value)
+
+    def render(self, sample_rate):
+        """Prometheus text exposition format 0.0.4"""
+        lines = [
+            '# HELP navedex_metrics_sample_rate Fraction of requests measured',
+            '# TYPE navedex_metrics_sample_rate gauge',
+            f'navedex_metrics_sample_rate {format_value(sample_rate)}',
+            '# HELP navedex_requests_sampled_total Measured requests',
+            '# TYPE navedex_requests_sampled_total counter',
+        ]
+        with self._lock:
+            for (view, method, status), count in sorted(self._requests.items()):
+                labels = format_labels(view=view, method=method, status=status)
+                lines.append(f'navedex_requests_sampled_total{{{labels}}} {count}')
+            for name, (help_text, buckets) in self.HISTOGRAMS.items():
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} histogram')
+                for (view, method), histogram in sorted(self._histograms[name].items()):
+                    labels = format_labels(view=view, method=method)
+                    for bound, count in histogram.samples():
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                    lines.append(f'{name}_sum{{{labels}}} {format_value(histogram.sum)}')
+                    lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+def format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def format_labels(**labels):
+    def escape(value):
+        return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return ','.join(f'{name}="{escape(value)}"' for name, value in labels.items())
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.start = time.perf_counter()
+
+    def observations(self):
+        return {
+            'navedex_request_duration_seconds': time.perf_counter() - self.start,
+            'navedex_db_queries': self.queries,
+            'navedex_db_duration_seconds': self.db_time,
+            'navedex_serializer_duration_seconds': self.serializer_time,
+        }
+
+
+def record_query(execute, sql, params, many, context):
+    """``connection.execute_wrapper`` hook timing the queries of sampled requests.
+
+    It is installed on every connection when it is opened, because async
+    views run their queries on another thread's connection; the request is
+    found through :data:`current`, which ``sync_to_async`` carries along.
+    """
+    metrics = current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_time += time.perf_counter() - start
+        metrics.queries += 1
+
+
+def install_query_hook(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def get_sample_rate():
+    return getattr(settings, 'METRICS_SAMPLE_RATE', 0.1)
+
+
+def is_sampled():
+    sample_rate = get_sample_rate()
+    return sample_rate > 0 and random.random() < sample_rate
+
+
+def record(request, response, metrics):
+    match = request.resolver_match
+    view = match.view_name if match else 'unmatched'
+    registry.record(view, request.method, response.status_code, metrics.observations())
+
+
+class MetricsMiddleware:
+    """Measure a sample of the requests into :data:`registry`.
+
+    For ``METRICS_SAMPLE_RATE`` of the requests it records, per URL name and
+    method, the latency, the number of queries and the time spent in them,
+    and the serializer time reported by :class:`TimedSerializerMixin`.
+    Requests left out only pay for one ``random()`` call. Works under WSGI
+    and ASGI without forcing async views back to sync.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if hasattr(self, '_is_coroutine'):
+            return self.__acall__(request)
+        if not is_sampled():
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = current.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            current.reset(token)
+        record(request, response, metrics)
+        return response
+
+    async def __acall__(self, request):
+        if not is_sampled():
+            return await self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = current.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current.reset(token)
+        record(request, response, metrics)
+        return response
+
+
+@contextmanager
+def timed_serialization():
+    """Add the time spent in the block to the serializer time of the sampled request"""
+    metrics = current.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.serializer_time += time.perf_counter() - start
+
+
+class TimedSerializerMixin:
+    """Report the time spent in ``.data`` of the outermost serializer to the sampled request"""
+
+    def to_representation(self, instance):
+        if current.get() is None or not self.is_outermost():
+            return super().to_representation(instance)
+        with timed_serialization():
+            return super().to_representation(instance)
+
+    def is_outermost(self):
+        """Top level serializer, or the child of a top level ``many=True`` one"""
+        parent = getattr(self, 'parent', None)
+        return parent is None or (parent.parent is None and getattr(parent, 'many', False))
+
+
+def metrics_view(request):
+    """Expose :data:`registry` behind ``Authorization: Bearer <METRICS_TOKEN>``.
+
+    Without a token only staff users logged in to the admin can read it.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token:
+        allowed = constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}')
+    else:
+        allowed = request.user.is_staff
+    if not allowed:
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(get_sample_rate()), content_type='text/plain; version=0.0.4')
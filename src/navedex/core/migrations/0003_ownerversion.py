@@ -0,0 +1,21 @@
+# Generated by Django 3.1.14 on 2026-10-18 11:24
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_auto_20200808_2153'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OwnerVersion',
+            fields=[
+                ('owner', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='data_version', serialize=False, to='core.user')),
+                ('version', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -1,11 +1,13 @@
 import json
+from django.conf import settings
 from django.db import models
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
     PermissionsMixin
 )
-from rest_framework_simplejwt.tokens import RefreshToken
+
+from navedex.core.tokens import issue_tokens
 
 
 class UserManager(BaseUserManager):
@@ -45,8 +47,43 @@ class User(AbstractBaseUser, PermissionsMixin):
         return self.email
 
     def token(self):
-        refresh = RefreshToken.for_user(self)
-        return json.dumps({
-            'refresh': str(refresh),
-            'access': str(refresh.access_token)
-        })
+        return json.dumps(issue_tokens(self)._asdict())
+
+
+class OwnerVersion(models.Model):
+    """Version of everything a user owns, bumped on every write to it.
+
+    Covers rows and many-to-many links alike, so it can answer conditional
+    requests with a single primary key lookup.
+    """
+    owner = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='data_version'
+    )
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.owner_id}@{self.version}'
+
+
+class ImportCheckpoint(models.Model):
+    """Rows of a file ``import_navedex`` already committed for an owner.
+
+    Saved in the transaction of each chunk, on the database the chunk is
+    written to, so it never counts rows that were rolled back nor misses
+    rows that were committed.
+    """
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    target = models.CharField(max_length=32)
+    path = models.CharField(max_length=1024)
+    rows = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['owner', 'target', 'path'], name='import_checkpoint_key'),
+        ]
+
+    def __str__(self):
+        return f'{self.target}:{self.path}@{self.rows}'
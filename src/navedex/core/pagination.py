@@ -0,0 +1,47 @@
+from django.conf import settings
+
+from rest_framework import pagination
+
+
+class OwnerCursorPagination(pagination.CursorPagination):
+    """Keyset pagination for owner scoped list endpoints.
+
+    Every list queryset is already filtered by ``owner``, so ordering by
+    ``id`` walks the ``(owner_id, id)`` key and each page is a
+    ``WHERE owner_id = %s AND id > %s LIMIT n`` lookup, whatever its depth.
+
+    Pagination is opt-in: a request is paginated when it sends ``cursor``
+    or ``page_size``, or when ``PAGINATE_BY_DEFAULT`` is enabled. Old
+    clients can always ask for the plain list with ``?paginate=false``.
+    """
+    ordering = 'id'
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    paginate_query_param = 'paginate'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_paginated(request):
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+    def is_paginated(self, request):
+        params = request.query_params
+        flag = params.get(self.paginate_query_param, '').lower()
+        if flag in ('0', 'false', 'no'):
+            return False
+        if flag in ('1', 'true', 'yes'):
+            return True
+        if self.cursor_query_param in params or self.page_size_query_param in params:
+            return True
+        return getattr(settings, 'PAGINATE_BY_DEFAULT', False)
+
+
+class SearchPagination(pagination.PageNumberPagination):
+    """Numbered pages for ``?search=`` results.
+
+    Results are ordered by rank, which isn't unique nor stable across
+    writes, so the keyset of :class:`OwnerCursorPagination` doesn't apply.
+    Searches are always paginated.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
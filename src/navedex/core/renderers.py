@@ -0,0 +1,34 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` encoding with orjson when it is installed.
+
+    The output is the same bytes DRF writes with the default settings:
+    compact separators, UTF-8 text and ``\\u2028``/``\\u2029`` escaped.
+    Dates, times and any type orjson doesn't know go through DRF's encoder,
+    and indented, non compact or ascii output falls back to the stdlib.
+    Only floats in exponent notation differ (``1e-5`` instead of ``1e-05``)
+    and NaN/Infinity become ``null``.
+    """
+    option = orjson.OPT_PASSTHROUGH_DATETIME if orjson is not None else 0
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=self.option)
+        except TypeError:
+            # Integers over 64 bits and other values orjson refuses
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
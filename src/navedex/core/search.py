@@ -0,0 +1,95 @@
+import re
+
+from django.db import connections
+from django.db.models import Case, ExpressionWrapper, FloatField, Q, Value, When
+from django.db.models.expressions import RawSQL
+
+from navedex.core.pagination import SearchPagination
+
+# Words of a search term, each one matched as a prefix
+TOKEN_RE = re.compile(r'\w+')
+
+
+def search_table(model):
+    return f'{model._meta.db_table}_search'
+
+
+def prefix_rank(fields, tokens):
+    """Score rows by the fields starting with the first word, earlier fields weighing more.
+
+    Cheap enough to order every match on any vendor, unlike FTS5 ``bm25()``
+    which can only be read per joined row and makes SQLite searches quadratic.
+    """
+    weights = range(len(fields), 0, -1)
+    return sum(
+        Case(When(**{f'{field}__istartswith': tokens[0]}, then=Value(float(weight))), default=Value(0.0))
+        for field, weight in zip(fields, weights)
+    )
+
+
+def search(queryset, fields, term):
+    """Filter queryset to the rows matching every word of term as a prefix.
+
+    Rows get a ``search_rank`` annotation, higher is better, and come
+    ordered by it: rows whose earlier fields start with the first word come
+    first, PostgreSQL then orders by ``ts_rank``. Returns an empty queryset
+    when term has no words.
+    """
+    tokens = TOKEN_RE.findall(term.lower())
+    if not tokens:
+        return queryset.none()
+
+    rank = prefix_rank(fields, tokens)
+    vendor = connections[queryset.db].vendor
+    if vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+
+        vector = SearchVector(*fields, config='simple')
+        query = SearchQuery(' & '.join(f'{token}:*' for token in tokens), config='simple', search_type='raw')
+        queryset = queryset.annotate(search_vector=vector).filter(search_vector=query)
+        rank = rank + SearchRank(vector, query)
+    elif vendor == 'sqlite':
+        fts = search_table(queryset.model)
+        match = ' AND '.join(f'"{token}"*' for token in tokens)
+        # An IN subquery runs the MATCH once; a join lets the planner run it per row
+        queryset = queryset.filter(id__in=RawSQL(f'SELECT rowid FROM {fts} WHERE {fts} MATCH %s', [match]))
+    else:
+        for token in tokens:
+            queryset = queryset.filter(Q(*[(f'{field}__icontains', token) for field in fields], _connector=Q.OR))
+
+    queryset = queryset.annotate(search_rank=ExpressionWrapper(rank, output_field=FloatField()))
+    return queryset.order_by('-search_rank', 'id')
+
+
+class SearchMixin:
+    """``?search=`` on the list and export routes over ``search_fields``.
+
+    Matches every word as a prefix through the index of the app's
+    ``search_index`` migration, ranks the rows and numbers the pages
+    with :class:`SearchPagination`.
+    """
+    search_fields = ()
+    search_param = 'search'
+    search_actions = ('list', 'export')
+    search_pagination_class = SearchPagination
+
+    def get_search_term(self):
+        if self.action not in self.search_actions:
+            return None
+        return self.request.query_params.get(self.search_param, '').strip() or None
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        term = self.get_search_term()
+        if term is None:
+            return queryset
+        return search(queryset, self.search_fields, term)
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            if self.get_search_term() is not None:
+                self._paginator = self.search_pagination_class()
+            else:
+                self._paginator = self.pagination_class() if self.pagination_class else None
+        return self._paginator
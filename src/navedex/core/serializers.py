@@ -1,9 +1,10 @@
-import ast
-
 from django.contrib.auth import get_user_model, authenticate
 from django.utils.translation import ugettext_lazy as _
 
 from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+from navedex.core.tokens import GRANTS, GRANT_PAIR, issue_tokens
 
 
 class RegisterSerializer(serializers.ModelSerializer):
@@ -42,6 +43,14 @@ class LoginSerializer(serializers.ModelSerializer):
         fields = ('email', 'password', 'access_token', 'refresh_token')
 
     def validate(self, attrs):
+        self.validate_credentials(attrs)
+        user = authenticate(
+            email=attrs['email'],
+            password=attrs['password']
+        )
+        return self.login(user)
+
+    def validate_credentials(self, attrs):
         email = attrs.get('email', None)
         password = attrs.get('password', None)
 
@@ -53,18 +62,98 @@ class LoginSerializer(serializers.ModelSerializer):
             msg = _("A password is required to log in")
             raise serializers.ValidationError(msg, code="authentication")
 
-        user = authenticate(
-            email=email,
-            password=password
-        )
+        grant = self.context.get('grant') or GRANT_PAIR
+        if grant not in GRANTS:
+            msg = _("Grant must be one of: %s") % ", ".join(GRANTS)
+            raise serializers.ValidationError(msg, code="authentication")
+
+        return attrs
+
+    def login(self, user):
+        """Return the tokens of an authenticated user"""
         if not user:
             msg = _("Unable to authenticate with provided credentials")
-            raise serializers.ValidationError(msg, code='authentication')
+            raise serializers.ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: [msg]}, code='authentication'
+            )
+
+        token = issue_tokens(user, self.context.get('grant') or GRANT_PAIR)
+        data = {"email": user.email, "access_token": token.access}
+        if token.refresh is not None:
+            data["refresh_token"] = token.refresh
+
+        return data
+
+
+class CredentialsSerializer(LoginSerializer):
+    """Validate the login payload leaving authentication to the caller.
+
+    Used by the async login, which checks the password off the event loop.
+    """
+
+    def validate(self, attrs):
+        return self.validate_credentials(attrs)
+
+
+def parse_field_list(params, name):
+    return [field.strip() for raw in params.getlist(name) for field in raw.split(',') if field.strip()]
+
+
+class SparseFieldsetMixin:
+    """Prune the emitted fields with ``?fields=`` and ``?omit=``.
+
+    Both take comma separated names and reach nested serializers with a
+    dot, e.g. ``?fields=id,projects.name``. A nested serializer keeps every
+    field unless dotted names address it. Views call
+    :meth:`get_sparse_field_names` to load only the columns and relations
+    that will be emitted. Unknown names are rejected with a 400 listing the
+    valid ones.
+    """
+    fields_param = 'fields'
+    omit_param = 'omit'
 
-        token = ast.literal_eval(user.token())
+    @classmethod
+    def get_sparse_field_names(cls, request, prefix=''):
+        """Names of ``Meta.fields`` emitted for request at the ``prefix`` nesting"""
+        names = list(cls.Meta.fields)
+        if request is None:
+            return names
 
-        return {
-            "email": user.email,
-            "access_token": token["access"],
-            "refresh_token": token["refresh"]
+        params = request.query_params
+        wanted = {
+            name[len(prefix):].split('.')[0]
+            for name in parse_field_list(params, cls.fields_param) if name.startswith(prefix)
         }
+        omitted = {name[len(prefix):] for name in parse_field_list(params, cls.omit_param) if name.startswith(prefix)}
+        cls.check_field_names(cls.fields_param, wanted, names, prefix)
+        cls.check_field_names(cls.omit_param, {name.split('.')[0] for name in omitted}, names, prefix)
+        if wanted:
+            names = [name for name in names if name in wanted]
+        return [name for name in names if name not in omitted]
+
+    @staticmethod
+    def check_field_names(param, requested, names, prefix):
+        """Reject requested names the serializer doesn't have with a 400"""
+        unknown = sorted(set(requested) - set(names))
+        if unknown:
+            msg = _('Unknown fields: %(unknown)s. Valid fields are: %(valid)s.') % {
+                'unknown': ', '.join(prefix + name for name in unknown),
+                'valid': ', '.join(prefix + name for name in names),
+            }
+            raise serializers.ValidationError({param: [msg]})
+
+    def get_field_prefix(self):
+        path, node = [], self
+        while getattr(node, 'parent', None) is not None:
+            if node.field_name:
+                path.insert(0, node.field_name)
+            node = node.parent
+        return ''.join(f'{name}.' for name in path)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        keep = self.get_sparse_field_names(self.context.get('request'), self.get_field_prefix())
+        for name in list(fields):
+            if name not in keep:
+                del fields[name]
+        return fields
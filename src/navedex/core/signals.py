@@ -0,0 +1,59 @@
+from django.contrib.auth import get_user_model
+from django.core.signals import request_started, setting_changed
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_delete
+from django.dispatch import receiver
+
+from navedex.core.authentication import user_states
+from navedex.core.db.health import check_connections
+from navedex.core.db.sharding import (
+    delete_owner_rows, ensure_owners, get_shards, is_sharding_enabled, reset_sequences, shard_for
+)
+from navedex.core.metrics import install_query_hook
+from navedex.core.models import OwnerVersion
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def invalidate_active_user(sender, instance, **kwargs):
+    """Make stateless authentication see user changes right away"""
+    user_states.invalidate(instance.pk)
+
+
+@receiver(setting_changed)
+def reset_user_states(setting, **kwargs):
+    """Start over when the stateless authentication settings change, as tests do"""
+    if setting.startswith('JWT_AUTH_'):
+        user_states.invalidate()
+
+
+@receiver(post_save, sender=get_user_model())
+def create_owner_version(sender, instance, created, **kwargs):
+    if created:
+        OwnerVersion.objects.get_or_create(owner=instance)
+
+
+@receiver(post_save, sender=get_user_model())
+def create_owner_copy(sender, instance, created, using, **kwargs):
+    """Give the owner's shard the user row its navers and projects reference"""
+    if created and is_sharding_enabled():
+        ensure_owners([instance], shard_for(instance.pk))
+
+
+@receiver(pre_delete, sender=get_user_model())
+def delete_sharded_rows(sender, instance, using, **kwargs):
+    """The delete cascades on the user's database only, the owner's shard is emptied here"""
+    alias = shard_for(instance.pk)
+    if is_sharding_enabled() and using != alias:
+        delete_owner_rows(instance.pk, alias)
+        sender._base_manager.using(alias).filter(pk=instance.pk).delete()
+
+
+def reserve_id_range(sender, using, **kwargs):
+    if is_sharding_enabled() and using in get_shards():
+        reset_sequences(using)
+
+
+connection_created.connect(install_query_hook, dispatch_uid='navedex_metrics_query_hook')
+request_started.connect(check_connections, dispatch_uid='navedex_check_connections')
+post_migrate.connect(reserve_id_range, dispatch_uid='navedex_reserve_id_range')
@@ -0,0 +1,60 @@
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from navedex.core.filters import years_ago
+
+# (label, lower bound in years, upper bound in years)
+TENURE_BUCKETS = (
+    ('0-1', 0, 1),
+    ('1-2', 1, 2),
+    ('2-3', 2, 3),
+    ('3-5', 3, 5),
+    ('5-10', 5, 10),
+    ('10+', 10, None),
+)
+
+
+def count_by(queryset, field):
+    """``[{field: value, 'count': n}]`` for every value of field, in one ``GROUP BY``"""
+    rows = queryset.order_by(field).values(field).annotate(count=Count('id'))
+    return [{field: row[field], 'count': row['count']} for row in rows]
+
+
+def tenure_histogram(queryset, field):
+    """Count rows per :data:`TENURE_BUCKETS` of the date field with one query.
+
+    Every bucket is a ``COUNT(*) FILTER`` on a date range, so the whole
+    histogram reads the (owner, field) index once.
+    """
+    today = timezone.localdate()
+    counts = {}
+    for label, lower, upper in TENURE_BUCKETS:
+        condition = Q()
+        if lower:
+            condition &= Q(**{f'{field}__lte': years_ago(today, lower)})
+        if upper is not None:
+            condition &= Q(**{f'{field}__gt': years_ago(today, upper)})
+        counts[label] = Count('id', filter=condition)
+    totals = queryset.order_by().aggregate(**counts)
+    return [{'bucket': label, 'count': totals[label]} for label, lower, upper in TENURE_BUCKETS]
+
+
+class StatsMixin:
+    """``GET <list>/stats/`` with the aggregates of the filtered list.
+
+    The view defines ``get_stats(queryset)``, taking the list queryset with
+    the filters applied and returning the response data. Responses go
+    through the owner's response cache and conditional GET like list and
+    retrieve, so repeated dashboard polls cost one version lookup until the
+    owner writes again.
+    """
+
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        return self.conditional(lambda request: self.cached(self.stats_response, request), request)
+
+    def stats_response(self, request):
+        return Response(self.get_stats(self.filter_queryset(self.get_queryset())))
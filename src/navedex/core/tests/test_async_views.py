@@ -0,0 +1,101 @@
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+
+from navedex.core.async_views import LIST_ACTIONS, DETAIL_ACTIONS
+from navedex.core.tokens import issue_tokens
+from navedex.core.views import SignInView
+from navedex.navers.models import Naver
+from navedex.navers.views import NaverViewSet
+
+
+def call(view, request, **kwargs):
+    response = async_to_sync(view)(request, **kwargs)
+    # Responses served from the response cache are already rendered
+    if hasattr(response, 'render'):
+        response.render()
+    return response
+
+
+class AsyncViewsTests(TestCase):
+    """Test the async views served under ASGI"""
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.owner = get_user_model().objects.create_user(
+            'async@navedex.com.br',
+            'supersenha'
+        )
+        token = issue_tokens(self.owner).access
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+        self.naver = Naver.objects.create(
+            owner=self.owner, name='Naver 1', birthdate='1990-01-01',
+            admission_date='2020-01-01', job_role='Developer'
+        )
+
+    def test_async_list_and_retrieve(self):
+        """Test listing and retrieving navers natively"""
+        list_view = NaverViewSet.as_async_view(LIST_ACTIONS)
+        detail_view = NaverViewSet.as_async_view(DETAIL_ACTIONS)
+
+        res = call(list_view, self.factory.get('/api/navers/', **self.auth))
+        detail = call(detail_view, self.factory.get('/api/navers/', **self.auth), pk=self.naver.id)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['id'] for item in res.data], [self.naver.id])
+        self.assertEqual(detail.data['projects'], [])
+
+    @override_settings(RESPONSE_CACHE_ENABLED=True, CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'navedex_test_cache',
+    }})
+    def test_async_list_database_cache(self):
+        """Test that the cached list works with a backend that can't run on the event loop"""
+        call_command('createcachetable', verbosity=0)
+        view = NaverViewSet.as_async_view(LIST_ACTIONS)
+
+        first = call(view, self.factory.get('/api/navers/', **self.auth))
+        second = call(view, self.factory.get('/api/navers/', **self.auth))
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.content, first.content)
+
+    def test_async_create(self):
+        """Test creating a naver natively"""
+        view = NaverViewSet.as_async_view(LIST_ACTIONS)
+        payload = dict(name='Naver 2', birthdate='1990-01-01',
+                       admission_date='2020-01-01', job_role='UX')
+
+        res = call(view, self.factory.post('/api/navers/', payload, format='json', **self.auth))
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Naver.objects.filter(owner=self.owner, name='Naver 2').exists())
+
+    def test_async_fallback_and_auth(self):
+        """Test that sync only methods fall back and auth is still required"""
+        view = NaverViewSet.as_async_view(DETAIL_ACTIONS)
+
+        res = call(view, self.factory.delete('/api/navers/', **self.auth), pk=self.naver.id)
+        anonymous = call(view, self.factory.get('/api/navers/'), pk=self.naver.id)
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Naver.objects.exists())
+        self.assertEqual(anonymous.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_async_login(self):
+        """Test logging in with the password checked off the event loop"""
+        view = SignInView.as_async_view()
+        payload = {'email': 'async@navedex.com.br', 'password': 'supersenha'}
+
+        res = call(view, self.factory.post('/auth/login/', payload))
+        invalid = call(view, self.factory.post('/auth/login/', dict(payload, password='wrongpass')))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('refresh_token', res.data)
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('non_field_errors', invalid.data)
@@ -0,0 +1,107 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient, APIRequestFactory
+
+from navedex.core.authentication import JWTAuthentication, UserStateCache, user_states
+from navedex.navers.models import Naver
+
+
+TOKEN_URL = reverse('core:login')
+NAVERS_URL = reverse('navers:naver-list')
+
+
+@override_settings(JWT_AUTH_STATELESS=True, RESPONSE_CACHE_ENABLED=False)
+class StatelessJWTAuthenticationTests(TestCase):
+    """Test authenticating requests from the token claims"""
+
+    def setUp(self):
+        user_states.invalidate()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            'stateless@navedex.com.br',
+            'supersenha'
+        )
+        res = self.client.post(TOKEN_URL, {
+            'email': 'stateless@navedex.com.br',
+            'password': 'supersenha'
+        })
+        self.token = res.data['access_token']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+
+    def test_user_not_loaded_from_database(self):
+        """Test that no user query runs once is_active is cached"""
+        self.client.get(NAVERS_URL)
+
+        # owner version and navers list
+        with self.assertNumQueries(2):
+            res = self.client.get(NAVERS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_create_naver_owned_by_token_user(self):
+        """Test that the user built from the token can own new navers"""
+        payload = dict(name='Naver', birthdate='1990-01-01',
+                       admission_date='2020-01-01', job_role='Developer')
+
+        res = self.client.post(NAVERS_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Naver.objects.filter(owner=self.user).exists())
+
+    def test_deactivated_user_rejected(self):
+        """Test that deactivating a user revokes its tokens"""
+        self.client.get(NAVERS_URL)
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.get(NAVERS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_staff_flag_read_from_database(self):
+        """Test that is_staff follows the user, not the stale token claim"""
+        self.user.is_staff = True
+        self.user.save()
+        request = APIRequestFactory().get(NAVERS_URL, HTTP_AUTHORIZATION=f'Bearer {self.token}')
+
+        user, token = JWTAuthentication().authenticate(request)
+
+        self.assertFalse(token['is_staff'])
+        self.assertTrue(user.is_staff)
+
+    def test_password_change_revokes_tokens(self):
+        """Test that tokens issued before a password change are rejected"""
+        self.client.get(NAVERS_URL)
+        self.user.set_password('novasenha')
+        self.user.save()
+
+        res = self.client.get(NAVERS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(JWT_AUTH_CACHE_SIZE=2)
+    def test_cache_keeps_most_recent_users(self):
+        """Test that the cache evicts the least recently used users"""
+        cache = UserStateCache()
+        for user_id in (1, 2, 1, 3):
+            cache.get(user_id, 30)
+
+        self.assertEqual(list(cache._entries), [1, 3])
+
+    def test_settings_change_resets_cache(self):
+        """Test that overriding the stateless settings starts from an empty cache"""
+        user_states.get(self.user.pk, 30)
+
+        with override_settings(JWT_AUTH_CACHE_TTL=60):
+            self.assertEqual(len(user_states._entries), 0)
+
+    @override_settings(JWT_AUTH_STATELESS=False)
+    def test_database_mode_loads_user(self):
+        """Test that the default mode keeps loading the user"""
+        with self.assertNumQueries(3):
+            res = self.client.get(NAVERS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
@@ -0,0 +1,63 @@
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import Count
+from django.test import TestCase
+
+from navedex.benchmarks import factory
+from navedex.benchmarks.scenarios import SCENARIOS
+from navedex.core.authentication import user_states
+from navedex.navers.models import Naver
+from navedex.projects.models import Project
+
+
+def snapshot(dataset):
+    """Names, roles and linked project names of every owner's navers"""
+    return [
+        list(Naver.objects.filter(owner=owner.user).order_by('id', 'projects__id')
+             .values_list('name', 'job_role', 'admission_date', 'projects__name'))
+        for owner in dataset
+    ]
+
+
+class BenchmarkTests(TestCase):
+    """Test the synthetic dataset and the API benchmark command"""
+
+    def setUp(self):
+        # Rolled back users free their ids for the next ones, drop what was cached about them
+        user_states.invalidate()
+
+    def test_generate_is_reproducible(self):
+        """Test that the same seed gives the same rows and links"""
+        first = snapshot(factory.generate(2, 10, 5, 2, seed=7))
+        get_user_model().objects.all().delete()
+        second = snapshot(factory.generate(2, 10, 5, 2, seed=7))
+
+        self.assertEqual(first, second)
+        self.assertEqual(Naver.objects.count(), 20)
+        self.assertTrue(Naver.projects.through.objects.exists())
+
+    def test_generate_counts_links(self):
+        """Test that the bulk inserted links are reflected in the link counts"""
+        factory.generate(1, 10, 5, 2, seed=7)
+
+        for model, relation, field in ((Naver, 'projects', 'project_count'), (Project, 'navers', 'naver_count')):
+            rows = model.objects.annotate(links=Count(relation)).values_list(field, 'links')
+            self.assertTrue(all(count == links for count, links in rows))
+        self.assertTrue(Project.objects.filter(naver_count__gt=0).exists())
+
+    def test_bench_api_reports_every_scenario(self):
+        """Test the JSON report and that the dataset is rolled back"""
+        out = io.StringIO()
+
+        call_command('bench_api', users=2, navers=5, projects=3, iterations=2, warmup=1, stdout=out)
+
+        report = json.loads(out.getvalue())
+        self.assertEqual(set(report['scenarios']), set(SCENARIOS))
+        for result in report['scenarios'].values():
+            self.assertEqual(result['iterations'], 2)
+            self.assertGreater(result['ops_per_sec'], 0)
+            self.assertLessEqual(result['p50_ms'], result['p99_ms'])
+        self.assertFalse(Naver.objects.exists())
@@ -0,0 +1,101 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from navedex.core.cache import generation_key
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from navedex.navers.models import Naver
+from navedex.projects.models import Project
+
+
+NAVERS_URL = reverse('navers:naver-list')
+NAVERS_BULK_URL = reverse('navers:naver-bulk')
+NAVERS_STATS_URL = reverse('navers:naver-stats')
+
+
+def sample_naver(owner, name='Naver'):
+    return Naver.objects.create(owner=owner, name=name, birthdate='1990-01-01',
+                                admission_date='2020-01-01', job_role='Developer')
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=True)
+class OwnerResponseCacheTests(TestCase):
+    """Test the per owner response cache and its invalidation"""
+
+    def setUp(self):
+        cache.clear()
+        self.owner = get_user_model().objects.create_user('cache@navedex.com.br', 'supersenha')
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+        self.naver = sample_naver(self.owner)
+
+    def test_repeated_list_served_from_cache(self):
+        """Test that a repeated poll only looks up the owner version"""
+        first = self.client.get(NAVERS_URL, {'job_role': 'Developer'})
+
+        with self.assertNumQueries(1):
+            second = self.client.get(NAVERS_URL, {'job_role': 'Developer'})
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(first.content, second.content)
+
+    def test_writes_invalidate_owner_responses(self):
+        """Test that saves and link changes expire the cached responses"""
+        self.client.get(NAVERS_URL)
+        detail_url = reverse('navers:naver-detail', args=[self.naver.id])
+        self.client.get(detail_url)
+
+        sample_naver(self.owner, name='Naver 2')
+        project = Project.objects.create(owner=self.owner, name='Website')
+        self.naver.projects.add(project)
+
+        self.assertEqual(len(self.client.get(NAVERS_URL).json()), 2)
+        self.assertEqual(len(self.client.get(detail_url).json()['projects']), 1)
+
+    def test_stats_cached_until_write(self):
+        """Test that stats are served from cache and recomputed after a write"""
+        self.client.get(NAVERS_STATS_URL)
+
+        with self.assertNumQueries(1):
+            cached = self.client.get(NAVERS_STATS_URL)
+        sample_naver(self.owner, name='Naver 2')
+
+        self.assertEqual(cached.json()['total'], 1)
+        self.assertEqual(self.client.get(NAVERS_STATS_URL).json()['total'], 2)
+
+    def test_other_owner_writes_keep_cache(self):
+        """Test that responses are cached per owner"""
+        self.client.get(NAVERS_URL)
+        other = get_user_model().objects.create_user('other@navedex.com.br', 'supersenha')
+        sample_naver(other)
+
+        with self.assertNumQueries(1):
+            res = self.client.get(NAVERS_URL)
+
+        self.assertEqual(len(res.json()), 1)
+
+    def test_bulk_writes_invalidate(self):
+        """Test that bulk endpoints, which send no signals, expire the cache"""
+        self.client.get(NAVERS_URL)
+
+        self.client.delete(NAVERS_BULK_URL, [self.naver.id], format='json')
+
+        self.assertEqual(self.client.get(NAVERS_URL).json(), [])
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class DisabledResponseCacheTests(TestCase):
+    """Test that writes leave the cache alone when the response cache is off"""
+
+    def test_writes_keep_generation(self):
+        """Test that saving a naver doesn't bump the owner generation"""
+        cache.clear()
+        owner = get_user_model().objects.create_user('nocache@navedex.com.br', 'supersenha')
+
+        sample_naver(owner)
+
+        self.assertIsNone(cache.get(generation_key(owner.pk)))
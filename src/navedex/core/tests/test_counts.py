@@ -0,0 +1,120 @@
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from navedex.navers.models import Naver
+from navedex.projects.models import Project
+
+NAVERS_URL = reverse('navers:naver-list')
+NAVERS_BULK_URL = reverse('navers:naver-bulk')
+PROJECTS_URL = reverse('projects:project-list')
+
+
+def counts():
+    """project_count of every naver and naver_count of every project by name"""
+    return (
+        dict(Naver.objects.values_list('name', 'project_count')),
+        dict(Project.objects.values_list('name', 'naver_count')),
+    )
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class LinkCountTests(TestCase):
+    """Test the denormalized project_count and naver_count columns"""
+    # recount_navedex goes over every shard
+    databases = set(settings.DATABASE_SHARDS)
+
+    def setUp(self):
+        self.owner = get_user_model().objects.create_user('counts@navedex.com.br', 'supersenha')
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+        self.navers = [
+            Naver.objects.create(owner=self.owner, name=f'Naver {i}', birthdate='1990-01-01',
+                                 admission_date='2020-01-01', job_role='Developer')
+            for i in range(3)
+        ]
+        self.projects = [Project.objects.create(owner=self.owner, name=f'Project {i}') for i in range(3)]
+
+    def test_m2m_changes_update_both_sides(self):
+        """Test add, remove and clear from either side of the relation"""
+        first, second, third = self.navers
+        first.projects.add(*self.projects)
+        self.projects[0].navers.add(second, third)
+        first.projects.remove(self.projects[1], self.projects[0])
+        self.projects[2].navers.clear()
+
+        self.assertEqual(counts(), (
+            {'Naver 0': 0, 'Naver 1': 1, 'Naver 2': 1},
+            {'Project 0': 2, 'Project 1': 0, 'Project 2': 0},
+        ))
+
+    def test_removing_unlinked_ids_keeps_counts(self):
+        """Test that removing rows that weren't linked doesn't decrement"""
+        self.navers[0].projects.add(self.projects[0])
+        self.navers[0].projects.remove(self.projects[1])
+
+        self.assertEqual(counts()[0]['Naver 0'], 1)
+        self.assertEqual(counts()[1]['Project 1'], 0)
+
+    def test_deletes_update_the_other_side(self):
+        """Test that deleting a naver or a project recounts what it was linked to"""
+        for naver in self.navers:
+            naver.projects.add(*self.projects)
+
+        self.navers[0].delete()
+        Project.objects.filter(id=self.projects[0].id).delete()
+
+        self.assertEqual(counts(), (
+            {'Naver 1': 2, 'Naver 2': 2},
+            {'Project 1': 2, 'Project 2': 2},
+        ))
+
+    def test_bulk_endpoints_maintain_counts(self):
+        """Test bulk create, relink and delete keep both sides exact"""
+        project_ids = [project.id for project in self.projects]
+        payload = [dict(name='Bulk', birthdate='1990-01-01', admission_date='2020-01-01',
+                        job_role='Developer', projects=project_ids[:2])]
+        created = self.client.post(NAVERS_BULK_URL, payload, format='json').data['results'][0]['data']
+        self.assertEqual(created['project_count'], 2)
+
+        res = self.client.patch(NAVERS_BULK_URL, [{'id': created['id'], 'projects': project_ids[2:]}],
+                                format='json')
+        self.assertEqual(res.data['results'][0]['data']['project_count'], 1)
+        self.assertEqual(counts()[1], {'Project 0': 0, 'Project 1': 0, 'Project 2': 1})
+
+        self.client.delete(NAVERS_BULK_URL, [created['id']], format='json')
+        self.assertEqual(counts()[1]['Project 2'], 0)
+
+    def test_list_ordering_by_count(self):
+        """Test ?ordering= on the count columns, ties broken by id"""
+        self.navers[1].projects.add(*self.projects)
+        self.navers[2].projects.add(self.projects[0])
+
+        res = self.client.get(NAVERS_URL, {'ordering': '-project_count'})
+        self.assertEqual([naver['name'] for naver in res.data], ['Naver 1', 'Naver 2', 'Naver 0'])
+        self.assertEqual([naver['project_count'] for naver in res.data], [3, 1, 0])
+
+        res = self.client.get(PROJECTS_URL, {'ordering': 'naver_count', 'page_size': 2})
+        self.assertEqual([project['name'] for project in res.data['results']], ['Project 1', 'Project 2'])
+
+    def test_recount_command_fixes_drifted_counts(self):
+        """Test that recount_navedex rebuilds the counts and only touches wrong rows"""
+        self.navers[0].projects.add(*self.projects[:2])
+        Naver.objects.update(project_count=7)
+        Project.objects.filter(id=self.projects[2].id).update(naver_count=4)
+        out = StringIO()
+
+        call_command('recount_navedex', batch_size=2, stdout=out)
+
+        self.assertEqual(counts(), (
+            {'Naver 0': 2, 'Naver 1': 0, 'Naver 2': 0},
+            {'Project 0': 1, 'Project 1': 1, 'Project 2': 0},
+        ))
+        self.assertIn('navers: 3 project_count fixed', out.getvalue())
+        self.assertIn('projects: 1 naver_count fixed', out.getvalue())
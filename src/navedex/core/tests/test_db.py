@@ -0,0 +1,63 @@
+import sqlite3
+
+from django.test import SimpleTestCase
+
+from navedex.core.db.pool import ConnectionPool
+
+
+def ping(connection):
+    try:
+        connection.execute('SELECT 1')
+        return True
+    except sqlite3.Error:
+        return False
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    """Test the in-process connection pool"""
+
+    def test_reuses_returned_connection(self):
+        """Test that a returned connection comes back with its state"""
+        pool = ConnectionPool(size=2, ping=ping)
+        connection = sqlite3.connect(':memory:')
+
+        self.assertIsNone(pool.get())
+        pool.put(connection, 'state')
+
+        self.assertEqual(pool.get(), (connection, 'state'))
+        self.assertIsNone(pool.get())
+
+    def test_discards_broken_and_stale_connections(self):
+        """Test that connections failing the ping or idle too long are closed"""
+        pool = ConnectionPool(size=2, ping=ping)
+        broken = sqlite3.connect(':memory:')
+        pool.put(broken)
+        broken.close()
+
+        self.assertIsNone(pool.get())
+
+        pool.max_idle = 0
+        pool.put(sqlite3.connect(':memory:'))
+        self.assertIsNone(pool.get())
+
+    def test_closes_connections_over_size(self):
+        """Test that only size connections are kept idle"""
+        pool = ConnectionPool(size=1, ping=ping)
+        first, second = sqlite3.connect(':memory:'), sqlite3.connect(':memory:')
+
+        pool.put(first)
+        pool.put(second)
+
+        self.assertEqual(len(pool), 1)
+        self.assertFalse(ping(second))
+        self.assertEqual(pool.get(), (first, None))
+
+    def test_failed_reset_drops_connection(self):
+        """Test that a connection the reset can't clean is not pooled"""
+        def reset(connection):
+            raise sqlite3.OperationalError('broken')
+
+        pool = ConnectionPool(size=1, reset=reset)
+        pool.put(sqlite3.connect(':memory:'))
+
+        self.assertEqual(len(pool), 0)
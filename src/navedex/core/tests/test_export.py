@@ -0,0 +1,98 @@
+import io
+import json
+import os
+import tracemalloc
+
+from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIRequest
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, force_authenticate
+
+from navedex.navers.models import Naver
+from navedex.navers.views import NaverViewSet
+from navedex.projects.models import Project
+
+EXPORT_URL = reverse('navers:naver-export')
+
+# Set EXPORT_TEST_ROWS=1000000 to check a full size export
+EXPORT_TEST_ROWS = int(os.environ.get('EXPORT_TEST_ROWS', 4000))
+CHUNK_SIZE = 500
+
+
+@override_settings(EXPORT_CHUNK_SIZE=CHUNK_SIZE, CONDITIONAL_GET_ENABLED=False)
+class StreamingExportTests(TestCase):
+    """Test that exports stream in chunks with flat memory"""
+
+    def setUp(self):
+        self.owner = get_user_model().objects.create_user('export@navedex.com.br', 'supersenha')
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+        self.project = Project.objects.create(owner=self.owner, name='Project')
+        self.created = 0
+
+    def create_navers(self, total):
+        navers = [
+            Naver(owner=self.owner, name=f'Naver {i}', birthdate='1990-01-01',
+                  admission_date='2020-01-01', job_role='Developer')
+            for i in range(self.created, total)
+        ]
+        Naver.objects.bulk_create(navers, batch_size=CHUNK_SIZE)
+        self.created = total
+
+    def export(self):
+        """Consume an export, returning the rows and the peak traced memory"""
+        res = self.client.get(EXPORT_URL, {'format': 'ndjson'})
+        rows = 0
+        tracemalloc.start()
+        try:
+            for part in res.streaming_content:
+                rows += part.count(b'\n')
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return rows, peak
+
+    def test_export_queries_per_chunk(self):
+        """Test that each chunk costs one extra query for the related ids"""
+        self.create_navers(CHUNK_SIZE * 3)
+        res = self.client.get(EXPORT_URL)
+
+        with self.assertNumQueries(1 + 3):
+            b''.join(res.streaming_content)
+
+    def test_export_encoded_like_the_api(self):
+        """Test that rows use the renderer's compact separators and keep non ASCII text"""
+        Naver.objects.create(owner=self.owner, name='João', birthdate='1990-01-01',
+                             admission_date='2020-01-01', job_role='Developer')
+
+        res = self.client.get(EXPORT_URL, {'format': 'ndjson'})
+
+        line = b''.join(res.streaming_content).rstrip(b'\n')
+        self.assertEqual(line, JSONRenderer().render(json.loads(line)))
+        self.assertIn('João'.encode(), line)
+
+    def test_export_refused_under_asgi(self):
+        """Test that ASGI requests get a 501 instead of a body that can't be streamed"""
+        scope = {'type': 'http', 'method': 'GET', 'path': EXPORT_URL, 'query_string': b'', 'headers': []}
+        request = ASGIRequest(scope, io.BytesIO())
+        force_authenticate(request, self.owner)
+
+        res = NaverViewSet.as_view({'get': 'export'})(request)
+
+        self.assertEqual(res.status_code, status.HTTP_501_NOT_IMPLEMENTED)
+        self.assertEqual(res.data['detail'].code, 'export_unavailable')
+
+    def test_export_memory_is_flat(self):
+        """Test that peak memory doesn't grow with the number of rows"""
+        self.create_navers(EXPORT_TEST_ROWS // 4)
+        small_rows, small_peak = self.export()
+        self.create_navers(EXPORT_TEST_ROWS)
+        rows, peak = self.export()
+
+        self.assertEqual(small_rows, EXPORT_TEST_ROWS // 4)
+        self.assertEqual(rows, EXPORT_TEST_ROWS)
+        self.assertLess(peak, small_peak * 1.5)
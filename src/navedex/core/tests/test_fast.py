@@ -0,0 +1,78 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from navedex.core.renderers import FastJSONRenderer
+from navedex.navers.models import Naver
+from navedex.projects.models import Project
+
+NAVERS_URL = reverse('navers:naver-list')
+PROJECTS_URL = reverse('projects:project-list')
+
+
+@override_settings(CONDITIONAL_GET_ENABLED=False)
+class FastListTests(TestCase):
+    """Test that the fast list path writes the same bytes as the serializers"""
+
+    def setUp(self):
+        self.owner = get_user_model().objects.create_user('fast@navedex.com.br', 'supersenha')
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+        for i, name in enumerate(['Ana', 'João \u2028 "Quote"', 'Zoë']):
+            Naver.objects.create(owner=self.owner, name=name, birthdate='1990-01-0%d' % (i + 1),
+                                 admission_date='2020-02-29', job_role='Developer')
+        Project.objects.create(owner=self.owner, name='Projeto ñ')
+
+    def assertSameContent(self, url, params):
+        with override_settings(FAST_LIST_SERIALIZATION=False):
+            slow = self.client.get(url, params)
+        fast = self.client.get(url, params)
+
+        self.assertEqual(fast.status_code, 200)
+        self.assertEqual(fast.content, slow.content)
+
+    def test_fast_list_matches_serializer(self):
+        """Test plain, paginated, sparse and searched lists"""
+        variants = [
+            (NAVERS_URL, {}),
+            (NAVERS_URL, {'page_size': 2}),
+            (NAVERS_URL, {'fields': 'name,admission_date'}),
+            (NAVERS_URL, {'search': 'jo'}),
+            (PROJECTS_URL, {}),
+        ]
+        for url, params in variants:
+            with self.subTest(url=url, params=params):
+                self.assertSameContent(url, params)
+
+    def test_fast_list_skips_model_instances(self):
+        """Test that the list is read with .values()"""
+        res = self.client.get(NAVERS_URL)
+
+        self.assertEqual(len(res.json()), 3)
+        self.assertIsInstance(res.data[0], dict)
+        self.assertEqual(res.data[0]['birthdate'], '1990-01-01')
+
+
+class FastJSONRendererTests(TestCase):
+    """Test the orjson renderer against DRF's JSONRenderer"""
+
+    def test_same_bytes_as_json_renderer(self):
+        """Test unicode, line separators, nesting and lazy strings"""
+        data = {'results': [{'id': 1, 'name': 'Zoë \u2028\u2029', 'ok': True, 'none': None}],
+                'detail': gettext_lazy('Not found.'), 'ratio': 0.5}
+
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_indent_falls_back_to_stdlib(self):
+        """Test that indented output is still honoured"""
+        data = {'a': [1, 2]}
+        media_type = 'application/json; indent=2'
+
+        self.assertEqual(
+            FastJSONRenderer().render(data, media_type),
+            JSONRenderer().render(data, media_type)
+        )
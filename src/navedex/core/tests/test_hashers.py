@@ -0,0 +1,91 @@
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model, user_login_failed
+from django.contrib.auth.backends import BaseBackend
+from django.core.exceptions import PermissionDenied
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from navedex.core import hashers
+
+
+TOKEN_URL = reverse('core:login')
+SHA1 = 'django.contrib.auth.hashers.SHA1PasswordHasher'
+MD5 = 'django.contrib.auth.hashers.MD5PasswordHasher'
+MODEL_BACKEND = 'django.contrib.auth.backends.ModelBackend'
+
+
+class DenyBackend(BaseBackend):
+    def authenticate(self, request, **credentials):
+        raise PermissionDenied
+
+
+@override_settings(PASSWORD_HASHERS=[SHA1])
+class PasswordHashingTests(TestCase):
+    """Test hashing upgrades and the offloaded hashing helpers"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'hash@navedex.com.br',
+            'supersenha'
+        )
+
+    @override_settings(PASSWORD_HASHERS=[MD5, SHA1])
+    def test_login_upgrades_outdated_hash(self):
+        """Test that logging in rehashes with the preferred hasher"""
+        res = APIClient().post(TOKEN_URL, {
+            'email': 'hash@navedex.com.br',
+            'password': 'supersenha'
+        })
+
+        self.user.refresh_from_db()
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(self.user.password.startswith('md5$'))
+
+    @override_settings(PASSWORD_HASHERS=[MD5, SHA1], PASSWORD_HASH_OFFLOAD=True)
+    def test_aauthenticate_offloaded(self):
+        """Test authenticating in the hashing pool upgrades the hash too"""
+        user = async_to_sync(hashers.aauthenticate)(email='hash@navedex.com.br', password='supersenha')
+
+        self.assertEqual(user, self.user)
+        self.assertEqual(user.backend, MODEL_BACKEND)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('md5$'))
+
+    def test_aauthenticate_invalid_credentials(self):
+        """Test that wrong passwords and unknown emails are rejected"""
+        authenticate = async_to_sync(hashers.aauthenticate)
+
+        self.assertIsNone(authenticate(email='hash@navedex.com.br', password='wrongpass'))
+        self.assertIsNone(authenticate(email='unknown@navedex.com.br', password='supersenha'))
+
+    def test_aauthenticate_signals_failed_login(self):
+        """Test that rejected credentials send user_login_failed like authenticate()"""
+        received = []
+
+        def receiver(sender, credentials, **kwargs):
+            received.append(credentials)
+
+        user_login_failed.connect(receiver)
+        self.addCleanup(user_login_failed.disconnect, receiver)
+        async_to_sync(hashers.aauthenticate)(email='hash@navedex.com.br', password='wrongpass')
+
+        self.assertEqual(len(received), 1)
+        self.assertEqual(received[0]['email'], 'hash@navedex.com.br')
+        self.assertNotEqual(received[0]['password'], 'wrongpass')
+
+    @override_settings(AUTHENTICATION_BACKENDS=[f'{__name__}.DenyBackend', MODEL_BACKEND])
+    def test_aauthenticate_uses_authentication_backends(self):
+        """Test that the configured backends are consulted in order"""
+        user = async_to_sync(hashers.aauthenticate)(email='hash@navedex.com.br', password='supersenha')
+
+        self.assertIsNone(user)
+
+    def test_acreate_user(self):
+        """Test creating a user with the password hashed in the pool"""
+        user = async_to_sync(hashers.acreate_user)('New@NAVEDEX.COM.BR', 'supersenha')
+
+        self.assertEqual(user.email, 'New@navedex.com.br')
+        self.assertTrue(user.check_password('supersenha'))
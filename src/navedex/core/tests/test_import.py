@@ -0,0 +1,136 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from navedex.core.management.commands.import_navedex import Command
+from navedex.core.models import ImportCheckpoint
+from navedex.navers.models import Naver
+from navedex.projects.models import Project
+
+NAVERS_CSV = """name,birthdate,admission_date,job_role,projects
+Ana,1990-01-01,2020-01-01,Developer,Website;{project_id}
+Bruno,not a date,2020-01-01,Designer,
+Carla,1992-03-04,2021-05-06,Designer,Unknown
+Davi,1993-01-01,2021-01-01,Tester,
+"""
+
+
+class ImportNavedexCommandTests(TestCase):
+    """Test the import_navedex management command"""
+
+    def setUp(self):
+        self.owner = get_user_model().objects.create_user('import@navedex.com.br', 'supersenha')
+        self.other = get_user_model().objects.create_user('other@navedex.com.br', 'supersenha')
+        self.website = Project.objects.create(owner=self.owner, name='Website')
+        self.app = Project.objects.create(owner=self.owner, name='App')
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+
+    def write_file(self, name, content):
+        path = os.path.join(self.tmpdir, name)
+        with open(path, 'w') as file:
+            file.write(content)
+        return path
+
+    def run_import(self, *args, owner=None, **options):
+        out, err = StringIO(), StringIO()
+        owner = owner or self.owner
+        call_command('import_navedex', *args, owner=owner.email, stdout=out, stderr=err, **options)
+        return out.getvalue(), err.getvalue()
+
+    def save_checkpoint(self, target, path, rows):
+        ImportCheckpoint.objects.create(owner=self.owner, target=target, path=path, rows=rows)
+
+    def test_import_navers_csv(self):
+        """Test that valid rows are imported with their projects and invalid ones reported"""
+        path = self.write_file('navers.csv', NAVERS_CSV.format(project_id=self.app.id))
+
+        out, err = self.run_import('navers', path)
+
+        self.assertEqual(sorted(Naver.objects.values_list('name', flat=True)), ['Ana', 'Davi'])
+        ana = Naver.objects.get(name='Ana')
+        self.assertEqual(ana.owner, self.owner)
+        self.assertEqual(set(ana.projects.all()), {self.website, self.app})
+        self.assertIn('row 2: ', err)
+        self.assertIn('row 3: ', err)
+        self.assertIn('rows/s', out)
+        self.assertFalse(ImportCheckpoint.objects.exists())
+
+    def test_import_projects_ndjson_scoped_to_owner(self):
+        """Test that navers of another owner can't be linked"""
+        own = Naver.objects.create(owner=self.owner, name='Own', birthdate='1990-01-01',
+                                   admission_date='2020-01-01', job_role='Developer')
+        foreign = Naver.objects.create(owner=self.other, name='Foreign', birthdate='1990-01-01',
+                                       admission_date='2020-01-01', job_role='Developer')
+        rows = [{'name': 'Mobile', 'navers': [own.id]}, {'name': 'Stolen', 'navers': [foreign.id]}]
+        path = self.write_file('projects.ndjson', ''.join(json.dumps(row) + '\n' for row in rows))
+
+        self.run_import('projects', path, batch_size=1)
+
+        mobile = Project.objects.get(name='Mobile')
+        self.assertEqual(list(mobile.navers.all()), [own])
+        self.assertFalse(Project.objects.filter(name='Stolen').exists())
+
+    def test_import_ndjson_rejects_malformed_lines(self):
+        """Test that a line that isn't JSON is reported as a rejected row and the others imported"""
+        path = self.write_file('projects.ndjson', '{"name": "Mobile"}\n{"name": \n{"name": "Portal"}\n')
+
+        out, err = self.run_import('projects', path, batch_size=2)
+
+        self.assertIn('row 2: ', err)
+        self.assertIn('Invalid JSON', err)
+        self.assertIn('rejected 1', out)
+        self.assertEqual(Project.objects.filter(name__in=['Mobile', 'Portal']).count(), 2)
+
+    def test_import_resumes_after_checkpoint(self):
+        """Test that --resume skips the rows committed by a previous run"""
+        path = self.write_file('navers.csv', NAVERS_CSV.format(project_id=self.app.id))
+        self.save_checkpoint('navers', path, 2)
+
+        out, err = self.run_import('navers', path, resume=True, batch_size=1)
+
+        self.assertIn('Resuming after row 2', out)
+        self.assertEqual(list(Naver.objects.values_list('name', flat=True)), ['Davi'])
+        self.assertIn('row 3: ', err)
+
+    def test_checkpoint_commits_with_its_chunk(self):
+        """Test that a chunk that fails leaves the checkpoint at the previous chunk"""
+        path = self.write_file('navers.csv', NAVERS_CSV.format(project_id=self.app.id))
+        write = Command.write
+
+        def crash_on_davi(command, valid):
+            write(command, valid)
+            if any(data['name'] == 'Davi' for data, ids in valid):
+                raise RuntimeError('crash')
+
+        with mock.patch.object(Command, 'write', crash_on_davi), self.assertRaises(RuntimeError):
+            self.run_import('navers', path, batch_size=2)
+
+        self.assertEqual(ImportCheckpoint.objects.get().rows, 2)
+        self.assertEqual(list(Naver.objects.values_list('name', flat=True)), ['Ana'])
+        self.run_import('navers', path, resume=True, batch_size=2)
+        self.assertEqual(sorted(Naver.objects.values_list('name', flat=True)), ['Ana', 'Davi'])
+
+    def test_checkpoint_keyed_by_owner_and_target(self):
+        """Test that a checkpoint of the same file is not used for another owner or target"""
+        path = self.write_file('navers.csv', NAVERS_CSV.format(project_id=self.app.id))
+        self.save_checkpoint('projects', path, 2)
+        other_path = self.write_file('navers-other.csv', 'name,birthdate,admission_date,job_role,projects\n'
+                                                         'Eva,1990-01-01,2020-01-01,Developer,\n')
+        self.save_checkpoint('navers', other_path, 1)
+
+        out, err = self.run_import('navers', path, resume=True)
+        self.run_import('navers', other_path, owner=self.other, resume=True)
+
+        self.assertNotIn('Resuming', out)
+        self.assertEqual(sorted(Naver.objects.filter(owner=self.owner).values_list('name', flat=True)),
+                         ['Ana', 'Davi'])
+        self.assertTrue(Naver.objects.filter(owner=self.other, name='Eva').exists())
+        self.assertEqual(ImportCheckpoint.objects.count(), 2)
@@ -0,0 +1,96 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from navedex.core.metrics import Histogram, registry
+from navedex.navers.models import Naver
+
+METRICS_URL = reverse('metrics')
+NAVERS_URL = reverse('navers:naver-list')
+
+
+def sample_value(content, name, view):
+    """Value of the ``name`` sample labelled with the view in the text exposition"""
+    prefix = f'{name}{{view="{view}",'
+    for line in content.decode().splitlines():
+        if line.startswith(prefix):
+            return float(line.rsplit(' ', 1)[1])
+    return None
+
+
+@override_settings(METRICS_SAMPLE_RATE=1.0, METRICS_TOKEN='', CONDITIONAL_GET_ENABLED=False,
+                   RESPONSE_CACHE_ENABLED=False)
+class MetricsTests(TestCase):
+    """Test the request metrics middleware and the /metrics endpoint"""
+
+    def setUp(self):
+        registry.reset()
+        self.owner = get_user_model().objects.create_user('metrics@navedex.com.br', 'supersenha')
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+        # Without METRICS_TOKEN, /metrics is for staff logged in to the admin
+        self.client.force_login(get_user_model().objects.create_superuser('admin@navedex.com.br', 'supersenha'))
+        Naver.objects.create(owner=self.owner, name='Ana', birthdate='1990-01-01',
+                             admission_date='2020-01-01', job_role='Developer')
+
+    def test_records_sampled_request(self):
+        """Test that latency, queries, database and serializer time are recorded per route"""
+        with override_settings(FAST_LIST_SERIALIZATION=False):
+            self.client.get(NAVERS_URL)
+        self.client.get(NAVERS_URL)
+
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res['Content-Type'].startswith('text/plain; version=0.0.4'))
+        view = 'navers:naver-list'
+        self.assertEqual(sample_value(res.content, 'navedex_requests_sampled_total', view), 2)
+        self.assertEqual(sample_value(res.content, 'navedex_request_duration_seconds_count', view), 2)
+        self.assertGreaterEqual(sample_value(res.content, 'navedex_db_queries_sum', view), 2)
+        self.assertGreater(sample_value(res.content, 'navedex_db_duration_seconds_sum', view), 0)
+        self.assertGreater(sample_value(res.content, 'navedex_serializer_duration_seconds_sum', view), 0)
+
+    @override_settings(METRICS_SAMPLE_RATE=0.0)
+    def test_sample_rate_zero_records_nothing(self):
+        """Test that requests left out of the sample are not measured"""
+        self.client.get(NAVERS_URL)
+
+        res = self.client.get(METRICS_URL)
+
+        self.assertIn(b'navedex_metrics_sample_rate 0.0', res.content)
+        self.assertNotIn(b'naver-list', res.content)
+
+    def test_staff_required_without_token(self):
+        """Test that /metrics is closed to anonymous and non staff users when no token is set"""
+        client = APIClient()
+        anonymous = client.get(METRICS_URL)
+        client.force_login(self.owner)
+
+        self.assertEqual(anonymous.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(client.get(METRICS_URL).status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.client.get(METRICS_URL).status_code, status.HTTP_200_OK)
+
+    @override_settings(METRICS_TOKEN='segredo')
+    def test_token_required(self):
+        """Test that /metrics checks the bearer token when one is set"""
+        self.assertEqual(self.client.get(METRICS_URL).status_code, status.HTTP_403_FORBIDDEN)
+
+        res = self.client.get(METRICS_URL, HTTP_AUTHORIZATION='Bearer segredo')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+
+class HistogramTests(TestCase):
+    """Test the in-process histogram"""
+
+    def test_cumulative_buckets(self):
+        """Test that bucket counts are cumulative and values on a bound fall in it"""
+        histogram = Histogram((1, 5))
+        for value in (0, 1, 3, 7):
+            histogram.observe(value)
+
+        self.assertEqual(list(histogram.samples()), [('1', 2), ('5', 3), ('+Inf', 4)])
+        self.assertEqual(histogram.sum, 11)
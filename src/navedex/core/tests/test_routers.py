@@ -0,0 +1,84 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from navedex.core.db.routers import PrimaryReplicaRouter, ReplicaRoutingMiddleware, current_request
+from navedex.core.models import OwnerVersion
+from navedex.navers.models import Naver
+
+
+@override_settings(DATABASE_REPLICAS=['replica0'], DATABASE_REPLICA_PIN_SECONDS=5)
+class PrimaryReplicaRouterTests(TestCase):
+    """Test the read replica routing and the pinning of writers"""
+
+    def setUp(self):
+        cache.clear()
+        self.router = PrimaryReplicaRouter()
+        self.factory = RequestFactory()
+        self.owner = get_user_model().objects.create_user('router@navedex.com.br', 'supersenha')
+
+    def db_for_read_during(self, request, model=Naver):
+        """Database a read made while serving the request would use"""
+        seen = []
+
+        def view(request):
+            seen.append(self.router.db_for_read(model))
+            return HttpResponse()
+
+        ReplicaRoutingMiddleware(view)(request)
+        return seen[0]
+
+    def request(self, method, user=None):
+        request = getattr(self.factory, method)('/api/navers/')
+        request.user = user or self.owner
+        return request
+
+    def test_safe_requests_read_from_replica(self):
+        """Test that GET reads go to a replica and writes to the primary"""
+        self.assertEqual(self.db_for_read_during(self.request('get')), 'replica0')
+        self.assertEqual(self.db_for_read_during(self.request('post')), 'default')
+        self.assertEqual(self.router.db_for_write(Naver), 'default')
+
+    def test_users_read_from_primary(self):
+        """Test that authenticating never misses a user the replica doesn't have yet"""
+        self.assertEqual(self.db_for_read_during(self.request('get'), get_user_model()), 'default')
+
+    @override_settings(DATABASE_REPLICAS=['replica0', 'replica1'])
+    def test_request_reads_share_a_replica(self):
+        """Test that every read of a request goes to the same replica"""
+        seen = []
+
+        def view(request):
+            seen.extend(self.router.db_for_read(model) for model in (OwnerVersion, Naver) * 10)
+            return HttpResponse()
+
+        ReplicaRoutingMiddleware(view)(self.request('get'))
+
+        self.assertEqual(len(set(seen)), 1)
+
+    def test_reads_outside_requests_use_primary(self):
+        """Test that commands and the shell read from the primary"""
+        self.assertIsNone(current_request.get())
+        self.assertEqual(self.router.db_for_read(Naver), 'default')
+
+    def test_writer_is_pinned_to_primary(self):
+        """Test that a user reads from the primary for a while after writing"""
+        other = get_user_model().objects.create_user('other@navedex.com.br', 'supersenha')
+
+        self.db_for_read_during(self.request('patch'))
+
+        self.assertEqual(self.db_for_read_during(self.request('get')), 'default')
+        self.assertEqual(self.db_for_read_during(self.request('get', other)), 'replica0')
+
+    def test_anonymous_writes_do_not_pin(self):
+        """Test that requests without a user don't pin anybody"""
+        self.db_for_read_during(self.request('post', AnonymousUser()))
+
+        self.assertEqual(self.db_for_read_during(self.request('get')), 'replica0')
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas_everything_uses_primary(self):
+        """Test the default single database setup"""
+        self.assertEqual(self.db_for_read_during(self.request('get')), 'default')
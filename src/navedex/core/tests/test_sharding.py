@@ -0,0 +1,136 @@
+from io import StringIO
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from navedex.core.db.routers import OwnerShardRouter
+from navedex.core.db.sharding import HashRing, get_id_range, owner_context, shard_for
+from navedex.navers.models import Naver
+from navedex.projects.models import Project
+
+
+@override_settings(DATABASE_SHARDS=['default', 'shard1', 'shard2'], DATABASE_SHARD_VNODES=64)
+class OwnerShardRouterTests(SimpleTestCase):
+    """Test the consistent hash ring and the routing decisions"""
+
+    def test_adding_a_shard_only_moves_owners_to_it(self):
+        """Test that growing the ring never moves an owner between old shards"""
+        before = HashRing(['default', 'shard1'], 64)
+        after = HashRing(['default', 'shard1', 'shard2'], 64)
+
+        moved = [owner for owner in range(1000) if before.get(owner) != after.get(owner)]
+
+        self.assertTrue(all(after.get(owner) == 'shard2' for owner in moved))
+        self.assertTrue(200 < len(moved) < 500)
+
+    def test_sharded_models_follow_their_owner(self):
+        """Test the instance hint first, then the owner of the running code"""
+        router = OwnerShardRouter()
+        naver = Naver(owner_id=7)
+
+        self.assertEqual(router.db_for_write(Naver, instance=naver), shard_for(7))
+        self.assertEqual(router.db_for_read(Project, instance=get_user_model()(pk=8)), shard_for(8))
+        with owner_context(9):
+            self.assertEqual(router.db_for_read(Naver.projects.through), shard_for(9))
+            self.assertIsNone(router.db_for_read(get_user_model()))
+        self.assertIsNone(router.db_for_read(Naver))
+
+    def test_id_ranges_are_disjoint(self):
+        """Test every shard creates ids from its own range"""
+        span = settings.DATABASE_SHARD_ID_SPAN
+
+        self.assertEqual(get_id_range('default'), (1, span))
+        self.assertEqual(get_id_range('shard2'), (2 * span + 1, 3 * span))
+
+    @override_settings(DATABASE_SHARDS=['default'])
+    def test_single_database_is_not_routed(self):
+        """Test that without shards the next router decides"""
+        self.assertIsNone(OwnerShardRouter().db_for_read(Naver, instance=Naver(owner_id=7)))
+
+
+@skipUnless(len(settings.DATABASE_SHARDS) > 1, "Set DATABASE_SHARD_URLS to run the sharding tests")
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class ShardedDataTests(TestCase):
+    """Test the owners' rows on several databases"""
+    databases = '__all__'
+
+    def create_owner(self, shard):
+        """A new user whose id hashes to shard"""
+        User = get_user_model()
+        while True:
+            user = User.objects.create_user(f'owner{User.objects.count()}@navedex.com.br', 'supersenha')
+            if shard_for(user.pk) == shard:
+                return user
+
+    def test_api_writes_stay_on_the_owner_shard(self):
+        """Test that rows, links and counts are written to the owner's shard only"""
+        shard = settings.DATABASE_SHARDS[1]
+        owner = self.create_owner(shard)
+        client = APIClient()
+        client.force_authenticate(owner)
+
+        project = client.post(reverse('projects:project-list'), {'name': 'Website'}, format='json').data
+        payload = dict(name='Naver', birthdate='1990-01-01', admission_date='2020-01-01',
+                       job_role='Developer', projects=[project['id']])
+        naver = client.post(reverse('navers:naver-list'), payload, format='json').data
+
+        self.assertEqual(naver['id'], get_id_range(shard)[0])
+        self.assertFalse(Naver.objects.using('default').exists())
+        self.assertEqual(Naver.objects.using(shard).get().project_count, 1)
+        res = client.get(reverse('navers:naver-detail', args=[naver['id']]))
+        self.assertEqual(res.data['projects'][0]['naver_count'], 1)
+
+    def test_rebalance_moves_owners_keeping_ids(self):
+        """Test rows written before the shard existed are moved once, with their ids"""
+        shard = settings.DATABASE_SHARDS[1]
+        owner = self.create_owner(shard)
+        naver = Naver.objects.using('default').create(
+            owner=owner, name='Naver', birthdate='1990-01-01', admission_date='2020-01-01', job_role='Developer'
+        )
+        project = Project.objects.using('default').create(owner=owner, name='Website')
+        naver.projects.add(project)
+        out = StringIO()
+
+        call_command('rebalance_shards', stdout=out)
+        call_command('rebalance_shards', stdout=out)
+
+        self.assertIn(f'owner {owner.pk}: default -> {shard}', out.getvalue())
+        self.assertIn('0 owners moved', out.getvalue())
+        self.assertFalse(Naver.objects.using('default').exists())
+        moved = Naver.objects.using(shard).get(id=naver.id)
+        self.assertEqual(moved.project_count, 1)
+        self.assertEqual(list(moved.projects.values_list('id', flat=True)), [project.id])
+
+    def test_links_outside_requests_recount_on_their_shard(self):
+        """Test that link changes made without an owner context, like in the admin, recount on the rows' shard"""
+        shard = settings.DATABASE_SHARDS[1]
+        owner = self.create_owner(shard)
+        with owner_context(owner.pk):
+            naver = Naver.objects.create(owner=owner, name='Naver', birthdate='1990-01-01',
+                                         admission_date='2020-01-01', job_role='Developer')
+            projects = [Project.objects.create(owner=owner, name=f'Project {i}') for i in range(2)]
+
+        naver = Naver.objects.using(shard).get()
+        naver.projects.add(*projects)
+        projects[0].delete()
+
+        self.assertEqual(Naver.objects.using(shard).get().project_count, 1)
+        self.assertEqual(Project.objects.using(shard).get().naver_count, 1)
+
+    def test_deleting_owner_empties_its_shard(self):
+        """Test that deleting a user deletes its rows on the shard"""
+        shard = settings.DATABASE_SHARDS[1]
+        owner = self.create_owner(shard)
+        with owner_context(owner.pk):
+            Project.objects.create(owner=owner, name='Website')
+
+        owner.delete()
+
+        self.assertFalse(Project.objects.using(shard).exists())
+        self.assertFalse(get_user_model().objects.using(shard).exists())
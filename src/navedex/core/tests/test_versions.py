@@ -0,0 +1,67 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from navedex.navers.models import Naver
+from navedex.projects.models import Project
+
+
+NAVERS_URL = reverse('navers:naver-list')
+
+
+class ConditionalGetTests(TestCase):
+    """Test ETag revalidation of navers and projects"""
+
+    def setUp(self):
+        self.owner = get_user_model().objects.create_user('etag@navedex.com.br', 'supersenha')
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+        self.naver = Naver.objects.create(owner=self.owner, name='Naver', birthdate='1990-01-01',
+                                          admission_date='2020-01-01', job_role='Developer')
+
+    def test_unchanged_poll_not_modified(self):
+        """Test that a matching ETag gets a 304 after a single query"""
+        res = self.client.get(NAVERS_URL)
+
+        with self.assertNumQueries(1):
+            again = self.client.get(NAVERS_URL, HTTP_IF_NONE_MATCH=res['ETag'])
+
+        self.assertEqual(again.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(again.content, b'')
+
+    def test_etag_depends_on_owner(self):
+        """Test that another owner's ETag never gets a 304"""
+        res = self.client.get(NAVERS_URL)
+        other = get_user_model().objects.create_user('other@navedex.com.br', 'supersenha')
+        self.client.force_authenticate(other)
+
+        again = self.client.get(NAVERS_URL, HTTP_IF_NONE_MATCH=res['ETag'])
+
+        self.assertEqual(again.status_code, status.HTTP_200_OK)
+        self.assertEqual(again.data, [])
+        self.assertIn('Authorization', again['Vary'])
+        self.assertNotIn('Last-Modified', again)
+
+    def test_link_change_modifies_etag(self):
+        """Test that adding a project to a naver changes the ETag"""
+        url = reverse('navers:naver-detail', args=[self.naver.id])
+        res = self.client.get(url)
+
+        self.naver.projects.add(Project.objects.create(owner=self.owner, name='Website'))
+        again = self.client.get(url, HTTP_IF_NONE_MATCH=res['ETag'])
+
+        self.assertEqual(again.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(again['ETag'], res['ETag'])
+        self.assertEqual(len(again.data['projects']), 1)
+
+    def test_etag_depends_on_query(self):
+        """Test that each filter gets its own ETag"""
+        res = self.client.get(NAVERS_URL)
+
+        filtered = self.client.get(NAVERS_URL, {'name': 'Other'}, HTTP_IF_NONE_MATCH=res['ETag'])
+
+        self.assertEqual(filtered.status_code, status.HTTP_200_OK)
+        self.assertEqual(filtered.data, [])
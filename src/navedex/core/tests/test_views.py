@@ -102,3 +102,27 @@ class PublicUserApiTests(TestCase):
         })
         self.assertNotIn('token', res.data)
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_create_access_token_only(self):
+        """Test that grant=access returns an access token without refresh"""
+        payload = dict(
+            email="acesso@navedex.com.br",
+            password="12345678"
+        )
+        create_user(**payload)
+        res = self.client.post(f'{TOKEN_URL}?grant=access', payload)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('access_token', res.data)
+        self.assertNotIn('refresh_token', res.data)
+
+    def test_create_token_invalid_grant(self):
+        """Test that an unknown grant is rejected"""
+        payload = dict(
+            email="grant@navedex.com.br",
+            password="12345678"
+        )
+        create_user(**payload)
+        res = self.client.post(f'{TOKEN_URL}?grant=forever', payload)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,47 @@
+from typing import NamedTuple, Optional
+
+from django.utils.crypto import salted_hmac
+
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+# Claims copied into every token so the user can be rebuilt without the DB
+USER_CLAIMS = ('email', 'is_active', 'is_staff')
+# HMAC of the password hash: changing the password revokes the tokens
+AUTH_HASH_CLAIM = 'auth_hash'
+
+GRANT_PAIR = 'pair'
+GRANT_ACCESS = 'access'
+GRANTS = (GRANT_PAIR, GRANT_ACCESS)
+
+
+class TokenPair(NamedTuple):
+    access: str
+    refresh: Optional[str] = None
+
+
+def get_auth_hash(password):
+    return salted_hmac('navedex.core.tokens.get_auth_hash', password, algorithm='sha256').hexdigest()
+
+
+def add_user_claims(token, user):
+    """Store the claims needed by the stateless authentication in the token"""
+    for claim in USER_CLAIMS:
+        token[claim] = getattr(user, claim)
+    token[AUTH_HASH_CLAIM] = get_auth_hash(user.password)
+    return token
+
+
+def issue_tokens(user, grant=GRANT_PAIR):
+    """Sign the tokens of a user, each one exactly once.
+
+    The ``access`` grant skips the refresh token for clients that log in
+    again instead of refreshing.
+    """
+    if grant == GRANT_ACCESS:
+        access = add_user_claims(AccessToken.for_user(user), user)
+        return TokenPair(access=str(access))
+    if grant != GRANT_PAIR:
+        raise ValueError(f"Unknown grant {grant!r}")
+
+    refresh = add_user_claims(RefreshToken.for_user(user), user)
+    return TokenPair(access=str(refresh.access_token), refresh=str(refresh))
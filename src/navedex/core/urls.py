@@ -1,9 +1,17 @@
+from django.conf import settings
 from django.urls import path
 from navedex.core import views
 
 app_name = 'core'
 
-urlpatterns = [
-    path('register/', views.SignUpView.as_view(), name='register'),
-    path('login/', views.SignInView.as_view(), name='login'),
-]
+if settings.ASYNC_VIEWS:
+    # Passwords are hashed off the event loop by the async views
+    urlpatterns = [
+        path('register/', views.SignUpView.as_async_view(), name='register'),
+        path('login/', views.SignInView.as_async_view(), name='login'),
+    ]
+else:
+    urlpatterns = [
+        path('register/', views.SignUpView.as_view(), name='register'),
+        path('login/', views.SignInView.as_view(), name='login'),
+    ]
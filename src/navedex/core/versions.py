@@ -0,0 +1,105 @@
+import hashlib
+
+from django.conf import settings
+from django.db import router
+from django.db.models import F
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import quote_etag
+
+from navedex.core.async_views import database
+from navedex.core.cache import invalidate_owner, request_variant
+from navedex.core.models import OwnerVersion
+
+
+def touch_owner(owner_id):
+    """Record a write to the owner's data.
+
+    Bumps the persisted version used by conditional requests and expires the
+    cached responses. Rows are only created on read, so this never inserts
+    while the owner itself is being deleted.
+    """
+    OwnerVersion.objects.filter(owner_id=owner_id).update(version=F('version') + 1)
+    invalidate_owner(owner_id)
+
+
+def get_owner_version(owner_id):
+    """The owner's version as seen by the database the response is read from.
+
+    Read like the owner's rows, so a lagging replica gives its old version
+    along with its old rows and never labels them with a newer ETag. None
+    when that replica doesn't have the version yet, which is created on
+    the primary for the next requests.
+    """
+    version = OwnerVersion.objects.filter(owner_id=owner_id).first()
+    if version is None:
+        version, _ = OwnerVersion.objects.get_or_create(owner_id=owner_id)
+        if router.db_for_read(OwnerVersion) != router.db_for_write(OwnerVersion):
+            return None
+    return version
+
+
+class ConditionalGetMixin:
+    """Answer ``If-None-Match`` on list and retrieve.
+
+    The ETag hashes the owner and its :class:`OwnerVersion` with the request
+    variant (route, pk, query params, media type). A matching poll gets a
+    ``304`` after one primary key lookup, before any queryset or serializer
+    runs. No Last-Modified is sent: HTTP dates have one second resolution,
+    so two writes in the same second would look unchanged.
+    """
+    conditional_actions = ('list', 'retrieve', 'stats')
+
+    def is_conditional(self):
+        if not getattr(settings, 'CONDITIONAL_GET_ENABLED', True):
+            return False
+        return self.action in self.conditional_actions
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional(super().retrieve, request, *args, **kwargs)
+
+    async def async_list(self, request, *args, **kwargs):
+        return await self.aconditional(super().async_list, request, *args, **kwargs)
+
+    async def async_retrieve(self, request, *args, **kwargs):
+        return await self.aconditional(super().async_retrieve, request, *args, **kwargs)
+
+    def conditional(self, handler, request, *args, **kwargs):
+        if not self.is_conditional():
+            return handler(request, *args, **kwargs)
+        version = get_owner_version(request.user.pk)
+        if version is None:
+            return handler(request, *args, **kwargs)
+        not_modified = self.get_not_modified(request, version)
+        if not_modified is not None:
+            return not_modified
+        return self.add_validators(handler(request, *args, **kwargs), request, version)
+
+    async def aconditional(self, handler, request, *args, **kwargs):
+        if not self.is_conditional():
+            return await handler(request, *args, **kwargs)
+        version = await database(get_owner_version)(request.user.pk)
+        if version is None:
+            return await handler(request, *args, **kwargs)
+        not_modified = self.get_not_modified(request, version)
+        if not_modified is not None:
+            return not_modified
+        return self.add_validators(await handler(request, *args, **kwargs), request, version)
+
+    def get_etag(self, request, version):
+        variant = f'{request.user.pk}|{version.version}|{request_variant(self, request)}'
+        return quote_etag(hashlib.md5(variant.encode()).hexdigest())
+
+    def get_not_modified(self, request, version):
+        response = get_conditional_response(request, etag=self.get_etag(request, version))
+        if response is not None:
+            patch_vary_headers(response, ('Authorization',))
+        return response
+
+    def add_validators(self, response, request, version):
+        if response.status_code == 200:
+            response['ETag'] = self.get_etag(request, version)
+            patch_vary_headers(response, ('Authorization',))
+        return response
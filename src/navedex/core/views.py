@@ -3,9 +3,11 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 
 from navedex.core import serializers
+from navedex.core.async_views import AsyncAPIViewMixin, database
+from navedex.core.hashers import aauthenticate, acreate_user
 
 
-class SignUpView(APIView):
+class SignUpView(AsyncAPIViewMixin, APIView):
     serializer_class = serializers.RegisterSerializer
 
     def post(self, request):
@@ -15,12 +17,33 @@ class SignUpView(APIView):
 
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+    async def async_post(self, request):
+        serializer = self.serializer_class(data=request.data)
+        await database(serializer.is_valid)(raise_exception=True)
+        user = await acreate_user(**serializer.validated_data)
+
+        return Response(self.serializer_class(user).data, status=status.HTTP_201_CREATED)
 
-class SignInView(APIView):
+
+class SignInView(AsyncAPIViewMixin, APIView):
     serializer_class = serializers.LoginSerializer
 
     def post(self, request):
-        serializer = self.serializer_class(data=request.data)
+        serializer = self.serializer_class(
+            data=request.data,
+            context={'grant': request.query_params.get('grant')}
+        )
         serializer.is_valid(raise_exception=True)
 
         return Response(serializer.data, status=status.HTTP_200_OK)
+
+    async def async_post(self, request):
+        serializer = serializers.CredentialsSerializer(
+            data=request.data,
+            context={'grant': request.query_params.get('grant')}
+        )
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        user = await aauthenticate(request._request, email=data['email'], password=data['password'])
+
+        return Response(self.serializer_class(serializer.login(user)).data, status=status.HTTP_200_OK)
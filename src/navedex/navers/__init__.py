@@ -0,0 +1 @@
+default_app_config = 'navedex.navers.apps.NaversConfig'
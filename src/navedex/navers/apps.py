@@ -2,4 +2,8 @@ from django.apps import AppConfig
 
 
 class NaversConfig(AppConfig):
-    name = 'navers'
+    name = 'navedex.navers'
+    label = 'navers'
+
+    def ready(self):
+        from navedex.navers import signals  # noqa: F401
@@ -0,0 +1,29 @@
+# Generated by Django 3.1.14 on 2026-10-18 11:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('navers', '0003_auto_20200813_1752'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='naver',
+            index=models.Index(fields=['owner', 'id'], name='naver_owner_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='naver',
+            index=models.Index(fields=['owner', 'name'], name='naver_owner_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='naver',
+            index=models.Index(fields=['owner', 'admission_date'], name='naver_owner_admission_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='naver',
+            index=models.Index(fields=['owner', 'job_role'], name='naver_owner_job_role_idx'),
+        ),
+    ]
@@ -0,0 +1,65 @@
+from django.db import migrations
+
+# The index DDL is frozen here, the later migrations rebuilding it import
+# this module
+TABLE = 'navers_naver'
+SEARCH_FIELDS = ('name', 'job_role')
+
+
+def create_search_index(schema_editor):
+    """GIN index on PostgreSQL, FTS5 table kept in sync by triggers on SQLite"""
+    fts = f'{TABLE}_search'
+    columns = ', '.join(SEARCH_FIELDS)
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        vector = " || ' ' || ".join(f"COALESCE({field}, '')" for field in SEARCH_FIELDS)
+        schema_editor.execute(
+            f"CREATE INDEX {TABLE}_search_idx ON {TABLE} USING gin (to_tsvector('simple'::regconfig, {vector}))"
+        )
+    elif vendor == 'sqlite':
+        new = ', '.join(f'new.{field}' for field in SEARCH_FIELDS)
+        old = ', '.join(f'old.{field}' for field in SEARCH_FIELDS)
+        statements = [
+            f"CREATE VIRTUAL TABLE {fts} USING fts5({columns}, content='{TABLE}', content_rowid='id', "
+            f"tokenize='unicode61 remove_diacritics 2')",
+            f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {TABLE} BEGIN "
+            f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new}); END",
+            f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {TABLE} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old}); END",
+            f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {columns} ON {TABLE} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old}); "
+            f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new}); END",
+            f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+        ]
+        for statement in statements:
+            schema_editor.execute(statement)
+
+
+def drop_search_index(schema_editor):
+    fts = f'{TABLE}_search'
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {TABLE}_search_idx')
+    elif vendor == 'sqlite':
+        for suffix in ('ai', 'ad', 'au'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {fts}_{suffix}')
+        schema_editor.execute(f'DROP TABLE IF EXISTS {fts}')
+
+
+def create(apps, schema_editor):
+    create_search_index(schema_editor)
+
+
+def drop(apps, schema_editor):
+    drop_search_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('navers', '0004_owner_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create, drop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.1.14 on 2026-10-18 11:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('navers', '0005_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='naver',
+            index=models.Index(fields=['owner', 'birthdate'], name='naver_owner_birthdate_idx'),
+        ),
+    ]
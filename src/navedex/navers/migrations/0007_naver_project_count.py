@@ -0,0 +1,46 @@
+# Generated by Django 3.1.14 on 2026-10-18 12:15
+
+from importlib import import_module
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+search_index = import_module('navedex.navers.migrations.0005_search_index')
+
+
+def recreate_search_index(apps, schema_editor):
+    # SQLite rebuilds the table to add the column, dropping the FTS triggers;
+    # they now also skip updates that only touch the counts
+    search_index.drop_search_index(schema_editor)
+    search_index.create_search_index(schema_editor)
+
+
+def count_projects(apps, schema_editor):
+    naver = apps.get_model('navers', 'Naver')
+    through = apps.get_model('navers', 'Naver_projects')
+    links = through.objects.filter(naver_id=OuterRef('pk')).order_by().values('naver_id')
+    naver.objects.update(project_count=Coalesce(Subquery(links.annotate(count=Count('*')).values('count')), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('navers', '0006_owner_birthdate_index'),
+    ]
+
+    operations = [
+        # Rebuilt last when unapplying, after the table is rebuilt again
+        migrations.RunPython(migrations.RunPython.noop, recreate_search_index),
+        migrations.AddField(
+            model_name='naver',
+            name='project_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='naver',
+            index=models.Index(fields=['owner', 'project_count', 'id'], name='naver_owner_project_count_idx'),
+        ),
+        migrations.RunPython(recreate_search_index, migrations.RunPython.noop),
+        migrations.RunPython(count_projects, migrations.RunPython.noop),
+    ]
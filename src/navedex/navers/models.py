@@ -12,6 +12,21 @@ class Naver(models.Model):
     admission_date = models.DateField()
     job_role = models.CharField(max_length=255)
     projects = models.ManyToManyField('projects.Project', related_name="navers", blank=True)
+    # Number of projects, kept in sync with the links
+    project_count = models.PositiveIntegerField(default=0, editable=False)
+
+    # M2M relations whose size is denormalized, and the column holding it
+    link_counts = {'projects': 'project_count'}
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['owner', 'id'], name='naver_owner_id_idx'),
+            models.Index(fields=['owner', 'name'], name='naver_owner_name_idx'),
+            models.Index(fields=['owner', 'admission_date'], name='naver_owner_admission_idx'),
+            models.Index(fields=['owner', 'job_role'], name='naver_owner_job_role_idx'),
+            models.Index(fields=['owner', 'birthdate'], name='naver_owner_birthdate_idx'),
+            models.Index(fields=['owner', 'project_count', 'id'], name='naver_owner_project_count_idx'),
+        ]
 
     def __str__(self):
         return self.name
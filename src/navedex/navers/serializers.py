@@ -1,23 +1,27 @@
 from rest_framework import serializers
 
+from navedex.core.fields import OwnerPrimaryKeyRelatedField
+from navedex.core.metrics import TimedSerializerMixin
+from navedex.core.serializers import SparseFieldsetMixin
+
 from navedex.navers.models import Naver
 
 from navedex.projects.models import Project
 from navedex.projects.serializers import ProjectSerializer
 
 
-class NaverSerializer(serializers.ModelSerializer):
+class NaverSerializer(TimedSerializerMixin, SparseFieldsetMixin, serializers.ModelSerializer):
 
     class Meta:
         model = Naver
         fields = ('id', 'name', 'birthdate',
-                  'admission_date', 'job_role')
-        read_only_fields = ('id',)
+                  'admission_date', 'job_role', 'project_count')
+        read_only_fields = ('id', 'project_count')
 
 
 class NaverCreateSerializer(serializers.ModelSerializer):
     """Create a New Naver"""
-    projects = serializers.PrimaryKeyRelatedField(
+    projects = OwnerPrimaryKeyRelatedField(
         many=True,
         queryset=Project.objects.all(),
         required=False
@@ -30,12 +34,12 @@ class NaverCreateSerializer(serializers.ModelSerializer):
         read_only_fields = ('id',)
 
 
-class NaverDetailSerializer(serializers.ModelSerializer):
+class NaverDetailSerializer(TimedSerializerMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     """Show details about Naver"""
     projects = ProjectSerializer(many=True, read_only=True, required=False)
 
     class Meta:
         model = Naver
         fields = ('id', 'name', 'birthdate',
-                  'admission_date', 'job_role', 'projects')
-        read_only_fields = ('id',)
+                  'admission_date', 'job_role', 'project_count', 'projects')
+        read_only_fields = ('id', 'project_count')
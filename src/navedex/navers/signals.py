@@ -0,0 +1,48 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from navedex.core.bulk import link_counts_deferred, recount_unlinked, refresh_links, unlink_on_delete
+from navedex.core.versions import touch_owner
+from navedex.navers.models import Naver
+
+
+@receiver(post_save, sender=Naver)
+@receiver(post_delete, sender=Naver)
+def naver_changed(sender, instance, **kwargs):
+    touch_owner(instance.owner_id)
+
+
+@receiver(m2m_changed, sender=Naver.projects.through)
+def naver_projects_changed(sender, instance, action, **kwargs):
+    """Links are owner scoped, the owner of either side covers both"""
+    if action.startswith('post_'):
+        touch_owner(instance.owner_id)
+
+
+@receiver(m2m_changed, sender=Naver.projects.through)
+def count_naver_projects(sender, instance, action, reverse, pk_set, using, **kwargs):
+    """Recount both sides of the links added, removed or cleared through the managers.
+
+    On the database the links were written to, which outside a request
+    (admin, shell) may not be where the current owner routes.
+    """
+    if link_counts_deferred.get():
+        return
+    relation = 'navers' if reverse else 'projects'
+    if action == 'pre_clear':
+        instance._cleared_ids = set(getattr(instance, relation).using(using).values_list('pk', flat=True))
+    elif action == 'post_clear':
+        cleared = instance.__dict__.pop('_cleared_ids', ())
+        refresh_links(type(instance), relation, [instance.pk], cleared, using=using)
+    elif action in ('post_add', 'post_remove'):
+        refresh_links(type(instance), relation, [instance.pk], pk_set, using=using)
+
+
+@receiver(pre_delete, sender=Naver)
+def naver_deleting(sender, instance, **kwargs):
+    unlink_on_delete(instance, 'projects')
+
+
+@receiver(post_delete, sender=Naver)
+def naver_deleted(sender, instance, **kwargs):
+    recount_unlinked(instance, 'projects')
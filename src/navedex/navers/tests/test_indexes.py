@@ -0,0 +1,84 @@
+from itertools import combinations
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from navedex.navers.models import Naver
+from navedex.navers.views import NaverViewSet
+from navedex.projects.models import Project
+from navedex.projects.views import ProjectViewSet
+
+
+# Query param -> (indexed field, value)
+FILTER_PARAMS = {
+    'name': ('name', 'Naver 1'),
+    'admission_date__gte': ('admission_date', '2020-08-10'),
+    'birthdate__lte': ('birthdate', '1990-01-01'),
+    'job_role__in': ('job_role', 'Designer,Developer'),
+    'tenure_min_years': ('admission_date', '2'),
+}
+
+
+def index_for(model, field):
+    """Return the name of the (owner, field) index of the model"""
+    for index in model._meta.indexes:
+        if index.fields == ['owner', field]:
+            return index.name
+    return None
+
+
+class OwnerIndexUsageTest(TestCase):
+    """Test that every supported list filter is answered by an index"""
+
+    def setUp(self):
+        self.owner = get_user_model().objects.create_user(
+            'indexes@navedex.com.br',
+            'supersenha'
+        )
+        self.factory = APIRequestFactory()
+
+    def list_queryset(self, viewset_class, params):
+        request = Request(self.factory.get('/', params))
+        request.user = self.owner
+        view = viewset_class(request=request, action='list', format_kwarg=None)
+        return view.filter_queryset(view.get_queryset())
+
+    def explain(self, queryset):
+        if connection.vendor == 'postgresql':
+            # Tiny test tables are always cheaper to scan sequentially
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        return queryset.explain()
+
+    def assertUsesIndex(self, queryset, index_names):
+        plan = self.explain(queryset)
+        self.assertTrue(
+            any(name in plan for name in index_names),
+            f'None of {index_names} used by plan:\n{plan}'
+        )
+
+    def test_naver_filters_use_owner_indexes(self):
+        """Test each combination of naver filters hits an owner index"""
+        for size in range(1, len(FILTER_PARAMS) + 1):
+            for combo in combinations(FILTER_PARAMS, size):
+                with self.subTest(filters=combo):
+                    params = {param: FILTER_PARAMS[param][1] for param in combo}
+                    queryset = self.list_queryset(NaverViewSet, params)
+                    self.assertUsesIndex(queryset, [index_for(Naver, FILTER_PARAMS[param][0]) for param in combo])
+
+    def test_project_filters_use_owner_indexes(self):
+        """Test the project name filter hits the owner index"""
+        queryset = self.list_queryset(ProjectViewSet, {'name': 'New Website'})
+
+        self.assertUsesIndex(queryset, [index_for(Project, 'name')])
+
+    def test_cursor_pagination_uses_owner_id_index(self):
+        """Test keyset pages are read from the (owner, id) index"""
+        queryset = self.list_queryset(NaverViewSet, {})
+        queryset = queryset.filter(id__gt=100).order_by('id')
+
+        self.assertUsesIndex(queryset, [index_for(Naver, 'id')])
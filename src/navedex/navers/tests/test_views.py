@@ -1,10 +1,16 @@
+import json
+
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from navedex.core.filters import years_ago
 from navedex.navers.models import Naver
 from navedex.navers.serializers import (
     NaverSerializer,
@@ -16,12 +22,19 @@ from navedex.projects.models import Project
 
 TOKEN_URL = reverse('core:login')
 NAVERS_URL = reverse('navers:naver-list')
+BULK_URL = reverse('navers:naver-bulk')
+EXPORT_URL = reverse('navers:naver-export')
+STATS_URL = reverse('navers:naver-stats')
 
 
 def detail_url(naver_id):
     return reverse('navers:naver-detail', args=[naver_id])
 
 
+def projects_url(naver_id):
+    return reverse('navers:naver-projects', args=[naver_id])
+
+
 def sample_naver(owner, **params):
     """Create and return a sample naver"""
     defaults = dict(
@@ -256,3 +269,431 @@ class PrivateNaverAPITest(TestCase):
         self.assertEqual(naver.job_role, payload["job_role"])
         projects = naver.projects.all()
         self.assertEqual(len(projects), 0)
+
+    def test_list_navers_paginated_with_cursor(self):
+        """Test walking the navers list page by page with the next cursor"""
+        navers = [sample_naver(owner=self.owner, name=f'Naver {i}') for i in range(5)]
+
+        res = self.client.get(NAVERS_URL, {'page_size': 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIsNone(res.data['previous'])
+        ids = [item['id'] for item in res.data['results']]
+        while res.data['next']:
+            res = self.client.get(res.data['next'])
+            ids.extend(item['id'] for item in res.data['results'])
+
+        self.assertEqual(ids, [naver.id for naver in navers])
+
+    def test_list_navers_unpaginated_opt_out(self):
+        """Test that paginate=false keeps the plain list shape"""
+        sample_naver(owner=self.owner)
+
+        with self.settings(PAGINATE_BY_DEFAULT=True):
+            paginated = self.client.get(NAVERS_URL)
+            res = self.client.get(NAVERS_URL, {'paginate': 'false'})
+
+        self.assertIn('results', paginated.data)
+        self.assertEqual(len(res.data), 1)
+        self.assertEqual(res.data[0]['name'], 'New User')
+
+    @override_settings(JWT_AUTH_STATELESS=False)
+    def test_list_navers_expanded_constant_queries(self):
+        """Test ?expand=projects costs the same queries for any page size"""
+        projects = [Project.objects.create(owner=self.owner, name=f'Project {i}') for i in range(3)]
+        for i in range(20):
+            naver = sample_naver(owner=self.owner, name=f'Naver {i}')
+            naver.projects.set(projects)
+
+        for page_size in (1, 5, 20):
+            with self.subTest(page_size=page_size):
+                # user, owner version, navers page and projects prefetch
+                with self.assertNumQueries(4):
+                    res = self.client.get(NAVERS_URL, {'expand': 'projects', 'page_size': page_size})
+
+                self.assertEqual(len(res.data['results']), page_size)
+                naver = Naver.objects.get(id=res.data['results'][0]['id'])
+                self.assertEqual(res.data['results'][0], NaverDetailSerializer(naver).data)
+
+    @override_settings(JWT_AUTH_STATELESS=False)
+    def test_view_naver_detail_prefetches_projects(self):
+        """Test the naver detail loads its projects with a single query"""
+        naver = sample_naver(owner=self.owner)
+        for i in range(5):
+            naver.projects.add(Project.objects.create(owner=self.owner, name=f'Project {i}'))
+
+        with self.assertNumQueries(4):
+            res = self.client.get(detail_url(naver.id))
+
+        naver.refresh_from_db()
+        self.assertEqual(res.data, NaverDetailSerializer(naver).data)
+
+    def test_bulk_create_navers(self):
+        """Test creating many navers with their projects in one request"""
+        project = Project.objects.create(owner=self.owner, name="New Website")
+        payload = [
+            dict(name=f'Naver {i}', birthdate='1990-01-01', admission_date='2020-01-01',
+                 job_role='Developer', projects=[project.id])
+            for i in range(3)
+        ]
+
+        res = self.client.post(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([item['status'] for item in res.data['results']], [201] * 3)
+        navers = Naver.objects.filter(owner=self.owner)
+        self.assertEqual(navers.count(), 3)
+        self.assertEqual(project.navers.count(), 3)
+
+    def test_bulk_create_navers_all_or_nothing(self):
+        """Test that one invalid naver rejects the whole batch by default"""
+        other = get_user_model().objects.create_user('other@navedex.com.br', 'passtest')
+        foreign = Project.objects.create(owner=other, name="Foreign")
+        payload = [
+            dict(name='Naver 1', birthdate='1990-01-01', admission_date='2020-01-01', job_role='Developer'),
+            dict(name='Naver 2', birthdate='1990-01-01', admission_date='2020-01-01',
+                 job_role='Developer', projects=[foreign.id]),
+        ]
+
+        res = self.client.post(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data['results'][0]['index'], 1)
+        self.assertIn('projects', res.data['results'][0]['errors'])
+        self.assertFalse(Naver.objects.exists())
+
+    def test_bulk_create_navers_partial(self):
+        """Test that mode=partial writes the valid navers and reports the rest"""
+        payload = [
+            dict(name='Naver 1', birthdate='1990-01-01', admission_date='2020-01-01', job_role='Developer'),
+            dict(name='', birthdate='', admission_date='', job_role=''),
+        ]
+
+        res = self.client.post(f'{BULK_URL}?mode=partial', payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual([item['status'] for item in res.data['results']], [201, 400])
+        self.assertTrue(Naver.objects.filter(owner=self.owner, name='Naver 1').exists())
+
+    def test_bulk_navers_projects_not_a_list(self):
+        """Test that a non list projects value is reported on its item"""
+        payload = [dict(name='Naver 1', birthdate='1990-01-01', admission_date='2020-01-01',
+                        job_role='Developer', projects=5)]
+
+        naver = sample_naver(owner=self.owner)
+
+        for method in (self.client.post, self.client.patch):
+            with self.subTest(method=method.__name__):
+                items = payload if method == self.client.post else [dict(payload[0], id=naver.id)]
+                res = method(BULK_URL, items, format='json')
+
+                self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertEqual(res.data['results'][0]['index'], 0)
+                self.assertIn('Expected a list', str(res.data['results'][0]['errors']['projects'][0]))
+
+    def test_bulk_navers_results_list_distinct_projects(self):
+        """Test that created and updated items report the same deduplicated project ids"""
+        projects = [Project.objects.create(owner=self.owner, name=f'Project {i}') for i in range(2)]
+        payload = [dict(name='Naver 1', birthdate='1990-01-01', admission_date='2020-01-01',
+                        job_role='Developer', projects=[projects[1].id, projects[0].id, projects[1].id])]
+
+        created = self.client.post(BULK_URL, payload, format='json').data['results'][0]['data']
+        updated = self.client.patch(BULK_URL, [{'id': created['id'], 'job_role': 'UX'}], format='json')
+
+        expected = sorted(project.id for project in projects)
+        self.assertEqual(created['projects'], expected)
+        self.assertEqual(created['project_count'], 2)
+        self.assertEqual(updated.data['results'][0]['data']['projects'], expected)
+
+    def test_bulk_update_and_delete_navers(self):
+        """Test updating and removing many navers in one request each"""
+        navers = [sample_naver(owner=self.owner, name=f'Naver {i}') for i in range(3)]
+        project = Project.objects.create(owner=self.owner, name="New Website")
+        payload = [{'id': naver.id, 'job_role': 'UX', 'projects': [project.id]} for naver in navers]
+
+        res = self.client.patch(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(Naver.objects.filter(job_role='UX').count(), 3)
+        self.assertEqual(project.navers.count(), 3)
+
+        res = self.client.delete(BULK_URL, [naver.id for naver in navers[:2]], format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(Naver.objects.values_list('id', flat=True)), [navers[2].id])
+
+    def test_link_and_unlink_naver_projects(self):
+        """Test adding and removing projects by id without replacing the set"""
+        naver = sample_naver(owner=self.owner)
+        projects = [Project.objects.create(owner=self.owner, name=f'Project {i}') for i in range(3)]
+        naver.projects.add(projects[0])
+        url = projects_url(naver.id)
+
+        res = self.client.post(url, [projects[0].id, projects[1].id, projects[2].id], format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {'added': sorted([projects[1].id, projects[2].id])})
+        self.assertEqual(naver.projects.count(), 3)
+
+        res = self.client.delete(url, [projects[1].id, projects[1].id], format='json')
+
+        self.assertEqual(res.data, {'removed': [projects[1].id]})
+        naver.refresh_from_db()
+        self.assertEqual(naver.project_count, 2)
+        self.assertEqual(Project.objects.get(id=projects[1].id).naver_count, 0)
+
+    @override_settings(JWT_AUTH_STATELESS=False)
+    def test_link_naver_projects_is_idempotent(self):
+        """Test that repeating a link or an unlink changes nothing"""
+        naver = sample_naver(owner=self.owner)
+        project = Project.objects.create(owner=self.owner, name="New Website")
+        url = projects_url(naver.id)
+        self.client.post(url, [project.id], format='json')
+
+        # user, owned ids, naver and the linked ids inside a savepoint
+        with self.assertNumQueries(6):
+            res = self.client.post(url, [project.id], format='json')
+        self.assertEqual(res.data, {'added': []})
+
+        self.client.delete(url, [project.id], format='json')
+        res = self.client.delete(url, [project.id], format='json')
+        self.assertEqual(res.data, {'removed': []})
+        self.assertEqual(naver.projects.count(), 0)
+
+    def test_link_naver_foreign_projects_invalid(self):
+        """Test that projects of another owner and bad ids are rejected"""
+        other = get_user_model().objects.create_user('other@navedex.com.br', 'passtest')
+        foreign = Project.objects.create(owner=other, name="Foreign")
+        naver = sample_naver(owner=self.owner)
+
+        res = self.client.post(projects_url(naver.id), [foreign.id, 'x'], format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(res.data['projects']), 2)
+        self.assertFalse(Naver.projects.through.objects.exists())
+
+        res = self.client.post(projects_url(sample_naver(owner=other).id), [], format='json')
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_create_naver_with_foreign_projects_invalid(self):
+        """Test that projects of another owner are rejected in one error"""
+        other = get_user_model().objects.create_user('other@navedex.com.br', 'passtest')
+        own = Project.objects.create(owner=self.owner, name="Own")
+        foreign = [Project.objects.create(owner=other, name=f"Foreign {i}") for i in range(2)]
+        payload = dict(name='Naver', birthdate='1990-01-01', admission_date='2020-01-01',
+                       job_role='Developer', projects=[own.id] + [p.id for p in foreign])
+
+        res = self.client.post(NAVERS_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(res.data['projects']), 2)
+        self.assertFalse(Naver.objects.exists())
+
+    @override_settings(JWT_AUTH_STATELESS=False)
+    def test_create_naver_projects_validated_in_batch(self):
+        """Test that the number of queries doesn't grow with the projects sent"""
+        projects = [Project.objects.create(owner=self.owner, name=f"Project {i}") for i in range(10)]
+
+        def create(name, ids):
+            payload = dict(name=name, birthdate='1990-01-01', admission_date='2020-01-01',
+                           job_role='Developer', projects=ids)
+            with CaptureQueriesContext(connection) as queries:
+                res = self.client.post(NAVERS_URL, payload, format='json')
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+            return len(queries)
+
+        self.assertEqual(
+            create('Naver 1', [projects[0].id]),
+            create('Naver 2', [project.id for project in projects])
+        )
+
+    def test_export_navers_json(self):
+        """Test exporting the user's navers as a streamed JSON array"""
+        project = Project.objects.create(owner=self.owner, name="Project")
+        naver = sample_naver(owner=self.owner)
+        naver.projects.add(project)
+        sample_naver(owner=self.owner, name="Other")
+        other = get_user_model().objects.create_user('other@navedex.com.br', 'passtest')
+        sample_naver(owner=other)
+
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        self.assertIn('attachment', res['Content-Disposition'])
+        data = json.loads(b''.join(res.streaming_content))
+        self.assertEqual([row['name'] for row in data], ['New User', 'Other'])
+        self.assertEqual(data[0]['projects'], [project.id])
+        self.assertEqual(data[0]['admission_date'], '2020-09-01')
+
+    def test_export_navers_ndjson_filtered(self):
+        """Test exporting filtered navers as NDJSON"""
+        sample_naver(owner=self.owner, job_role="Developer")
+        sample_naver(owner=self.owner, job_role="Designer")
+
+        res = self.client.get(EXPORT_URL, {'job_role': 'Designer'}, HTTP_ACCEPT='application/x-ndjson')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(res.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line)['job_role'] for line in lines], ['Designer'])
+
+    def test_search_navers_by_prefix(self):
+        """Test that ?search= matches word prefixes of name and job role, paginated"""
+        sample_naver(owner=self.owner, name="Ana Souza", job_role="Developer")
+        sample_naver(owner=self.owner, name="Bruno", job_role="Designer")
+        sample_naver(owner=self.owner, name="Carla", job_role="Devops")
+        other = get_user_model().objects.create_user('other@navedex.com.br', 'passtest')
+        sample_naver(owner=other, name="Ana Lima", job_role="Developer")
+
+        res = self.client.get(NAVERS_URL, {'search': 'dev'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['count'], 2)
+        self.assertEqual({naver['name'] for naver in res.data['results']}, {'Ana Souza', 'Carla'})
+
+        res = self.client.get(NAVERS_URL, {'search': 'ana dev'})
+        self.assertEqual([naver['name'] for naver in res.data['results']], ['Ana Souza'])
+
+    def test_search_sees_bulk_writes(self):
+        """Test that the search index follows bulk creates, updates and deletes"""
+        payload = [dict(name=f"Naver {i}", birthdate='1990-01-01', admission_date='2020-01-01',
+                        job_role='Tester') for i in range(3)]
+        created = self.client.post(BULK_URL, payload, format='json').data['results']
+        first = created[0]['data']['id']
+        self.client.patch(BULK_URL, [{'id': first, 'job_role': 'Manager'}], format='json')
+        self.client.delete(BULK_URL, [created[1]['data']['id']], format='json')
+
+        res = self.client.get(NAVERS_URL, {'search': 'test'})
+        self.assertEqual([naver['name'] for naver in res.data['results']], ['Naver 2'])
+        res = self.client.get(NAVERS_URL, {'search': 'manag'})
+        self.assertEqual([naver['id'] for naver in res.data['results']], [first])
+
+    def test_filter_navers_by_ranges(self):
+        """Test admission and birth date ranges and multi-value job roles"""
+        sample_naver(owner=self.owner, name="Old", admission_date="2015-01-01", job_role="Developer")
+        sample_naver(owner=self.owner, name="New", admission_date="2021-01-01", job_role="Designer",
+                     birthdate="1995-05-05")
+        sample_naver(owner=self.owner, name="Tester", admission_date="2021-06-01", job_role="Tester")
+
+        res = self.client.get(NAVERS_URL, {'admission_date__gte': '2020-01-01',
+                                           'job_role__in': 'Designer,Tester'})
+        self.assertEqual({naver['name'] for naver in res.data}, {'New', 'Tester'})
+
+        res = self.client.get(NAVERS_URL, {'birthdate__gte': '1995-01-01', 'birthdate__lte': '1995-12-31'})
+        self.assertEqual([naver['name'] for naver in res.data], ['New'])
+
+        res = self.client.get(NAVERS_URL + '?job_role__in=Developer&job_role__in=Tester')
+        self.assertEqual({naver['name'] for naver in res.data}, {'Old', 'Tester'})
+
+    def test_filter_navers_by_tenure(self):
+        """Test tenure_min_years and tenure_max_years on the admission date"""
+        today = timezone.localdate()
+        sample_naver(owner=self.owner, name="Veteran", admission_date=years_ago(today, 5))
+        sample_naver(owner=self.owner, name="Two years", admission_date=years_ago(today, 2))
+        sample_naver(owner=self.owner, name="Rookie", admission_date=today)
+
+        res = self.client.get(NAVERS_URL, {'tenure_min_years': 2})
+        self.assertEqual({naver['name'] for naver in res.data}, {'Veteran', 'Two years'})
+
+        res = self.client.get(NAVERS_URL, {'tenure_max_years': 2})
+        self.assertEqual({naver['name'] for naver in res.data}, {'Two years', 'Rookie'})
+
+    def test_filter_navers_invalid_values(self):
+        """Test that malformed filter values are rejected with 400"""
+        res = self.client.get(NAVERS_URL, {'admission_date__gte': 'yesterday', 'tenure_min_years': '-1'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('admission_date__gte', res.data)
+        self.assertIn('tenure_min_years', res.data)
+
+    def test_filter_navers_years_out_of_range(self):
+        """Test that years past the calendar are a 400, not a server error"""
+        for value in ('99999999999999999999', '5000'):
+            res = self.client.get(NAVERS_URL, {'tenure_min_years': value, 'tenure_max_years': value})
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('tenure_min_years', res.data)
+            self.assertIn('tenure_max_years', res.data)
+
+    @override_settings(JWT_AUTH_STATELESS=False)
+    def test_navers_stats(self):
+        """Test head-count per role, tenure buckets and project load in fixed queries"""
+        today = timezone.localdate()
+        project = Project.objects.create(owner=self.owner, name="Project")
+        veteran = sample_naver(owner=self.owner, job_role="Developer", admission_date=years_ago(today, 4))
+        veteran.projects.add(project)
+        sample_naver(owner=self.owner, job_role="Developer", admission_date=today)
+        sample_naver(owner=self.owner, job_role="Designer", admission_date=years_ago(today, 12))
+
+        # user, owner version and the three aggregates
+        with self.assertNumQueries(5):
+            res = self.client.get(STATS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['total'], 3)
+        self.assertEqual(res.data['by_job_role'], [
+            {'job_role': 'Designer', 'count': 1},
+            {'job_role': 'Developer', 'count': 2},
+        ])
+        tenure = {bucket['bucket']: bucket['count'] for bucket in res.data['tenure_years']}
+        self.assertEqual(tenure, {'0-1': 1, '1-2': 0, '2-3': 0, '3-5': 1, '5-10': 0, '10+': 1})
+        self.assertEqual(res.data['projects_per_naver']['max'], 1)
+        self.assertEqual(res.data['projects_per_naver']['without_projects'], 2)
+
+    def test_navers_stats_follow_filters(self):
+        """Test that the list filters narrow the stats"""
+        sample_naver(owner=self.owner, job_role="Developer")
+        sample_naver(owner=self.owner, job_role="Designer")
+
+        res = self.client.get(STATS_URL, {'job_role': 'Designer'})
+
+        self.assertEqual(res.data['total'], 1)
+
+    def test_list_navers_sparse_fields(self):
+        """Test that ?fields= prunes the output and the selected columns"""
+        sample_naver(owner=self.owner)
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(NAVERS_URL, {'fields': 'id,name'})
+
+        self.assertEqual(list(res.data[0]), ['id', 'name'])
+        select = queries.captured_queries[-1]['sql']
+        self.assertIn('"name"', select)
+        self.assertNotIn('"job_role"', select)
+
+    def test_list_navers_unknown_fields_rejected(self):
+        """Test that unknown ?fields= names return a 400 listing the valid ones"""
+        sample_naver(owner=self.owner)
+
+        res = self.client.get(NAVERS_URL, {'fields': 'bogus'})
+        nested = self.client.get(NAVERS_URL, {'expand': 'projects', 'fields': 'name,projects.bogus'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('bogus', res.data['fields'][0])
+        self.assertIn('job_role', res.data['fields'][0])
+        self.assertEqual(nested.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('projects.bogus', nested.data['fields'][0])
+        self.assertIn('projects.name', nested.data['fields'][0])
+
+    @override_settings(JWT_AUTH_STATELESS=False)
+    def test_view_naver_detail_omit_projects(self):
+        """Test that omitting the projects skips their prefetch"""
+        naver = sample_naver(owner=self.owner)
+        naver.projects.add(Project.objects.create(owner=self.owner, name='Project'))
+
+        with self.assertNumQueries(3):
+            res = self.client.get(detail_url(naver.id), {'omit': 'projects,birthdate'})
+
+        self.assertNotIn('projects', res.data)
+        self.assertNotIn('birthdate', res.data)
+        self.assertIn('job_role', res.data)
+
+    def test_list_navers_expanded_nested_fields(self):
+        """Test that dotted names prune the nested projects"""
+        naver = sample_naver(owner=self.owner)
+        naver.projects.add(Project.objects.create(owner=self.owner, name='Project'))
+
+        res = self.client.get(NAVERS_URL, {'expand': 'projects', 'fields': 'name,projects.name'})
+
+        self.assertEqual(res.data, [{'name': naver.name, 'projects': [{'name': 'Project'}]}])
@@ -1,6 +1,8 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
+from navedex.core.async_views import LIST_ACTIONS, DETAIL_ACTIONS
 from navedex.navers import views
 
 router = DefaultRouter()
@@ -12,3 +14,13 @@ app_name = 'navers'
 urlpatterns = [
     path('', include(router.urls)),
 ]
+
+if settings.ASYNC_VIEWS:
+    # List, retrieve and create run on the event loop, the other
+    # methods and the extra actions are served by the router routes
+    list_view = views.NaverViewSet.as_async_view(LIST_ACTIONS, basename='naver', detail=False)
+    detail_view = views.NaverViewSet.as_async_view(DETAIL_ACTIONS, basename='naver', detail=True)
+    urlpatterns = [
+        path('', list_view, name='naver-list'),
+        path('<int:pk>/', detail_view, name='naver-detail'),
+    ] + urlpatterns
@@ -1,39 +1,99 @@
+from django.db.models import Avg, Count, Max, Prefetch, Q
+
 from rest_framework import viewsets, permissions
+from rest_framework.decorators import action
 
 from .models import Naver
+from navedex.core.async_views import AsyncModelViewSetMixin
+from navedex.core.bulk import BulkModelMixin
+from navedex.core.cache import OwnerCacheMixin
+from navedex.core.export import ExportMixin
+from navedex.core.fast import FastListMixin
+from navedex.core.links import LinksMixin
+from navedex.core.search import SearchMixin
+from navedex.core.stats import StatsMixin, count_by, tenure_histogram
+from navedex.core.versions import ConditionalGetMixin
 from navedex.navers import serializers
 from navedex.navers import permissions as perm
+from navedex.projects.models import Project
+from navedex.projects.serializers import ProjectSerializer
 
 
-class NaverViewSet(viewsets.ModelViewSet):
+class NaverViewSet(ConditionalGetMixin, OwnerCacheMixin, AsyncModelViewSetMixin,
+                   FastListMixin, SearchMixin, BulkModelMixin, LinksMixin, ExportMixin, StatsMixin,
+                   viewsets.ModelViewSet):
     serializer_class = serializers.NaverSerializer
     queryset = Naver.objects.all()
 
     permission_classes = (permissions.IsAuthenticated, perm.IsOwner)
+    # Each filter has a matching (owner, field) index on Naver
+    filter_fields = {
+        'name': ('exact',),
+        'admission_date': ('exact', 'gte', 'lte'),
+        'birthdate': ('exact', 'gte', 'lte'),
+        'job_role': ('exact', 'in'),
+    }
+    # ?tenure_min_years= and ?tenure_max_years= ("tempo de empresa")
+    filter_years = {'tenure': 'admission_date'}
+    # ?ordering=-project_count; project_count has an (owner, project_count, id) index
+    ordering_fields = ('id', 'name', 'admission_date', 'project_count')
+    # Indexed by migration 0005_search_index
+    search_fields = ('name', 'job_role')
+    relation_field = 'projects'
+    related_model = Project
 
     def get_serializer_class(self):
         if self.action in ['create', 'partial_update', 'update']:
             return serializers.NaverCreateSerializer
-        if self.action == 'retrieve':
+        if self.action == 'retrieve' or self.is_expanded():
             return serializers.NaverDetailSerializer
 
         return self.serializer_class
 
+    def is_expanded(self):
+        """Whether the list was asked for the nested projects with ?expand=projects"""
+        expand = self.request.query_params.get('expand', '')
+        return self.action == 'list' and 'projects' in expand.split(',')
+
+    @action(detail=True, methods=['post', 'delete'])
+    def projects(self, request, pk=None):
+        """Link (POST) or unlink (DELETE) the projects with the listed ids"""
+        return self.change_links(request)
+
     def perform_create(self, serializer):
         return serializer.save(owner=self.request.user)
 
     def get_queryset(self):
-        name = self.request.query_params.get("name")
-        admission_date = self.request.query_params.get("admission_date")
-        job_role = self.request.query_params.get("job_role")
-        queryset = self.queryset
-        if name:
-            queryset = queryset.filter(name__exact=name)
+        queryset = self.queryset.filter(owner=self.request.user)
+        if self.action == 'retrieve' or self.is_expanded():
+            # Only the columns and relations left by ?fields=/?omit= are loaded
+            fields = serializers.NaverDetailSerializer.get_sparse_field_names(self.request)
+            queryset = queryset.only(*(field for field in fields if field != 'projects'))
+            if 'projects' in fields:
+                queryset = queryset.prefetch_related(self.get_projects_prefetch())
+            return queryset
+        if self.action == 'list':
+            return queryset.only(*serializers.NaverSerializer.get_sparse_field_names(self.request))
 
-        if admission_date:
-            queryset = queryset.filter(admission_date__exact=admission_date)
+        return queryset
 
-        if job_role:
-            queryset = queryset.filter(job_role__exact=job_role)
+    def get_projects_prefetch(self):
+        """Load the projects of every naver in the page with a single query"""
+        projects = Project.objects.filter(owner=self.request.user)
+        fields = ProjectSerializer.get_sparse_field_names(self.request, prefix='projects.')
+        return Prefetch('projects', queryset=projects.only(*fields))
 
-        return queryset.filter(owner=self.request.user)
+    def get_stats(self, queryset):
+        """Head-count per job role, tenure histogram and project load in three queries"""
+        load = queryset.order_by().aggregate(
+            total=Count('id'),
+            average=Avg('project_count'),
+            max=Max('project_count'),
+            without_projects=Count('id', filter=Q(project_count=0)),
+        )
+        return {
+            'total': load.pop('total'),
+            'by_job_role': count_by(queryset, 'job_role'),
+            'tenure_years': tenure_histogram(queryset, 'admission_date'),
+            'projects_per_naver': {**load, 'average': load['average'] or 0, 'max': load['max'] or 0},
+        }
@@ -2,4 +2,8 @@ from django.apps import AppConfig
 
 
 class ProjectsConfig(AppConfig):
-    name = 'projects'
+    name = 'navedex.projects'
+    label = 'projects'
+
+    def ready(self):
+        from navedex.projects import signals  # noqa: F401
@@ -0,0 +1,21 @@
+# Generated by Django 3.1.14 on 2026-10-18 11:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_remove_project_navers'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['owner', 'id'], name='project_owner_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['owner', 'name'], name='project_owner_name_idx'),
+        ),
+    ]
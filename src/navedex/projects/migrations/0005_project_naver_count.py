@@ -0,0 +1,47 @@
+# Generated by Django 3.1.14 on 2026-10-18 12:15
+
+from importlib import import_module
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+search_index = import_module('navedex.projects.migrations.0004_search_index')
+
+
+def recreate_search_index(apps, schema_editor):
+    # SQLite rebuilds the table to add the column, dropping the FTS triggers;
+    # they now also skip updates that only touch the counts
+    search_index.drop_search_index(schema_editor)
+    search_index.create_search_index(schema_editor)
+
+
+def count_navers(apps, schema_editor):
+    project = apps.get_model('projects', 'Project')
+    through = apps.get_model('navers', 'Naver_projects')
+    links = through.objects.filter(project_id=OuterRef('pk')).order_by().values('project_id')
+    project.objects.update(naver_count=Coalesce(Subquery(links.annotate(count=Count('*')).values('count')), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_search_index'),
+        ('navers', '0007_naver_project_count'),
+    ]
+
+    operations = [
+        # Rebuilt last when unapplying, after the table is rebuilt again
+        migrations.RunPython(migrations.RunPython.noop, recreate_search_index),
+        migrations.AddField(
+            model_name='project',
+            name='naver_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['owner', 'naver_count', 'id'], name='project_owner_naver_count_idx'),
+        ),
+        migrations.RunPython(recreate_search_index, migrations.RunPython.noop),
+        migrations.RunPython(count_navers, migrations.RunPython.noop),
+    ]
@@ -7,6 +7,18 @@ class Project(models.Model):
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE)
     name = models.CharField(max_length=255)
+    # Number of navers, kept in sync with the links
+    naver_count = models.PositiveIntegerField(default=0, editable=False)
+
+    # M2M relations whose size is denormalized, and the column holding it
+    link_counts = {'navers': 'naver_count'}
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['owner', 'id'], name='project_owner_id_idx'),
+            models.Index(fields=['owner', 'name'], name='project_owner_name_idx'),
+            models.Index(fields=['owner', 'naver_count', 'id'], name='project_owner_naver_count_idx'),
+        ]
 
     def __str__(self):
         return self.name
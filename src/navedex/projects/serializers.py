@@ -1,11 +1,15 @@
 from rest_framework import serializers
 
+from navedex.core.fields import OwnerPrimaryKeyRelatedField
+from navedex.core.metrics import TimedSerializerMixin
+from navedex.core.serializers import SparseFieldsetMixin
+
 from .models import Project
 
 from navedex.navers.models import Naver
 
 
-class NaverDetail(serializers.ModelSerializer):
+class NaverDetail(TimedSerializerMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Naver
         fields = ('id', 'name', 'birthdate',
@@ -13,15 +17,15 @@ class NaverDetail(serializers.ModelSerializer):
         read_only_fields = ('id',)
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(TimedSerializerMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Project
-        fields = ('id', 'name')
-        read_only_fields = ('id',)
+        fields = ('id', 'name', 'naver_count')
+        read_only_fields = ('id', 'naver_count')
 
 
 class ProjectCreateSerializer(serializers.ModelSerializer):
-    navers = serializers.PrimaryKeyRelatedField(
+    navers = OwnerPrimaryKeyRelatedField(
         many=True,
         queryset=Naver.objects.all(),
         required=False
@@ -33,11 +37,11 @@ class ProjectCreateSerializer(serializers.ModelSerializer):
         read_only_fields = ('id',)
 
 
-class ProjectDetailSerializer(serializers.ModelSerializer):
+class ProjectDetailSerializer(TimedSerializerMixin, SparseFieldsetMixin, serializers.ModelSerializer):
 
     navers = NaverDetail(many=True, read_only=True, required=False)
 
     class Meta:
         model = Project
-        fields = ('id', 'name', 'navers')
-        read_only_fields = ('id',)
+        fields = ('id', 'name', 'naver_count', 'navers')
+        read_only_fields = ('id', 'naver_count')
@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from navedex.core.bulk import recount_unlinked, unlink_on_delete
+from navedex.core.versions import touch_owner
+from navedex.projects.models import Project
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def project_changed(sender, instance, **kwargs):
+    touch_owner(instance.owner_id)
+
+
+@receiver(pre_delete, sender=Project)
+def project_deleting(sender, instance, **kwargs):
+    unlink_on_delete(instance, 'navers')
+
+
+@receiver(post_delete, sender=Project)
+def project_deleted(sender, instance, **kwargs):
+    recount_unlinked(instance, 'navers')
@@ -1,6 +1,8 @@
+import json
+
 from django.contrib.auth import get_user_model
 from django.urls import reverse
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -16,6 +18,9 @@ from navedex.navers.models import Naver
 
 
 PROJECT_URL = reverse('projects:project-list')
+BULK_URL = reverse('projects:project-bulk')
+EXPORT_URL = reverse('projects:project-export')
+STATS_URL = reverse('projects:project-stats')
 TOKEN_URL = reverse('core:login')
 
 
@@ -136,6 +141,7 @@ class PrivateProjectsApiTest(TestCase):
 
         url = detail_url(project.id)
         res = self.client.get(url, args=[project.id])
+        project.refresh_from_db()
         serializer = ProjectDetailSerializer(project)
 
         self.assertEqual(serializer.data, res.data)
@@ -228,3 +234,151 @@ class PrivateProjectsApiTest(TestCase):
         navers = project.navers.all()
         self.assertEqual(len(navers), 1)
         self.assertIn(naver, navers)
+
+    def test_list_projects_paginated_with_cursor(self):
+        """Test walking the projects list page by page with the next cursor"""
+        projects = [sample_project(owner=self.owner, name=f'Project {i}') for i in range(5)]
+
+        res = self.client.get(PROJECT_URL, {'page_size': 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 2)
+        ids = [item['id'] for item in res.data['results']]
+        while res.data['next']:
+            res = self.client.get(res.data['next'])
+            ids.extend(item['id'] for item in res.data['results'])
+
+        self.assertEqual(ids, [project.id for project in projects])
+
+    @override_settings(JWT_AUTH_STATELESS=False)
+    def test_list_projects_expanded_constant_queries(self):
+        """Test ?expand=navers costs the same queries for any page size"""
+        navers = [
+            Naver.objects.create(owner=self.owner, name=f'Naver {i}', birthdate='1990-01-01',
+                                 admission_date='2020-01-01', job_role='Developer')
+            for i in range(3)
+        ]
+        for i in range(20):
+            sample_project(owner=self.owner, name=f'Project {i}').navers.set(navers)
+
+        for page_size in (1, 5, 20):
+            with self.subTest(page_size=page_size):
+                # user, owner version, projects page and navers prefetch
+                with self.assertNumQueries(4):
+                    res = self.client.get(PROJECT_URL, {'expand': 'navers', 'page_size': page_size})
+
+                self.assertEqual(len(res.data['results']), page_size)
+                project = Project.objects.get(id=res.data['results'][0]['id'])
+                self.assertEqual(res.data['results'][0], ProjectDetailSerializer(project).data)
+
+    def test_bulk_create_projects(self):
+        """Test creating many projects with their navers in one request"""
+        naver = Naver.objects.create(owner=self.owner, name='Naver 1', birthdate='1990-01-01',
+                                     admission_date='2020-01-01', job_role='Developer')
+        payload = [{'name': f'Project {i}', 'navers': [naver.id]} for i in range(3)]
+
+        res = self.client.post(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Project.objects.filter(owner=self.owner).count(), 3)
+        self.assertEqual(naver.projects.count(), 3)
+
+    def test_bulk_delete_projects_unknown_id(self):
+        """Test that deleting an unknown project rejects the batch"""
+        project = sample_project(owner=self.owner, name='Project')
+
+        res = self.client.delete(BULK_URL, [project.id, project.id + 100], format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data['results'][0]['status'], status.HTTP_404_NOT_FOUND)
+        self.assertTrue(Project.objects.filter(id=project.id).exists())
+
+    def test_link_and_unlink_project_navers(self):
+        """Test adding and removing navers by id with one write each"""
+        navers = [Naver.objects.create(owner=self.owner, name=f'Naver {i}', birthdate='1990-01-01',
+                                       admission_date='2020-01-01', job_role='Developer')
+                  for i in range(3)]
+        project = Project.objects.create(owner=self.owner, name="New Website")
+        url = reverse('projects:project-navers', args=[project.id])
+
+        res = self.client.post(url, [naver.id for naver in navers], format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(project.navers.count(), 3)
+
+        res = self.client.delete(url, [navers[0].id], format='json')
+
+        self.assertEqual(res.data, {'removed': [navers[0].id]})
+        project.refresh_from_db()
+        self.assertEqual(project.naver_count, 2)
+        self.assertEqual(res['Content-Type'], 'application/json')
+
+    def test_create_project_with_foreign_naver_invalid(self):
+        """Test that navers of another owner can't be added to a project"""
+        other = get_user_model().objects.create_user('other@navedex.com.br', 'passtest')
+        naver = Naver.objects.create(owner=other, name='Naver 1', birthdate='1990-01-01',
+                                     admission_date='2020-01-01', job_role='Developer')
+
+        res = self.client.post(PROJECT_URL, {'name': 'Website', 'navers': [naver.id]})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('navers', res.data)
+
+    def test_export_projects_ndjson(self):
+        """Test exporting the user's projects as NDJSON with their navers ids"""
+        project = sample_project(owner=self.owner, name="Project")
+        naver = Naver.objects.create(owner=self.owner, name="Naver", birthdate="1990-01-01",
+                                     admission_date="2020-01-01", job_role="Developer")
+        project.navers.add(naver)
+
+        res = self.client.get(EXPORT_URL, {'format': 'ndjson'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        rows = [json.loads(line) for line in b''.join(res.streaming_content).splitlines()]
+        self.assertEqual(rows, [{'id': project.id, 'name': 'Project', 'navers': [naver.id]}])
+
+    def test_export_projects_empty(self):
+        """Test that an empty export is a valid JSON array"""
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(json.loads(b''.join(res.streaming_content)), [])
+
+    def test_search_projects_ranked(self):
+        """Test that ?search= ranks projects matching the name"""
+        sample_project(owner=self.owner, name="Mobile Web")
+        sample_project(owner=self.owner, name="Mobile App")
+        sample_project(owner=self.owner, name="Website")
+
+        res = self.client.get(PROJECT_URL, {'search': 'web', 'page_size': 1})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['count'], 2)
+        self.assertEqual(res.data['results'][0]['name'], 'Website')
+        self.assertIsNotNone(res.data['next'])
+
+    def test_projects_stats(self):
+        """Test navers per project overall and for each project"""
+        busy = sample_project(owner=self.owner, name="Busy")
+        sample_project(owner=self.owner, name="Empty")
+        for name in ("Ana", "Bruno"):
+            naver = Naver.objects.create(owner=self.owner, name=name, birthdate="1990-01-01",
+                                         admission_date="2020-01-01", job_role="Developer")
+            busy.navers.add(naver)
+
+        res = self.client.get(STATS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['total'], 2)
+        self.assertEqual(res.data['navers_per_project'], {'average': 1.0, 'max': 2, 'without_navers': 1})
+        self.assertEqual([project['name'] for project in res.data['projects']], ['Busy', 'Empty'])
+        self.assertEqual(res.data['projects'][0]['naver_count'], 2)
+
+    def test_view_project_detail_sparse_navers(self):
+        """Test that ?omit= reaches the nested navers"""
+        project = sample_project(owner=self.owner, name="Project")
+        project.navers.add(Naver.objects.create(owner=self.owner, name="Naver", birthdate="1990-01-01",
+                                                admission_date="2020-01-01", job_role="Developer"))
+
+        res = self.client.get(detail_url(project.id), {'omit': 'navers.birthdate,navers.admission_date'})
+
+        self.assertEqual(list(res.data['navers'][0]), ['id', 'name', 'job_role'])
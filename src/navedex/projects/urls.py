@@ -1,6 +1,8 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
+from navedex.core.async_views import LIST_ACTIONS, DETAIL_ACTIONS
 from navedex.projects import views
 
 router = DefaultRouter()
@@ -11,3 +13,13 @@ app_name = 'projects'
 urlpatterns = [
     path('', include(router.urls))
 ]
+
+if settings.ASYNC_VIEWS:
+    # List, retrieve and create run on the event loop, the other
+    # methods and the extra actions are served by the router routes
+    list_view = views.ProjectViewSet.as_async_view(LIST_ACTIONS, basename='project', detail=False)
+    detail_view = views.ProjectViewSet.as_async_view(DETAIL_ACTIONS, basename='project', detail=True)
+    urlpatterns = [
+        path('', list_view, name='project-list'),
+        path('<int:pk>/', detail_view, name='project-detail'),
+    ] + urlpatterns
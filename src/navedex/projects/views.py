@@ -1,30 +1,90 @@
+from django.db.models import Avg, Count, Max, Prefetch, Q
+
 from rest_framework import viewsets, permissions
+from rest_framework.decorators import action
 
 from .models import Project
+from navedex.core.async_views import AsyncModelViewSetMixin
+from navedex.core.bulk import BulkModelMixin
+from navedex.core.cache import OwnerCacheMixin
+from navedex.core.export import ExportMixin
+from navedex.core.fast import FastListMixin
+from navedex.core.links import LinksMixin
+from navedex.core.search import SearchMixin
+from navedex.core.stats import StatsMixin
+from navedex.core.versions import ConditionalGetMixin
 from navedex.projects import serializers
+from navedex.navers.models import Naver
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(ConditionalGetMixin, OwnerCacheMixin, AsyncModelViewSetMixin,
+                     FastListMixin, SearchMixin, BulkModelMixin, LinksMixin, ExportMixin, StatsMixin,
+                     viewsets.ModelViewSet):
     serializer_class = serializers.ProjectSerializer
     queryset = Project.objects.all()
     permission_classes = (permissions.IsAuthenticated,)
+    # Each filter has a matching (owner, field) index on Project
+    filter_fields = {'name': ('exact', 'in')}
+    # Indexed by migration 0004_search_index
+    search_fields = ('name',)
+    # ?ordering=-naver_count; naver_count has an (owner, naver_count, id) index
+    ordering_fields = ('id', 'name', 'naver_count')
+    relation_field = 'navers'
+    related_model = Naver
 
     def get_serializer_class(self):
         if self.action in ['create', 'partial_update', 'update']:
             return serializers.ProjectCreateSerializer
-        if self.action == 'retrieve':
+        if self.action == 'retrieve' or self.is_expanded():
             return serializers.ProjectDetailSerializer
 
         return self.serializer_class
 
+    def is_expanded(self):
+        """Whether the list was asked for the nested navers with ?expand=navers"""
+        expand = self.request.query_params.get('expand', '')
+        return self.action == 'list' and 'navers' in expand.split(',')
+
+    @action(detail=True, methods=['post', 'delete'])
+    def navers(self, request, pk=None):
+        """Link (POST) or unlink (DELETE) the navers with the listed ids"""
+        return self.change_links(request)
+
     def perform_create(self, serializer):
         return serializer.save(owner=self.request.user)
 
     def get_queryset(self):
-        name = self.request.query_params.get("name")
-        queryset = self.queryset
+        queryset = self.queryset.filter(owner=self.request.user)
+        if self.action == 'retrieve' or self.is_expanded():
+            # Only the columns and relations left by ?fields=/?omit= are loaded
+            fields = serializers.ProjectDetailSerializer.get_sparse_field_names(self.request)
+            queryset = queryset.only(*(field for field in fields if field != 'navers'))
+            if 'navers' in fields:
+                queryset = queryset.prefetch_related(self.get_navers_prefetch())
+            return queryset
+        if self.action == 'list':
+            return queryset.only(*serializers.ProjectSerializer.get_sparse_field_names(self.request))
+
+        return queryset
 
-        if name:
-            queryset = queryset.filter(name__exact=name)
+    def get_navers_prefetch(self):
+        """Load the navers of every project in the page with a single query"""
+        navers = Naver.objects.filter(owner=self.request.user)
+        fields = serializers.NaverDetail.get_sparse_field_names(self.request, prefix='navers.')
+        return Prefetch('navers', queryset=navers.only(*fields))
 
-        return queryset.filter(owner=self.request.user)
+    def get_stats(self, queryset):
+        """Navers per project, overall and for each project, in two queries"""
+        queryset = queryset.order_by()
+        load = queryset.aggregate(
+            total=Count('id'),
+            average=Avg('naver_count'),
+            max=Max('naver_count'),
+            without_navers=Count('id', filter=Q(naver_count=0)),
+        )
+        projects = queryset.order_by('-naver_count', 'id').values('id', 'name', 'naver_count')
+        return {
+            'total': load.pop('total'),
+            'navers_per_project': {**load, 'average': load['average'] or 0, 'max': load['max'] or 0},
+            'projects': list(projects),
+        }
@@ -13,6 +13,7 @@ import datetime
 from pathlib import Path
 from decouple import config, Csv
 from dj_database_url import parse as dburl
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
@@ -55,11 +56,13 @@ PROJECT_APPS = [
 INSTALLED_APPS = DJANGO_APPS + THIRD_PART_APPS + PROJECT_APPS
 
 MIDDLEWARE = [
+    'navedex.core.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'navedex.core.db.routers.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -84,6 +87,10 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'navedex.wsgi.application'
 
+# Serve login, register and the navers/projects list, retrieve and create
+# routes with async views. Only worth it when deployed through navedex.asgi.
+ASYNC_VIEWS = config('ASYNC_VIEWS', default=False, cast=bool)
+
 
 # Database
 # https://docs.djangoproject.com/en/3.1/ref/settings/#databases
@@ -94,6 +101,85 @@ DATABASES = {
     'default': config('DATABASE_URL', default=default_dburl, cast=dburl)
 }
 
+# Read replicas of the default database. GET/HEAD/OPTIONS requests read
+# from a random one, unless their user wrote in the last
+# DATABASE_REPLICA_PIN_SECONDS; everything else, users included, uses the
+# primary. Pins are kept in the cache, so it must be shared when running
+# several nodes.
+DATABASE_REPLICA_URLS = config('DATABASE_REPLICA_URLS', default='', cast=Csv())
+DATABASE_REPLICA_PIN_SECONDS = config('DATABASE_REPLICA_PIN_SECONDS', default=5, cast=int)
+DATABASE_REPLICAS = []
+for index, url in enumerate(DATABASE_REPLICA_URLS):
+    DATABASE_REPLICAS.append(f'replica{index}')
+    # Tests read the replicas through the test database of the primary
+    DATABASES[f'replica{index}'] = dict(dburl(url), TEST={'MIRROR': 'default'})
+
+# Owner sharding. Every DATABASE_SHARD_URLS entry adds a shardN database and
+# the navers, projects and links of each owner live on the database (default
+# included) its id hashes to, on a consistent hash ring with
+# DATABASE_SHARD_VNODES points per database. Users stay on default. Shard N
+# creates ids from N * DATABASE_SHARD_ID_SPAN + 1 on, so moved rows keep
+# their id. Run rebalance_shards after adding a shard.
+DATABASE_SHARD_URLS = config('DATABASE_SHARD_URLS', default='', cast=Csv())
+DATABASE_SHARD_VNODES = config('DATABASE_SHARD_VNODES', default=64, cast=int)
+DATABASE_SHARD_ID_SPAN = config('DATABASE_SHARD_ID_SPAN', default=100000000, cast=int)
+DATABASE_SHARDS = ['default']
+SHARDED_APPS = ('navers', 'projects')
+for index, url in enumerate(DATABASE_SHARD_URLS, start=1):
+    DATABASE_SHARDS.append(f'shard{index}')
+    DATABASES[f'shard{index}'] = dburl(url)
+
+DATABASE_ROUTERS = [
+    'navedex.core.db.routers.OwnerShardRouter',
+    'navedex.core.db.routers.PrimaryReplicaRouter',
+]
+
+# Seconds a connection is kept open between requests (0 closes it at the end
+# of every request, -1 keeps it forever). Health checks close a kept
+# connection that stopped answering before a request reuses it.
+DATABASE_CONN_MAX_AGE = config('DATABASE_CONN_MAX_AGE', default=0, cast=int)
+DATABASE_HEALTH_CHECKS = config('DATABASE_HEALTH_CHECKS', default=True, cast=bool)
+
+# PostgreSQL only: keep up to this many idle connections in a pool shared by
+# every thread of the process (0 disables), each dropped after
+# DATABASE_POOL_MAX_IDLE seconds unused. Closing a connection returns it to
+# the pool, which suits threaded and ASGI workers better than CONN_MAX_AGE.
+DATABASE_POOL_SIZE = config('DATABASE_POOL_SIZE', default=0, cast=int)
+DATABASE_POOL_MAX_IDLE = config('DATABASE_POOL_MAX_IDLE', default=300, cast=int)
+POSTGRESQL_ENGINES = ('django.db.backends.postgresql', 'django.db.backends.postgresql_psycopg2')
+
+for database in DATABASES.values():
+    database['CONN_MAX_AGE'] = None if DATABASE_CONN_MAX_AGE < 0 else DATABASE_CONN_MAX_AGE
+    if DATABASE_POOL_SIZE and database['ENGINE'] in POSTGRESQL_ENGINES:
+        database.update({
+            'ENGINE': 'navedex.core.db.backends.postgresql',
+            'POOL_SIZE': DATABASE_POOL_SIZE,
+            'POOL_MAX_IDLE': DATABASE_POOL_MAX_IDLE,
+        })
+
+# Cache
+# https://docs.djangoproject.com/en/3.1/topics/cache/
+# Local memory by default; point CACHE_BACKEND/CACHE_LOCATION to a shared
+# backend (memcached, database, ...) when running several nodes. With
+# ASYNC_VIEWS the response cache calls the shared backends from the sync
+# thread, so they work but cost a thread switch per lookup.
+
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='navedex'),
+    }
+}
+
+# Per owner cache of the navers and projects list/detail responses
+RESPONSE_CACHE_ENABLED = config('RESPONSE_CACHE_ENABLED', default=False, cast=bool)
+RESPONSE_CACHE_ALIAS = config('RESPONSE_CACHE_ALIAS', default='default')
+RESPONSE_CACHE_TIMEOUT = config('RESPONSE_CACHE_TIMEOUT', default=300, cast=int)
+
+# Answer If-None-Match on the navers and projects list and
+# detail routes, at the cost of one primary key lookup per GET
+CONDITIONAL_GET_ENABLED = config('CONDITIONAL_GET_ENABLED', default=True, cast=bool)
+
 # Password validation
 # https://docs.djangoproject.com/en/3.1/ref/settings/#auth-password-validators
 
@@ -113,6 +199,36 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing
+# https://docs.djangoproject.com/en/3.1/topics/auth/passwords/
+# The chosen hasher encodes new passwords; the others still verify old hashes,
+# which are upgraded on the next successful login. argon2 needs argon2-cffi
+# and bcrypt needs bcrypt installed.
+
+HASHERS = {
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'pbkdf2_sha1': 'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'argon2': 'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'bcrypt': 'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+}
+
+PASSWORD_HASHER = config('PASSWORD_HASHER', default='pbkdf2')
+
+if PASSWORD_HASHER not in ('pbkdf2', 'argon2', 'bcrypt'):
+    raise ImproperlyConfigured(
+        f'PASSWORD_HASHER must be one of pbkdf2, argon2, bcrypt, got {PASSWORD_HASHER!r}.'
+    )
+
+PASSWORD_HASHERS = [HASHERS[PASSWORD_HASHER]] + [
+    hasher for name, hasher in HASHERS.items() if name != PASSWORD_HASHER
+]
+
+# Async views hash passwords in a dedicated thread pool instead of the thread
+# shared by sync code. Workers default to the ThreadPoolExecutor size.
+PASSWORD_HASH_OFFLOAD = config('PASSWORD_HASH_OFFLOAD', default=True, cast=bool)
+PASSWORD_HASH_WORKERS = config('PASSWORD_HASH_WORKERS', default=None, cast=lambda v: int(v) if v else None)
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/3.1/topics/i18n/
 
@@ -137,10 +253,47 @@ AUTH_USER_MODEL = 'core.User'
 # Django Rest Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'navedex.core.authentication.JWTAuthentication',
+    ],
+    'DEFAULT_FILTER_BACKENDS': [
+        'navedex.core.filters.FieldFilterBackend',
+        'navedex.core.filters.KeyedOrderingFilter',
     ],
+    'DEFAULT_PAGINATION_CLASS': 'navedex.core.pagination.OwnerCursorPagination',
+    'DEFAULT_RENDERER_CLASSES': [
+        'navedex.core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'PAGE_SIZE': config('PAGE_SIZE', default=100, cast=int),
 }
 
+# List endpoints are paginated only when the client asks for it, unless this
+# is enabled. ``?paginate=false`` always returns the unpaginated list.
+PAGINATE_BY_DEFAULT = config('PAGINATE_BY_DEFAULT', default=False, cast=bool)
+
+# Build plain list responses straight from .values() rows instead of going
+# through the serializer fields one by one. The JSON is the same.
+FAST_LIST_SERIALIZATION = config('FAST_LIST_SERIALIZATION', default=True, cast=bool)
+
+# Rows fetched per round trip by the export routes, which also load the
+# related ids of each chunk with one query
+EXPORT_CHUNK_SIZE = config('EXPORT_CHUNK_SIZE', default=2000, cast=int)
+
+# Fraction of the requests whose latency, query count, database time and
+# serializer time go into the histograms served on /metrics (0 disables).
+# With a token, /metrics requires ``Authorization: Bearer <token>``;
+# without one, a staff user logged in to the admin.
+METRICS_SAMPLE_RATE = config('METRICS_SAMPLE_RATE', default=0.1, cast=float)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# Build request.user from the token claims instead of loading it on every
+# request. is_active, is_staff and the password (a new one revokes the
+# tokens) are still checked, cached in-process for JWT_AUTH_CACHE_TTL seconds
+# for at most JWT_AUTH_CACHE_SIZE users.
+JWT_AUTH_STATELESS = config('JWT_AUTH_STATELESS', default=False, cast=bool)
+JWT_AUTH_CACHE_TTL = config('JWT_AUTH_CACHE_TTL', default=30, cast=int)
+JWT_AUTH_CACHE_SIZE = config('JWT_AUTH_CACHE_SIZE', default=10000, cast=int)
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': datetime.timedelta(minutes=30),
     'REFRESH_TOKEN_LIFETIME': datetime.timedelta(days=1),
@@ -16,9 +16,12 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 
+from navedex.core.metrics import metrics_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('auth/', include('navedex.core.urls')),
     path('api/navers/', include('navedex.navers.urls')),
     path('api/projects/', include('navedex.projects.urls')),
+    path('metrics', metrics_view, name='metrics'),
 ]